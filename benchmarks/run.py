@@ -0,0 +1,237 @@
+import argparse
+import hashlib
+import json
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+from base64 import urlsafe_b64encode
+from pathlib import Path
+from typing import Callable
+
+from src.core.breach import BreachCorpus, build_corpus
+from src.core.crypto import VaultCipher
+from src.core.kdf import DEFAULT_PARAMS, kdf_from_params
+from src.core.secret import wipe_all
+from src.core.storage import Database
+from src.core.utils import evaluate_password_strength
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_SEED = 1234
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+LATENCY_SAMPLES = 2_000
+KDF_SAMPLES = 5
+
+
+def _percentile(sorted_values: list[int], fraction: float) -> int:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_latency(func: Callable[[object], object], inputs: list) -> dict:
+    timings = []
+    start = time.perf_counter_ns()
+    for item in inputs:
+        before = time.perf_counter_ns()
+        func(item)
+        timings.append(time.perf_counter_ns() - before)
+    elapsed = time.perf_counter_ns() - start
+    timings.sort()
+    return {
+        "samples": len(inputs),
+        "ops_per_sec": len(inputs) / (elapsed / 1e9),
+        "p50_us": _percentile(timings, 0.50) / 1e3,
+        "p99_us": _percentile(timings, 0.99) / 1e3,
+    }
+
+
+def measure_throughput(func: Callable[[], int]) -> dict:
+    start = time.perf_counter_ns()
+    operations = func()
+    elapsed = time.perf_counter_ns() - start
+    return {
+        "samples": operations,
+        "ops_per_sec": operations / (elapsed / 1e9),
+        "total_ms": elapsed / 1e6,
+    }
+
+
+def synthetic_entries(size: int, seed: int) -> list[tuple[str, str, str]]:
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + string.punctuation
+    applications = max(1, size // 3)
+    return [
+        (
+            f"app-{rng.randrange(applications):07d}",
+            f"user{index}@example.com",
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(8, 24))),
+        )
+        for index in range(size)
+    ]
+
+
+def synthetic_key(seed: int) -> bytes:
+    return urlsafe_b64encode(hashlib.sha256(f"keypass-bench-{seed}".encode()).digest())
+
+
+def bench_kdf(results: dict, seed: int) -> None:
+    # Même chemin que derive_key, mais avec un sel fixe : le sel du coffre n'est pas touché.
+    kdf = kdf_from_params(DEFAULT_PARAMS)
+    salt = hashlib.sha256(f"keypass-bench-salt-{seed}".encode()).digest()[:16]
+    results["derive_key"] = measure_latency(
+        lambda password: urlsafe_b64encode(kdf.derive(password, salt)),
+        [f"master-{i}".encode() for i in range(KDF_SAMPLES)],
+    )
+
+
+def bench_crypto(results: dict, key: bytes, entries: list, rng: random.Random) -> None:
+    cipher = VaultCipher(key)
+    passwords = [password for _, _, password in rng.sample(entries, min(LATENCY_SAMPLES, len(entries)))]
+    tokens = [cipher.encrypt(password) for password in passwords]
+
+    results["encrypt_password"] = measure_latency(cipher.encrypt, passwords)
+    results["decrypt_password"] = measure_latency(cipher.decrypt, tokens)
+    results["decrypt_many"] = measure_throughput(lambda: len(cipher.decrypt_many(tokens * 10)))
+
+    def decrypt_secrets() -> int:
+        secrets = cipher.decrypt_secrets_many(tokens * 10)
+        wipe_all(secrets)
+        return len(secrets)
+
+    results["decrypt_secrets_many"] = measure_throughput(decrypt_secrets)
+    cipher.close()
+
+
+def bench_strength(results: dict, entries: list, rng: random.Random) -> None:
+    passwords = [password for _, _, password in rng.sample(entries, min(LATENCY_SAMPLES, len(entries)))]
+    results["evaluate_password_strength"] = measure_latency(evaluate_password_strength, passwords)
+
+
+def bench_breach(results: dict, entries: list, rng: random.Random) -> None:
+    digests = sorted(hashlib.sha1(password.encode()).hexdigest() for _, _, password in entries)
+    passwords = [password for _, _, password in rng.sample(entries, min(LATENCY_SAMPLES, len(entries)))]
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "pwned.txt"
+        source.write_text("".join(f"{digest}:1\n" for digest in digests))
+        target = Path(directory) / "pwned.kphb"
+        results[f"build_corpus[{len(entries)}]"] = measure_throughput(lambda: build_corpus(source, target))
+        with BreachCorpus(target) as corpus:
+            results[f"breach_lookup[{len(entries)}]"] = measure_latency(corpus.contains_password, passwords)
+
+
+def bench_storage(results: dict, key: bytes, entries: list, size: int, rng: random.Random) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(key, Path(directory) / "bench.db")
+        try:
+            results[f"insert_many[{size}]"] = measure_throughput(lambda: db.insert_many(entries, batch_size=5_000))
+
+            applications = [application for application, _, _ in rng.sample(entries, min(LATENCY_SAMPLES, size))]
+            results[f"get_applications[{size}]"] = measure_latency(lambda _: db.get_applications(), range(5))
+            results[f"get_info[{size}]"] = measure_latency(db.get_info, applications)
+            results[f"get_info_decrypt[{size}]"] = measure_latency(
+                lambda application: [entry.password for entry in db.get_info(application)],
+                applications,
+            )
+            results[f"search_applications[{size}]"] = measure_latency(
+                lambda application: db.search_applications(application[:8]),
+                applications[:200],
+            )
+
+            inserts = [
+                (f"bench-insert-{i}", f"user{i}", f"password-{i}")
+                for i in range(min(LATENCY_SAMPLES, 500))
+            ]
+            results[f"insert[{size}]"] = measure_latency(lambda row: db.insert(*row), inserts)
+        finally:
+            db.close()
+
+
+def run(sizes: list[int], seed: int, skip_kdf: bool) -> dict:
+    rng = random.Random(seed)
+    key = synthetic_key(seed)
+    results: dict[str, dict] = {}
+
+    if not skip_kdf:
+        bench_kdf(results, seed)
+
+    largest = synthetic_entries(max(sizes), seed)
+    bench_crypto(results, key, largest, rng)
+    bench_strength(results, largest, rng)
+    bench_breach(results, largest, rng)
+    for size in sorted(sizes):
+        print(f"  vault synthétique de {size} entrées…", file=sys.stderr)
+        bench_storage(results, key, largest[:size], size, rng)
+
+    return {
+        "meta": {
+            "seed": seed,
+            "sizes": sorted(sizes),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, previous in baseline.get("results", {}).items():
+        measured = current["results"].get(name)
+        if measured is None:
+            continue
+        if measured["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name} : {measured['ops_per_sec']:.1f} op/s contre {previous['ops_per_sec']:.1f} "
+                f"({measured['ops_per_sec'] / previous['ops_per_sec'] - 1:+.0%})"
+            )
+        elif "p99_us" in previous and measured["p99_us"] > previous["p99_us"] * (1 + threshold):
+            regressions.append(
+                f"{name} : p99 {measured['p99_us']:.1f} µs contre {previous['p99_us']:.1f} µs"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks des chemins critiques de KeyPass.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--skip-kdf", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.seed, args.skip_kdf)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, result in report["results"].items():
+        latency = f"  p50 {result['p50_us']:9.1f} µs  p99 {result['p99_us']:9.1f} µs" if "p50_us" in result else ""
+        print(f"{name:36} {result['ops_per_sec']:14.1f} op/s{latency}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Référence enregistrée dans {args.baseline}.")
+        return 0
+
+    if not args.baseline.exists():
+        print("Aucune référence : comparaison ignorée.")
+        return 0
+
+    regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    if regressions:
+        print(f"Régressions au-delà de {args.threshold:.0%} :")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("Aucune régression détectée.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
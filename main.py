@@ -1,8 +1,12 @@
+import multiprocessing
+
 import wx
+from src.core.metrics import enable_from_config
 from src.interfaces.gui import LoginFrame
 
 
 def main():
+    enable_from_config()
     app = wx.App(False)
     frame = LoginFrame()
     frame.Show()
@@ -10,4 +14,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
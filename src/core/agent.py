@@ -0,0 +1,223 @@
+import asyncio
+import json
+import os
+import signal
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.core.agent_client import (
+    MAX_MESSAGE_SIZE,
+    AgentUnavailable,
+    agent_request,
+    get_agent_socket_path,
+)
+from src.core.config import get_config
+from src.core.entry import wipe_entries
+from src.core.storage import Database
+
+
+class AgentServer:
+    """Agent de déverrouillage : garde une session ouverte et répond aux clients locaux.
+
+    Le protocole est une ligne JSON par requête et par réponse. Les opérations sur la
+    base s'exécutent sur un pool de threads (lectures concurrentes via le pool de
+    connexions) ; la boucle asyncio reste libre de servir les autres clients.
+    """
+
+    WORKERS = 4
+
+    def __init__(
+        self,
+        master_key: bytes,
+        socket_path: Path | None = None,
+        idle_timeout: int | None = None,
+        db_path: Path | None = None,
+    ):
+        self._master_key = master_key
+        self.socket_path = Path(socket_path or get_agent_socket_path())
+        self.idle_timeout = get_config().agent_idle_timeout if idle_timeout is None else idle_timeout
+        self._db_path = db_path
+        self._db: Database | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._stopped: asyncio.Event | None = None
+        self._last_activity = 0.0
+        self._handlers = {
+            "ping": self._op_ping,
+            "list": self._op_list,
+            "search": self._op_search,
+            "get": self._op_get,
+            "lock": self._op_lock,
+        }
+
+    async def serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.WORKERS, thread_name_prefix="keypass-agent-db"
+        )
+        try:
+            self._db = await loop.run_in_executor(
+                self._executor, Database, self._master_key, self._db_path
+            )
+            self._master_key = None
+            server = await self._bind()
+        except BaseException:
+            await self._close_database()
+            raise
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+
+        self._last_activity = loop.time()
+        watcher = asyncio.create_task(self._watch_idle())
+        try:
+            await self._stopped.wait()
+        finally:
+            watcher.cancel()
+            server.close()
+            await server.wait_closed()
+            await self._close_database()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _bind(self) -> asyncio.AbstractServer:
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("L'agent nécessite les sockets Unix.")
+        if self.socket_path.exists():
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: agent_request("ping", self.socket_path)
+                )
+            except AgentUnavailable:
+                self.socket_path.unlink()
+            else:
+                raise RuntimeError(f"Un agent écoute déjà sur {self.socket_path}.")
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # Le masque couvre la création du socket : il n'est jamais accessible à autrui.
+        previous_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(
+                self._handle_client, path=str(self.socket_path), limit=MAX_MESSAGE_SIZE
+            )
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.socket_path, 0o600)
+        return server
+
+    async def _close_database(self) -> None:
+        if self._db is not None:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._db.close)
+            self._db = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _watch_idle(self) -> None:
+        if self.idle_timeout <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = self._last_activity + self.idle_timeout - loop.time()
+            if remaining <= 0:
+                self.stop()
+                return
+            await asyncio.sleep(remaining)
+
+    @staticmethod
+    def _is_same_user(writer: asyncio.StreamWriter) -> bool:
+        sock = writer.get_extra_info("socket")
+        peercred = getattr(socket, "SO_PEERCRED", None)
+        if sock is None or peercred is None:
+            return True
+        credentials = sock.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", credentials)
+        return uid == os.getuid()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            if not self._is_same_user(writer):
+                return
+            while not self._stopped.is_set():
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self._send(writer, {"ok": False, "error": "Requête trop volumineuse."})
+                    return
+                if not line:
+                    return
+                self._last_activity = asyncio.get_running_loop().time()
+                await self._send(writer, await self._dispatch(line))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, response: dict) -> None:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def _dispatch(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+            handler = self._handlers.get(request.get("op"))
+            if handler is None:
+                raise ValueError(f"Opération inconnue : {request.get('op')}")
+            return {"ok": True, "result": await handler(request)}
+        except KeyError as e:
+            return {"ok": False, "error": f"Paramètre manquant : {e}"}
+        except (ValueError, RuntimeError, TypeError, AttributeError) as e:
+            return {"ok": False, "error": str(e)}
+
+    async def _run(self, func, *args):
+        if self._db is None:
+            raise RuntimeError("Le coffre est verrouillé.")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _op_ping(self, request: dict) -> dict:
+        return {"pid": os.getpid(), "idle_timeout": self.idle_timeout}
+
+    async def _op_list(self, request: dict) -> list[str]:
+        return await self._run(self._db.get_applications)
+
+    async def _op_search(self, request: dict) -> list[str]:
+        return await self._run(self._db.search_applications, str(request["query"]))
+
+    async def _op_get(self, request: dict) -> list[dict]:
+        application, user = str(request["application"]), request.get("user")
+
+        def lookup() -> list[dict]:
+            entries = [
+                entry for entry in self._db.get_info(application)
+                if user is None or entry.userid == user
+            ]
+            self._db.decrypt_entries(entries)
+            # Le coffre garde les entrées en cache : leurs mots de passe n'y restent pas.
+            credentials = [{"userid": entry.userid, "password": entry.password} for entry in entries]
+            wipe_entries(entries)
+            return credentials
+
+        return await self._run(lookup)
+
+    async def _op_lock(self, request: dict) -> None:
+        self.stop()
+
+
+def run_agent(
+    master_key: bytes,
+    socket_path: Path | None = None,
+    idle_timeout: int | None = None,
+) -> None:
+    asyncio.run(AgentServer(master_key, socket_path, idle_timeout).serve())
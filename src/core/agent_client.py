@@ -0,0 +1,55 @@
+import json
+import os
+import socket
+from pathlib import Path
+
+MAX_MESSAGE_SIZE = 1 << 20
+CONNECT_TIMEOUT = 2.0
+
+
+class AgentUnavailable(Exception):
+    pass
+
+
+def get_agent_socket_path() -> Path:
+    from src.core.config import get_config
+
+    configured = get_config().agent_socket
+    if configured is not None:
+        return configured
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "keypass-agent.sock"
+    from src.core.crypto import get_user_data_dir
+
+    return get_user_data_dir() / "agent.sock"
+
+
+def agent_request(op: str, socket_path: Path | None = None, **params) -> object:
+    """Envoie une requête à l'agent et renvoie son résultat.
+
+    Lève AgentUnavailable si aucun agent n'écoute, ValueError si l'agent refuse.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise AgentUnavailable("Sockets Unix non disponibles sur ce système.")
+    socket_path = socket_path or get_agent_socket_path()
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(str(socket_path))
+            client.settimeout(None)
+            client.sendall(json.dumps({"op": op, **params}).encode() + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline(MAX_MESSAGE_SIZE)
+    except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+        raise AgentUnavailable(str(e))
+    except OSError as e:
+        raise AgentUnavailable(f"Agent injoignable : {e}")
+
+    if not line:
+        raise AgentUnavailable("L'agent a fermé la connexion.")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise ValueError(response.get("error", "Erreur inconnue de l'agent."))
+    return response.get("result")
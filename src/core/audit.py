@@ -0,0 +1,303 @@
+import hashlib
+import hmac
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from src.core.crypto import VaultCipher, row_binding
+from src.core.migrations import AUDIT_CACHE_TABLE_NAME, TABLE_NAME
+from src.core.storage import Database
+from src.core.strength import get_matcher
+from src.core.utils import evaluate_password_strength
+
+ESTIMATOR_VERSION = 3
+WEAK_SCORE = 2
+PROCESS_POOL_THRESHOLD = 2_000
+SCORE_CHUNK_SIZE = 256
+
+_FINGERPRINT_CONTEXT = b"keypass-audit-fingerprint"
+# Le score et l'empreinte sont scellés, liés à l'empreinte du chiffré de leur entrée.
+_CACHE_CONTEXT = b"audit\0"
+
+
+class AuditFinding:
+    """Résultat d'audit d'une entrée ; l'application et l'utilisateur, chiffrés dans la
+    base, ne sont déchiffrés qu'à la première lecture."""
+
+    __slots__ = ("id", "score", "fingerprint", "_sealed", "_names", "_cipher")
+
+    def __init__(
+        self,
+        entry_id: int,
+        sealed_names: tuple[bytes, bytes, bytes, bytes],
+        score: int,
+        fingerprint: bytes,
+        cipher: VaultCipher,
+    ):
+        self.id = entry_id
+        self.score = score
+        self.fingerprint = fingerprint
+        self._sealed = sealed_names
+        self._names: tuple[str, str] | None = None
+        self._cipher = cipher
+
+    def _open(self) -> tuple[str, str]:
+        if self._names is None:
+            try:
+                application, userid = self._cipher.decrypt_many(self._sealed[:2], self._sealed[2:])
+            except Exception as e:
+                raise RuntimeError(f"Erreur de déchiffrement : {e}")
+            self._set_names(application, userid)
+        return self._names
+
+    def _set_names(self, application: str, userid: str) -> None:
+        self._names = (application, userid)
+
+    @property
+    def application(self) -> str:
+        return self._open()[0]
+
+    @property
+    def userid(self) -> str:
+        return self._open()[1]
+
+    def __repr__(self) -> str:
+        return (
+            f"AuditFinding(id={self.id}, application={self.application!r}, "
+            f"userid={self.userid!r}, score={self.score})"
+        )
+
+
+class AuditReport:
+
+    def __init__(self, findings: list[AuditFinding], recomputed: int):
+        self.findings = findings
+        self.recomputed = recomputed
+
+        groups: dict[bytes, list[AuditFinding]] = {}
+        for finding in findings:
+            groups.setdefault(finding.fingerprint, []).append(finding)
+        self.reused = [group for group in groups.values() if len(group) > 1]
+
+    @property
+    def weak(self) -> list[AuditFinding]:
+        return [finding for finding in self.findings if finding.score <= WEAK_SCORE]
+
+    @property
+    def flagged(self) -> list[AuditFinding]:
+        reused_ids = {finding.id for group in self.reused for finding in group}
+        return [
+            finding for finding in self.findings
+            if finding.score <= WEAK_SCORE or finding.id in reused_ids
+        ]
+
+
+def _token_digest(token: bytes) -> bytes:
+    return hashlib.sha256(token).digest()[:16]
+
+
+def _fingerprint_key(db: Database) -> bytes:
+    return hmac.new(db.key, _FINGERPRINT_CONTEXT, hashlib.sha256).digest()
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    # Créé une fois pour la session. Jamais par fork : l'interface a d'autres threads
+    # (wx, pools de connexions et de chiffrement) dont les verrous seraient copiés.
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method)
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _score_chunk(passwords: list[str]) -> list[int]:
+    return [evaluate_password_strength(password) for password in passwords]
+
+
+def _score_all(
+    passwords: list[str],
+    max_workers: int | None,
+    progress: Callable[[int], None] | None = None,
+) -> list[int]:
+    """Scores de robustesse ; `progress` reçoit le nombre de mots de passe évalués
+    après chaque tranche et peut interrompre le calcul en levant une exception."""
+    workers = max_workers or os.cpu_count() or 1
+    if len(passwords) < PROCESS_POOL_THRESHOLD or workers < 2:
+        scores: list[int] = []
+        for start in range(0, len(passwords), SCORE_CHUNK_SIZE):
+            scores.extend(_score_chunk(passwords[start:start + SCORE_CHUNK_SIZE]))
+            if progress is not None:
+                progress(len(scores))
+        return scores
+
+    # Compilé ici une fois : les processus n'ont plus qu'à charger le .kpac.
+    get_matcher()
+    chunk_size = max(SCORE_CHUNK_SIZE, -(-len(passwords) // (workers * 8)))
+    chunks = [passwords[start:start + chunk_size] for start in range(0, len(passwords), chunk_size)]
+    pool = _get_pool(workers)
+    futures = {pool.submit(_score_chunk, chunk): position for position, chunk in enumerate(chunks)}
+    results: list[list[int]] = [[] for _ in chunks]
+    scored = 0
+    try:
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            scored += len(results[futures[future]])
+            if progress is not None:
+                progress(scored)
+    except BrokenProcessPool as e:
+        shutdown_pool()
+        raise RuntimeError(f"Erreur lors de l'évaluation des mots de passe : {e}")
+    finally:
+        for future in futures:
+            future.cancel()
+    return [score for chunk in results for score in chunk]
+
+
+def _cache_binding(digest: bytes) -> bytes:
+    return _CACHE_CONTEXT + ESTIMATOR_VERSION.to_bytes(2, "big") + digest
+
+
+def _open_cache(
+    cipher: VaultCipher, sealed: dict[bytes, bytes]
+) -> dict[bytes, tuple[int, bytes]]:
+    digests = list(sealed)
+    try:
+        values = cipher.decrypt_many(
+            [sealed[digest] for digest in digests], [_cache_binding(digest) for digest in digests]
+        )
+    except Exception:
+        # Cache illisible (altéré ou écrit par une autre clé) : tout est recalculé.
+        return {}
+    cache = {}
+    for digest, value in zip(digests, values):
+        score, fingerprint = value.split(":", 1)
+        cache[digest] = (int(score), bytes.fromhex(fingerprint))
+    return cache
+
+
+def _seal_cache(
+    cipher: VaultCipher, entries: list[tuple[bytes, tuple[int, bytes]]]
+) -> list[bytes]:
+    return cipher.encrypt_many(
+        [f"{score}:{fingerprint.hex()}" for _, (score, fingerprint) in entries],
+        [_cache_binding(digest) for digest, _ in entries],
+    )
+
+
+def run_audit(
+    db: Database,
+    progress: Callable[[int, int], None] | None = None,
+    max_workers: int | None = None,
+) -> AuditReport:
+    try:
+        with db.read() as conn:
+            rows = conn.execute(
+                f"SELECT id, application, userid, password, application_index, userid_index "
+                f"FROM {TABLE_NAME}"
+            ).fetchall()
+            sealed = dict(conn.execute(
+                f"SELECT token_digest, sealed FROM {AUDIT_CACHE_TABLE_NAME} "
+                "WHERE estimator_version = ?",
+                (ESTIMATOR_VERSION,),
+            ))
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Erreur lors de la lecture du coffre pour l'audit : {e}")
+
+    digests = [_token_digest(row[3]) for row in rows]
+    current = set(digests)
+    cache = _open_cache(db.cipher, {
+        digest: value for digest, value in sealed.items() if digest in current
+    })
+    missing = [index for index, digest in enumerate(digests) if digest not in cache]
+    if progress is not None:
+        progress(len(rows) - len(missing), len(rows))
+
+    if missing:
+        try:
+            passwords = db.cipher.decrypt_many(
+                [rows[index][3] for index in missing],
+                [row_binding(rows[index][0]) for index in missing],
+            )
+        except Exception as e:
+            raise RuntimeError(f"Erreur de déchiffrement : {e}")
+        key = _fingerprint_key(db)
+        fingerprints = [hmac.new(key, password.encode(), hashlib.sha256).digest() for password in passwords]
+        cached = len(rows) - len(missing)
+        scores = _score_all(
+            passwords,
+            max_workers,
+            None if progress is None else lambda scored: progress(cached + scored, len(rows)),
+        )
+        del passwords
+
+        for index, score, fingerprint in zip(missing, scores, fingerprints):
+            cache[digests[index]] = (score, fingerprint)
+
+    computed = [(digest, cache[digest]) for digest in dict.fromkeys(digests[index] for index in missing)]
+    stale = [(digest,) for digest in sealed if digest not in current]
+    values = _seal_cache(db.cipher, computed)
+    try:
+        with db.transaction() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {AUDIT_CACHE_TABLE_NAME} "
+                "(token_digest, estimator_version, sealed) VALUES (?, ?, ?)",
+                [(digest, ESTIMATOR_VERSION, value) for (digest, _), value in zip(computed, values)],
+            )
+            conn.executemany(
+                f"DELETE FROM {AUDIT_CACHE_TABLE_NAME} WHERE token_digest = ?", stale
+            )
+            conn.execute(
+                f"DELETE FROM {AUDIT_CACHE_TABLE_NAME} WHERE estimator_version != ?",
+                (ESTIMATOR_VERSION,),
+            )
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Erreur lors de l'enregistrement du cache d'audit : {e}")
+
+    if progress is not None:
+        progress(len(rows), len(rows))
+
+    findings = [
+        AuditFinding(row[0], (row[1], row[2], row[4], row[5]), *cache[digest], db.cipher)
+        for row, digest in zip(rows, digests)
+    ]
+    report = AuditReport(findings, recomputed=len(missing))
+    _reveal_names(report.flagged, db.cipher)
+    return report
+
+
+def _reveal_names(findings: list[AuditFinding], cipher: VaultCipher) -> None:
+    # Seules les entrées signalées sont affichées : leurs noms sont déchiffrés en un
+    # lot, les autres le seront à la demande.
+    try:
+        names = cipher.decrypt_many(
+            [name for finding in findings for name in finding._sealed[:2]],
+            [index for finding in findings for index in finding._sealed[2:]],
+        )
+    except Exception as e:
+        raise RuntimeError(f"Erreur de déchiffrement : {e}")
+    for position, finding in enumerate(findings):
+        finding._set_names(names[2 * position], names[2 * position + 1])
@@ -0,0 +1,376 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from base64 import b64decode, b64encode, urlsafe_b64decode, urlsafe_b64encode
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Sequence
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from src.core.crypto import (
+    check_verification_token,
+    get_db_path,
+    get_kdf_path,
+    get_salt,
+    get_salt_path,
+    get_verify_path,
+    load_kdf_params,
+)
+from src.core.kdf import kdf_from_params
+
+ARCHIVE_SUFFIX = ".kpbak"
+MANIFEST_SUFFIX = ".kpidx"
+
+BACKUP_STEP_PAGES = 256
+PAGES_PER_CHUNK = 64
+
+_MAGIC = b"KPBK\x01"
+_MANIFEST_MAGIC = b"KPIX\x01"
+_DIGEST_SIZE = 16
+_TAG_SIZE = 16
+_MAX_PAGE_SIZE = 65536
+_MAX_CHUNK_SIZE = PAGES_PER_CHUNK * (4 + _MAX_PAGE_SIZE) + _TAG_SIZE
+
+
+class ArchiveHeader:
+    __slots__ = (
+        "id", "kind", "parent", "created", "page_size", "page_count",
+        "kdf", "salt", "verify", "key_salt", "digest",
+    )
+
+    def __init__(self, metadata: dict, digest: bytes):
+        self.id = metadata["id"]
+        self.kind = metadata["kind"]
+        self.parent = metadata.get("parent")
+        self.created = metadata["created"]
+        self.page_size = int(metadata["page_size"])
+        self.page_count = int(metadata["page_count"])
+        self.kdf = metadata["kdf"]
+        self.salt = b64decode(metadata["salt"])
+        self.verify = b64decode(metadata["verify"])
+        self.key_salt = b64decode(metadata["key_salt"])
+        self.digest = digest
+
+        if self.kind not in ("full", "incremental"):
+            raise ValueError(f"Type d'archive inconnu : {self.kind}")
+        if not 512 <= self.page_size <= _MAX_PAGE_SIZE:
+            raise ValueError(f"Taille de page invalide : {self.page_size}")
+
+
+def _derive_subkey(master_key: bytes, info: bytes, salt: bytes | None = None) -> bytes:
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=info).derive(
+        urlsafe_b64decode(master_key)
+    )
+
+
+def _page_hasher(master_key: bytes) -> Callable[[bytes], bytes]:
+    # Empreintes à clé : le manifeste ne révèle rien du contenu des pages.
+    hash_key = _derive_subkey(master_key, b"keypass-backup-pages")
+    return lambda page: hashlib.blake2b(page, digest_size=_DIGEST_SIZE, key=hash_key).digest()
+
+
+def _chunk_aad(header: ArchiveHeader, index: int, last: bool) -> bytes:
+    return header.digest + index.to_bytes(8, "big") + (b"\x01" if last else b"\x00")
+
+
+def _write_chunks(
+    stream: BinaryIO, header: ArchiveHeader, master_key: bytes, chunks: Iterator[bytes]
+) -> None:
+    # Chaque bloc est authentifié avec son rang et un drapeau de fin : un bloc
+    # déplacé, supprimé ou une archive tronquée sont détectés à la restauration.
+    aead = AESGCM(_derive_subkey(master_key, b"keypass-backup", header.key_salt))
+    index = 0
+    for chunk in chunks:
+        sealed = aead.encrypt(index.to_bytes(12, "big"), chunk, _chunk_aad(header, index, False))
+        stream.write(len(sealed).to_bytes(4, "big") + b"\x00" + sealed)
+        index += 1
+    sealed = aead.encrypt(index.to_bytes(12, "big"), b"", _chunk_aad(header, index, True))
+    stream.write(len(sealed).to_bytes(4, "big") + b"\x01" + sealed)
+
+
+def _read_chunks(stream: BinaryIO, header: ArchiveHeader, master_key: bytes) -> Iterator[bytes]:
+    aead = AESGCM(_derive_subkey(master_key, b"keypass-backup", header.key_salt))
+    index = 0
+    while True:
+        frame = stream.read(5)
+        if len(frame) < 5:
+            raise ValueError("Archive tronquée.")
+        length, last = int.from_bytes(frame[:4], "big"), frame[4] == 1
+        if not _TAG_SIZE <= length <= _MAX_CHUNK_SIZE:
+            raise ValueError("Archive corrompue.")
+        sealed = stream.read(length)
+        if len(sealed) < length:
+            raise ValueError("Archive tronquée.")
+        try:
+            chunk = aead.decrypt(index.to_bytes(12, "big"), sealed, _chunk_aad(header, index, last))
+        except InvalidTag:
+            raise ValueError("Archive corrompue ou mot de passe invalide.")
+        if last:
+            if stream.read(1):
+                raise ValueError("Données inattendues après la fin de l'archive.")
+            return
+        yield chunk
+        index += 1
+
+
+def _write_header(stream: BinaryIO, metadata: dict) -> ArchiveHeader:
+    payload = json.dumps(metadata, sort_keys=True).encode()
+    raw = _MAGIC + len(payload).to_bytes(4, "big") + payload
+    stream.write(raw)
+    return ArchiveHeader(metadata, hashlib.sha256(raw).digest())
+
+
+def _read_header(stream: BinaryIO) -> ArchiveHeader:
+    prefix = stream.read(len(_MAGIC) + 4)
+    if len(prefix) < len(_MAGIC) + 4 or not prefix.startswith(_MAGIC):
+        raise ValueError("Ce fichier n'est pas une sauvegarde KeyPass.")
+    length = int.from_bytes(prefix[len(_MAGIC):], "big")
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise ValueError("Archive tronquée.")
+    try:
+        return ArchiveHeader(json.loads(payload), hashlib.sha256(prefix + payload).digest())
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"En-tête d'archive invalide : {e}")
+
+
+def read_archive_header(path: Path) -> ArchiveHeader:
+    with open(path, "rb") as stream:
+        return _read_header(stream)
+
+
+def _manifest_path(archive_path: Path) -> Path:
+    return archive_path.with_suffix(MANIFEST_SUFFIX)
+
+
+def _write_manifest(path: Path, archive_id: str, page_size: int, digests: Sequence[bytes]) -> None:
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as stream:
+        stream.write(_MANIFEST_MAGIC + bytes.fromhex(archive_id) + page_size.to_bytes(4, "big"))
+        for digest in digests:
+            stream.write(digest)
+    os.replace(temp_path, path)
+
+
+def _read_manifest(path: Path) -> tuple[str, int, list[bytes]]:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        raise ValueError(
+            f"Index de sauvegarde introuvable ({path.name}) : effectuez une sauvegarde complète."
+        )
+    header_size = len(_MANIFEST_MAGIC) + 16 + 4
+    if not data.startswith(_MANIFEST_MAGIC) or (len(data) - header_size) % _DIGEST_SIZE:
+        raise ValueError(f"Index de sauvegarde invalide : {path.name}")
+    archive_id = data[len(_MANIFEST_MAGIC):len(_MANIFEST_MAGIC) + 16].hex()
+    page_size = int.from_bytes(data[header_size - 4:header_size], "big")
+    digests = [data[i:i + _DIGEST_SIZE] for i in range(header_size, len(data), _DIGEST_SIZE)]
+    return archive_id, page_size, digests
+
+
+def _snapshot(
+    db_path: Path,
+    target_path: Path,
+    progress: Callable[[int, int], None] | None,
+    cancel: threading.Event | None,
+) -> int:
+    # Copie cohérente par tranches de pages : en WAL, les écritures de l'application
+    # ne sont bloquées qu'entre deux tranches.
+    def on_step(status: int, remaining: int, total: int) -> None:
+        if cancel is not None and cancel.is_set():
+            raise RuntimeError("Sauvegarde annulée.")
+        if progress is not None:
+            progress(total - remaining, 2 * total)
+
+    source = sqlite3.connect(str(db_path))
+    target = sqlite3.connect(str(target_path))
+    try:
+        source.backup(target, pages=BACKUP_STEP_PAGES, progress=on_step, sleep=0.005)
+        return source.execute("PRAGMA page_size").fetchone()[0]
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Erreur lors de la copie de la base : {e}")
+    finally:
+        target.close()
+        source.close()
+
+
+def _iter_pages(path: Path, page_size: int) -> Iterator[tuple[int, bytes]]:
+    with open(path, "rb") as stream:
+        page_number = 1
+        while page := stream.read(page_size):
+            yield page_number, page
+            page_number += 1
+
+
+def create_backup(
+    master_key: bytes,
+    archive_path: Path,
+    base_path: Path | None = None,
+    db_path: Path | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> ArchiveHeader:
+    """Écrit une sauvegarde chiffrée du coffre.
+
+    Avec `base_path`, seules les pages modifiées depuis cette sauvegarde (complète
+    ou incrémentale) sont écrites. Un index des pages est conservé à côté de
+    l'archive pour la sauvegarde incrémentale suivante.
+    """
+    archive_path = Path(archive_path)
+    db_path = db_path or get_db_path()
+    hash_page = _page_hasher(master_key)
+
+    parent, base_digests = None, []
+    if base_path is not None:
+        parent, base_page_size, base_digests = _read_manifest(_manifest_path(Path(base_path)))
+
+    with tempfile.TemporaryDirectory(prefix="keypass-backup-") as directory:
+        snapshot_path = Path(directory) / "snapshot.db"
+        page_size = _snapshot(db_path, snapshot_path, progress, cancel)
+        page_count = snapshot_path.stat().st_size // page_size
+        if parent is not None and base_page_size != page_size:
+            parent, base_digests = None, []
+
+        metadata = {
+            "id": uuid.uuid4().hex,
+            "kind": "incremental" if parent else "full",
+            "parent": parent,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "page_size": page_size,
+            "page_count": page_count,
+            "kdf": load_kdf_params(),
+            "salt": b64encode(get_salt()).decode(),
+            "verify": b64encode(get_verify_path().read_bytes()).decode(),
+            "key_salt": b64encode(os.urandom(16)).decode(),
+        }
+        digests: list[bytes] = []
+
+        def changed_chunks() -> Iterator[bytes]:
+            batch: list[bytes] = []
+            for page_number, page in _iter_pages(snapshot_path, page_size):
+                if cancel is not None and cancel.is_set():
+                    raise RuntimeError("Sauvegarde annulée.")
+                digest = hash_page(page)
+                digests.append(digest)
+                if page_number > len(base_digests) or base_digests[page_number - 1] != digest:
+                    batch.append(page_number.to_bytes(4, "big") + page)
+                if len(batch) == PAGES_PER_CHUNK:
+                    yield b"".join(batch)
+                    batch.clear()
+                if progress is not None and page_number % BACKUP_STEP_PAGES == 0:
+                    progress(page_count + page_number, 2 * page_count)
+            if batch:
+                yield b"".join(batch)
+
+        temp_path = archive_path.with_name(archive_path.name + ".tmp")
+        try:
+            with open(temp_path, "wb") as stream:
+                header = _write_header(stream, metadata)
+                _write_chunks(stream, header, master_key, changed_chunks())
+                stream.flush()
+                os.fsync(stream.fileno())
+            os.replace(temp_path, archive_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    _write_manifest(_manifest_path(archive_path), header.id, page_size, digests)
+    if progress is not None:
+        progress(2 * page_count, 2 * page_count)
+    return header
+
+
+def restore_backup(
+    archive_paths: Sequence[Path],
+    password: str,
+    db_path: Path | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> ArchiveHeader:
+    """Restaure une sauvegarde complète suivie de ses sauvegardes incrémentales.
+
+    Les pages sont déchiffrées et écrites bloc par bloc : la mémoire utilisée ne
+    dépend pas de la taille du coffre. Le coffre ne doit pas être ouvert.
+    """
+    if not archive_paths:
+        raise ValueError("Aucune archive à restaurer.")
+    archive_paths = [Path(path) for path in archive_paths]
+    headers = [read_archive_header(path) for path in archive_paths]
+
+    if headers[0].kind != "full":
+        raise ValueError("La première archive doit être une sauvegarde complète.")
+    for previous, header in zip(headers, headers[1:]):
+        if header.kind != "incremental" or header.parent != previous.id:
+            raise ValueError(f"Archive hors séquence : {header.id} ne suit pas {previous.id}.")
+
+    keys: dict[tuple, bytes] = {}
+    for header in headers:
+        signature = (header.salt, json.dumps(header.kdf, sort_keys=True))
+        if signature not in keys:
+            kdf = kdf_from_params(header.kdf)
+            keys[signature] = urlsafe_b64encode(kdf.derive(password.encode(), header.salt))
+        if not check_verification_token(keys[signature], header.verify):
+            raise ValueError("Mot de passe invalide pour cette sauvegarde.")
+
+    db_path = Path(db_path or get_db_path())
+    restore_path = db_path.with_name(db_path.name + ".restore")
+    total = sum(header.page_count for header in headers)
+    done = 0
+    try:
+        with open(restore_path, "wb") as target:
+            for path, header in zip(archive_paths, headers):
+                key = keys[(header.salt, json.dumps(header.kdf, sort_keys=True))]
+                record_size = 4 + header.page_size
+                with open(path, "rb") as stream:
+                    _read_header(stream)
+                    for chunk in _read_chunks(stream, header, key):
+                        if len(chunk) % record_size:
+                            raise ValueError("Archive corrompue.")
+                        for offset in range(0, len(chunk), record_size):
+                            page_number = int.from_bytes(chunk[offset:offset + 4], "big")
+                            if not 1 <= page_number <= header.page_count:
+                                raise ValueError("Archive corrompue.")
+                            target.seek((page_number - 1) * header.page_size)
+                            target.write(chunk[offset + 4:offset + record_size])
+                        done += len(chunk) // record_size
+                        if progress is not None:
+                            progress(done, total)
+                target.truncate(header.page_count * header.page_size)
+            target.flush()
+            os.fsync(target.fileno())
+
+        check = sqlite3.connect(str(restore_path))
+        try:
+            result = check.execute("PRAGMA quick_check").fetchone()[0]
+        except sqlite3.Error as e:
+            result = str(e)
+        finally:
+            check.close()
+        if result != "ok":
+            raise ValueError(f"La base restaurée est invalide : {result}")
+
+        final = headers[-1]
+        for path, content in (
+            (get_salt_path(), final.salt),
+            (get_kdf_path(), json.dumps(final.kdf).encode()),
+            (get_verify_path(), final.verify),
+        ):
+            temp_path = path.with_name(path.name + ".tmp")
+            temp_path.write_bytes(content)
+            os.replace(temp_path, path)
+        for suffix in ("-wal", "-shm"):
+            stale = db_path.with_name(db_path.name + suffix)
+            if stale.exists():
+                stale.unlink()
+        os.replace(restore_path, db_path)
+    finally:
+        if restore_path.exists():
+            restore_path.unlink()
+    return headers[-1]
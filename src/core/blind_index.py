@@ -0,0 +1,159 @@
+import hashlib
+import hmac
+import sqlite3
+from typing import Iterable
+
+from src.core.crypto import VaultCipher, row_binding
+from src.core.migrations import PREFIX_TABLE_NAME, TABLE_NAME
+from src.core.secret import SecretBuffer, wipe_all
+
+INDEX_SIZE = 16
+PREFIX_MAX_LENGTH = 8
+ROW_HASH_BATCH_SIZE = 5_000
+
+_INDEX_KEY_CONTEXT = b"keypass-blind-index"
+_APPLICATION = b"application"
+_USERID = b"userid"
+_APPLICATION_PREFIX = b"application-prefix"
+_USERID_PREFIX = b"userid-prefix"
+_ROW = b"row"
+
+
+def normalize_prefix(text: str) -> str:
+    return text.strip().casefold()[:PREFIX_MAX_LENGTH]
+
+
+class BlindIndex:
+    """Empreintes HMAC des champs chiffrés, pour les retrouver sans les déchiffrer.
+
+    Les index exacts respectent la casse (comme l'ancienne contrainte d'unicité) ;
+    les préfixes sont normalisés et limités à PREFIX_MAX_LENGTH caractères.
+    """
+
+    __slots__ = ("_key",)
+
+    def __init__(self, data_key: bytes):
+        self._key = hmac.new(data_key, _INDEX_KEY_CONTEXT, hashlib.sha256).digest()
+
+    def _token(self, domain: bytes, value: str) -> bytes:
+        message = domain + b"\0" + value.encode()
+        return hmac.new(self._key, message, hashlib.sha256).digest()[:INDEX_SIZE]
+
+    def application(self, application: str) -> bytes:
+        return self._token(_APPLICATION, application)
+
+    def userid(self, userid: str) -> bytes:
+        return self._token(_USERID, userid)
+
+    def application_prefix(self, query: str) -> bytes:
+        return self._token(_APPLICATION_PREFIX, normalize_prefix(query))
+
+    def userid_prefix(self, query: str) -> bytes:
+        return self._token(_USERID_PREFIX, normalize_prefix(query))
+
+    def row_hash(
+        self, application_index: bytes, userid_index: bytes, password: str | SecretBuffer
+    ) -> int:
+        """Empreinte 64 bits du contenu d'une entrée, identique d'une copie du coffre à
+        l'autre (contrairement aux chiffrés) : la synchronisation compare les lignes
+        sans les déchiffrer."""
+        mac = hmac.new(self._key, _ROW + b"\0" + application_index + userid_index, hashlib.sha256)
+        mac.update(password.view() if isinstance(password, SecretBuffer) else password.encode())
+        return int.from_bytes(mac.digest()[:8], "big", signed=True)
+
+    def prefix_tokens(self, application: str, userid: str) -> set[bytes]:
+        tokens = set()
+        for domain, value in ((_APPLICATION_PREFIX, application), (_USERID_PREFIX, userid)):
+            value = normalize_prefix(value)
+            tokens.update(
+                self._token(domain, value[:length]) for length in range(1, len(value) + 1)
+            )
+        return tokens
+
+
+class NameCache:
+    """Noms d'applications déchiffrés, par empreinte.
+
+    Une empreinte désigne toujours le même nom : une fois déchiffré, un nom n'a plus
+    besoin de l'être tant que le coffre reste ouvert.
+    """
+
+    def __init__(self, cipher: VaultCipher):
+        self._cipher = cipher
+        self._names: dict[bytes, str] = {}
+
+    def resolve(self, rows: Iterable[tuple[bytes, str]]) -> list[str]:
+        rows = list(rows)
+        missing = {
+            name_index: sealed for name_index, sealed in rows if name_index not in self._names
+        }
+        if missing:
+            try:
+                names = self._cipher.decrypt_many(list(missing.values()), list(missing))
+            except Exception as e:
+                raise RuntimeError(f"Erreur de déchiffrement : {e}")
+            self._names.update(zip(missing, names))
+        return [self._names[name_index] for name_index, _ in rows]
+
+    def clear(self) -> None:
+        self._names.clear()
+
+
+def insert_prefix_tokens(
+    conn: sqlite3.Connection,
+    index: BlindIndex,
+    entries: Iterable[tuple[int, str, str]],
+) -> None:
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {PREFIX_TABLE_NAME} (token, entry_id) VALUES (?, ?)",
+        (
+            (token, entry_id)
+            for entry_id, application, userid in entries
+            for token in index.prefix_tokens(application, userid)
+        ),
+    )
+
+
+def fill_row_hashes(
+    conn: sqlite3.Connection,
+    cipher: VaultCipher,
+    index: BlindIndex,
+    batch_size: int = ROW_HASH_BATCH_SIZE,
+) -> int:
+    """Calcule, une fois, l'empreinte de contenu des entrées antérieures à la
+    synchronisation ; les écritures suivantes la tiennent à jour."""
+    pending = conn.execute(f"SELECT 1 FROM {TABLE_NAME} WHERE row_hash IS NULL LIMIT 1")
+    if pending.fetchone() is None:
+        return 0
+
+    done = 0
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        while True:
+            rows = conn.execute(
+                f"SELECT id, application_index, userid_index, password FROM {TABLE_NAME} "
+                "WHERE row_hash IS NULL LIMIT ?",
+                (batch_size,),
+            ).fetchall()
+            if not rows:
+                break
+            try:
+                secrets = cipher.decrypt_secrets_many(
+                    [row[3] for row in rows], [row_binding(row[0]) for row in rows]
+                )
+            except Exception as e:
+                raise RuntimeError(f"Erreur de déchiffrement : {e}")
+            try:
+                hashes = [
+                    (index.row_hash(row[1], row[2], secret), row[0])
+                    for row, secret in zip(rows, secrets)
+                ]
+            finally:
+                wipe_all(secrets)
+            conn.executemany(f"UPDATE {TABLE_NAME} SET row_hash = ? WHERE id = ?", hashes)
+            done += len(rows)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return done
@@ -0,0 +1,256 @@
+import binascii
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from src.core.config import get_config
+from src.core.crypto import row_binding
+from src.core.migrations import TABLE_NAME
+from src.core.secret import SecretBuffer, wipe_all
+from src.core.storage import Database
+
+CORPUS_SUFFIX = ".kphb"
+DEFAULT_PREFIX_SIZE = 10
+MIN_PREFIX_SIZE = 6
+SCAN_BATCH_SIZE = 1_000
+
+_MAGIC = b"KPHB"
+_FORMAT_VERSION = 1
+_DIGEST_SIZE = 20
+_BUCKETS = 1 << 16
+_HEADER = struct.Struct("<4sHHQ")
+_BOUNDS = struct.Struct("<2Q")
+_INDEX_OFFSET = _HEADER.size
+_RECORDS_OFFSET = _INDEX_OFFSET + 8 * (_BUCKETS + 1)
+_WRITE_CHUNK = 65_536
+
+
+class BreachCorpus:
+    """Empreintes SHA-1 de mots de passe compromis, lues par mmap.
+
+    Le fichier contient un en-tête, une table de 65 537 bornes (une par valeur des
+    deux premiers octets de l'empreinte) puis les préfixes d'empreintes, triés et de
+    taille fixe. Une recherche lit deux bornes puis fait une dichotomie dans son
+    seau : une quinzaine de pages au plus, sans jamais charger le fichier en mémoire.
+    """
+
+    __slots__ = ("path", "prefix_size", "_count", "_file", "_map")
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            self._file = self.path.open("rb")
+        except OSError as e:
+            raise RuntimeError(f"Erreur lors de l'ouverture du fichier de fuites : {e}")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise ValueError(f"'{self.path.name}' n'est pas un fichier de fuites KeyPass valide.")
+
+        try:
+            magic, version, prefix_size, count = _HEADER.unpack_from(self._map)
+        except struct.error:
+            magic, version, prefix_size, count = b"", 0, 0, 0
+        expected_size = _RECORDS_OFFSET + prefix_size * count
+        if magic != _MAGIC or version != _FORMAT_VERSION or len(self._map) != expected_size:
+            self.close()
+            raise ValueError(f"'{self.path.name}' n'est pas un fichier de fuites KeyPass valide.")
+        self.prefix_size = prefix_size
+        self._count = count
+        if hasattr(mmap, "MADV_RANDOM"):
+            # Accès dispersés : la lecture anticipée du noyau ne ferait que gaspiller des pages.
+            self._map.madvise(mmap.MADV_RANDOM)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, digest: bytes) -> bool:
+        key = digest[:self.prefix_size]
+        data = self._map
+        size = self.prefix_size
+        lo, hi = _BOUNDS.unpack_from(data, _INDEX_OFFSET + 8 * (key[0] << 8 | key[1]))
+        end = hi
+        while lo < hi:
+            middle = (lo + hi) // 2
+            offset = _RECORDS_OFFSET + middle * size
+            if data[offset:offset + size] < key:
+                lo = middle + 1
+            else:
+                hi = middle
+        offset = _RECORDS_OFFSET + lo * size
+        return lo < end and data[offset:offset + size] == key
+
+    def contains_password(self, password: str | SecretBuffer) -> bool:
+        data = password.view() if isinstance(password, SecretBuffer) else password.encode()
+        return hashlib.sha1(data).digest() in self
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "BreachCorpus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def build_corpus(
+    source: Path,
+    target: Path,
+    prefix_size: int = DEFAULT_PREFIX_SIZE,
+    progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """Compile un export texte trié par empreinte (format « SHA1:occurrences » de
+    Have I Been Pwned, une empreinte hexadécimale par ligne) en fichier de fuites.
+
+    Seuls les `prefix_size` premiers octets de chaque empreinte sont conservés : à
+    10 octets, un milliard d'empreintes tiennent en 10 Go avec une probabilité de
+    faux positif négligeable (2^-80 par empreinte). Renvoie le nombre d'empreintes.
+    """
+    if not MIN_PREFIX_SIZE <= prefix_size <= _DIGEST_SIZE:
+        raise ValueError(
+            f"La taille des préfixes doit être comprise entre {MIN_PREFIX_SIZE} "
+            f"et {_DIGEST_SIZE} octets."
+        )
+
+    source, target = Path(source), Path(target)
+    bounds = array("Q", bytes(8 * (_BUCKETS + 1)))
+    count = 0
+    previous = b""
+    chunk = bytearray()
+    temp_path = target.with_name(target.name + ".tmp")
+    try:
+        total = source.stat().st_size
+        with source.open("rb") as stream, temp_path.open("wb") as output:
+            output.write(bytes(_RECORDS_OFFSET))
+            for line_number, line in enumerate(stream, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    key = binascii.unhexlify(line[:2 * _DIGEST_SIZE])[:prefix_size]
+                except binascii.Error:
+                    key = b""
+                if len(key) != prefix_size:
+                    raise ValueError(f"Ligne {line_number} : empreinte SHA-1 invalide.")
+                if key <= previous:
+                    if key == previous:
+                        continue
+                    raise ValueError(
+                        f"Ligne {line_number} : le fichier doit être trié par empreinte."
+                    )
+                previous = key
+                bounds[(key[0] << 8 | key[1]) + 1] += 1
+                count += 1
+                chunk += key
+                if len(chunk) >= _WRITE_CHUNK * prefix_size:
+                    output.write(chunk)
+                    chunk.clear()
+                    if progress is not None:
+                        progress(stream.tell(), total)
+            output.write(chunk)
+
+            for bucket in range(1, _BUCKETS + 1):
+                bounds[bucket] += bounds[bucket - 1]
+            if sys.byteorder != "little":
+                bounds.byteswap()
+            output.seek(0)
+            output.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, prefix_size, count))
+            output.write(bounds.tobytes())
+        os.replace(temp_path, target)
+    except OSError as e:
+        temp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"Erreur lors de la compilation du fichier de fuites : {e}")
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    if progress is not None:
+        progress(total, total)
+    return count
+
+
+@lru_cache(maxsize=1)
+def get_breach_corpus() -> BreachCorpus | None:
+    """Fichier de fuites désigné par BREACH_CORPUS, ouvert une fois pour toutes."""
+    path = get_config().breach_corpus
+    return BreachCorpus(path) if path is not None else None
+
+
+class BreachFinding:
+    __slots__ = ("id", "application", "userid")
+
+    def __init__(self, entry_id: int, application: str, userid: str):
+        self.id = entry_id
+        self.application = application
+        self.userid = userid
+
+    def __repr__(self) -> str:
+        return (
+            f"BreachFinding(id={self.id}, application={self.application!r}, "
+            f"userid={self.userid!r})"
+        )
+
+
+class BreachReport:
+
+    def __init__(self, findings: list[BreachFinding], scanned: int):
+        self.findings = findings
+        self.scanned = scanned
+
+
+def scan_vault(
+    db: Database,
+    corpus: BreachCorpus,
+    progress: Callable[[int, int], None] | None = None,
+) -> BreachReport:
+    """Entrées du coffre dont le mot de passe figure dans le fichier de fuites.
+
+    Les mots de passe sont déchiffrés par lots de SCAN_BATCH_SIZE dans des tampons
+    effacés aussitôt comparés ; seuls les noms des entrées compromises sont déchiffrés.
+    """
+    try:
+        with db.read() as conn:
+            rows = conn.execute(
+                f"SELECT id, application, userid, password, application_index, userid_index "
+                f"FROM {TABLE_NAME} ORDER BY id"
+            ).fetchall()
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Erreur lors de la lecture du coffre : {e}")
+
+    breached = []
+    try:
+        for start in range(0, len(rows), SCAN_BATCH_SIZE):
+            batch = rows[start:start + SCAN_BATCH_SIZE]
+            secrets = db.cipher.decrypt_secrets_many(
+                [row[3] for row in batch], [row_binding(row[0]) for row in batch]
+            )
+            try:
+                breached.extend(
+                    row for row, secret in zip(batch, secrets) if corpus.contains_password(secret)
+                )
+            finally:
+                wipe_all(secrets)
+            if progress is not None:
+                progress(start + len(batch), len(rows))
+
+        names = db.cipher.decrypt_many(
+            [name for row in breached for name in (row[1], row[2])],
+            [index for row in breached for index in (row[4], row[5])],
+        )
+    except Exception as e:
+        raise RuntimeError(f"Erreur de déchiffrement : {e}")
+    findings = [
+        BreachFinding(row[0], names[2 * position], names[2 * position + 1])
+        for position, row in enumerate(breached)
+    ]
+    return BreachReport(findings, scanned=len(rows))
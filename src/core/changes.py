@@ -0,0 +1,49 @@
+import sqlite3
+
+from src.core.migrations import APPLICATIONS_TABLE_NAME
+
+ADDED = "added"
+REMOVED = "removed"
+COUNT_CHANGED = "count_changed"
+
+
+class ApplicationChange:
+    __slots__ = ("kind", "application", "count")
+
+    def __init__(self, kind: str, application: str, count: int):
+        self.kind = kind
+        self.application = application
+        self.count = count
+
+    def __repr__(self) -> str:
+        return f"ApplicationChange({self.kind}, {self.application!r}, count={self.count})"
+
+
+def application_counts(conn: sqlite3.Connection, names: dict[bytes, str]) -> dict[str, int]:
+    """Nombre d'entrées des applications données par {empreinte: nom en clair}."""
+    if not names:
+        return {}
+    indexes = list(names)
+    placeholders = ", ".join("?" * len(indexes))
+    rows = conn.execute(
+        f"SELECT name_index, entry_count FROM {APPLICATIONS_TABLE_NAME} "
+        f"WHERE name_index IN ({placeholders})",
+        indexes,
+    )
+    return {names[name_index]: count for name_index, count in rows}
+
+
+def diff_counts(before: dict[str, int], after: dict[str, int]) -> list[ApplicationChange]:
+    """Compare deux relevés d'application_counts pris autour d'une écriture."""
+    changes = []
+    for application in sorted(before.keys() | after.keys()):
+        old, new = before.get(application), after.get(application)
+        if old == new:
+            continue
+        if old is None:
+            changes.append(ApplicationChange(ADDED, application, new))
+        elif new is None:
+            changes.append(ApplicationChange(REMOVED, application, 0))
+        else:
+            changes.append(ApplicationChange(COUNT_CHANGED, application, new))
+    return changes
@@ -0,0 +1,108 @@
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+
+class Config:
+    __slots__ = (
+        "app_name",
+        "password_min_size",
+        "password_max_size",
+        "strength_dictionary",
+        "breach_corpus",
+        "metrics_enabled",
+        "metrics_dump",
+        "agent_socket",
+        "agent_idle_timeout",
+        "rotation_days",
+    )
+
+    def __init__(
+        self,
+        app_name: str,
+        password_min_size: int,
+        password_max_size: int,
+        strength_dictionary: Path | None,
+        breach_corpus: Path | None = None,
+        metrics_enabled: bool = False,
+        metrics_dump: Path | None = None,
+        agent_socket: Path | None = None,
+        agent_idle_timeout: int = 900,
+        rotation_days: int = 365,
+    ):
+        self.app_name = app_name
+        self.password_min_size = password_min_size
+        self.password_max_size = password_max_size
+        self.strength_dictionary = strength_dictionary
+        self.breach_corpus = breach_corpus
+        self.metrics_enabled = metrics_enabled
+        self.metrics_dump = metrics_dump
+        self.agent_socket = agent_socket
+        self.agent_idle_timeout = agent_idle_timeout
+        self.rotation_days = rotation_days
+
+
+def get_app_base_path() -> Path:
+    if hasattr(sys, "_MEIPASS"):
+        return Path(sys.executable).parent
+    return Path(__file__).resolve().parent.parent.parent
+
+
+def _read_env_file(path: Path) -> dict[str, str]:
+    values: dict[str, str] = {}
+    if not path.is_file():
+        return values
+
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key = key.removeprefix("export ").strip()
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        elif " #" in value:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key] = value
+    return values
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    values = _read_env_file(get_app_base_path() / ".env")
+    values.update(os.environ)
+
+    try:
+        password_min_size = int(values.get("PASSWORD_MIN_SIZE", "12"))
+        password_max_size = int(values.get("PASSWORD_MAX_SIZE", "50"))
+    except (TypeError, ValueError) as e:
+        raise RuntimeError(
+            f"Erreur lors du chargement des contraintes de taille de mot de passe : {e}"
+        )
+    try:
+        agent_idle_timeout = int(values.get("AGENT_IDLE_TIMEOUT", "900"))
+    except (TypeError, ValueError) as e:
+        raise RuntimeError(f"Délai d'inactivité de l'agent invalide : {e}")
+    try:
+        rotation_days = int(values.get("ROTATION_DAYS", "365"))
+    except (TypeError, ValueError) as e:
+        raise RuntimeError(f"Durée de rotation des mots de passe invalide : {e}")
+
+    dictionary = values.get("STRENGTH_DICTIONARY", "").strip()
+    breach_corpus = values.get("BREACH_CORPUS", "").strip()
+    metrics_dump = values.get("METRICS_DUMP", "").strip()
+    agent_socket = values.get("AGENT_SOCKET", "").strip()
+    return Config(
+        app_name=values.get("APP_NAME", "Keypass"),
+        password_min_size=password_min_size,
+        password_max_size=password_max_size,
+        strength_dictionary=Path(dictionary) if dictionary else None,
+        breach_corpus=Path(breach_corpus) if breach_corpus else None,
+        metrics_enabled=values.get("METRICS_ENABLED", "").strip().lower() in ("1", "true", "yes", "on"),
+        metrics_dump=Path(metrics_dump) if metrics_dump else None,
+        agent_socket=Path(agent_socket) if agent_socket else None,
+        agent_idle_timeout=agent_idle_timeout,
+        rotation_days=rotation_days,
+    )
@@ -1,16 +1,21 @@
 import sys
 import os
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from threading import Lock
+from typing import Callable, Sequence
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from base64 import urlsafe_b64encode
 
-
-def get_app_base_path() -> Path:
-    if hasattr(sys, "_MEIPASS"):
-        return Path(sys.executable).parent
-    return Path(__file__).resolve().parent.parent.parent
+from src.core.config import get_app_base_path
+from src.core.kdf import DEFAULT_PARAMS, calibrate, kdf_from_params
+from src.core.metrics import instrumented, result_length, single_row
+from src.core.secret import SecretBuffer
 
 
 def get_user_data_dir() -> Path:
@@ -47,28 +52,185 @@ def get_salt() -> bytes:
     return salt_path.read_bytes()
 
 
-def derive_key(password: str) -> bytes:
-    salt = get_salt()
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=salt,
-        iterations=480_000,
-    )
-    return urlsafe_b64encode(kdf.derive(password.encode()))
+def get_kdf_path() -> Path:
+    return get_salt_path().with_name("kdf.json")
 
 
-def encrypt_password(password: str, key: bytes) -> str:
-    fernet = Fernet(key)
-    return fernet.encrypt(password.encode()).decode()
+def load_kdf_params() -> dict:
+    kdf_path = get_kdf_path()
+    if kdf_path.exists():
+        return json.loads(kdf_path.read_text(encoding="utf-8"))
+    if is_first_run():
+        params = calibrate(get_salt())
+    else:
+        params = dict(DEFAULT_PARAMS)
+    kdf_path.write_text(json.dumps(params), encoding="utf-8")
+    return params
 
 
-def decrypt_password(token: str, key: bytes) -> str:
-    fernet = Fernet(key)
-    return fernet.decrypt(token.encode()).decode()
+@instrumented("crypto.derive_key")
+def derive_key(password: str, params: dict | None = None) -> bytes:
+    kdf = kdf_from_params(params or load_kdf_params())
+    return urlsafe_b64encode(kdf.derive(password.encode(), get_salt()))
+
+
+RECORD_VERSION = 1
+_RECORD_NONCE_SIZE = 12
+_RECORD_HEADER_SIZE = 1 + _RECORD_NONCE_SIZE
+_RECORD_TAG_SIZE = 16
+# Les versions récentes de cryptography déchiffrent directement dans le tampon du secret.
+_DECRYPT_INTO = hasattr(AESGCM, "decrypt_into")
+_RECORD_KEY_INFO = b"keypass-record-v1"
+
+
+def row_binding(entry_id: int) -> bytes:
+    """Données associées liant le mot de passe chiffré à sa ligne."""
+    return b"row\0" + entry_id.to_bytes(8, "big")
+
+
+class VaultCipher:
+    """Chiffre les champs du coffre en enregistrements binaires AES-256-GCM.
+
+    Format : version (1 octet) || nonce (12 octets) || chiffré || tag (16 octets).
+    Les données associées lient chaque enregistrement à son emplacement (identifiant
+    de ligne, empreinte du nom) : un enregistrement copié ailleurs ne se déchiffre pas.
+    Les jetons Fernet (texte) des coffres antérieurs restent lisibles.
+    """
+
+    PARALLEL_THRESHOLD = 512
+
+    def __init__(self, key: bytes, max_workers: int | None = None):
+        self._fernet = Fernet(key)
+        record_key = HKDF(
+            algorithm=hashes.SHA256(), length=32, salt=None, info=_RECORD_KEY_INFO
+        ).derive(key)
+        self._aead = AESGCM(record_key)
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = Lock()
+
+    def _encrypt(self, password: str | SecretBuffer, associated: bytes = b"") -> bytes:
+        nonce = os.urandom(_RECORD_NONCE_SIZE)
+        header = bytes((RECORD_VERSION,)) + nonce
+        plaintext = password.view() if isinstance(password, SecretBuffer) else password.encode()
+        return header + self._aead.encrypt(nonce, plaintext, header[:1] + associated)
+
+    def _decrypt(self, token: str | bytes, associated: bytes = b"") -> str:
+        if isinstance(token, str):
+            return self._fernet.decrypt(token.encode()).decode()
+        if len(token) < _RECORD_HEADER_SIZE or token[0] != RECORD_VERSION:
+            raise InvalidToken
+        try:
+            plaintext = self._aead.decrypt(
+                token[1:_RECORD_HEADER_SIZE], token[_RECORD_HEADER_SIZE:], token[:1] + associated
+            )
+        except InvalidTag:
+            raise InvalidToken
+        return plaintext.decode()
+
+    def _decrypt_secret(self, token: str | bytes, associated: bytes = b"") -> SecretBuffer:
+        if isinstance(token, str):
+            return SecretBuffer(self._fernet.decrypt(token.encode()))
+        if len(token) < _RECORD_HEADER_SIZE + _RECORD_TAG_SIZE or token[0] != RECORD_VERSION:
+            raise InvalidToken
+        nonce, ciphertext = token[1:_RECORD_HEADER_SIZE], token[_RECORD_HEADER_SIZE:]
+        try:
+            if not _DECRYPT_INTO:
+                return SecretBuffer(self._aead.decrypt(nonce, ciphertext, token[:1] + associated))
+            buffer = bytearray(len(ciphertext) - _RECORD_TAG_SIZE)
+            try:
+                self._aead.decrypt_into(nonce, ciphertext, token[:1] + associated, buffer)
+            except InvalidTag:
+                # Le tampon a pu recevoir le clair non authentifié avant l'échec.
+                buffer[:] = bytes(len(buffer))
+                raise
+        except InvalidTag:
+            raise InvalidToken
+        return SecretBuffer(buffer)
+
+    # Les lots passent par les primitives non instrumentées : une seule mesure par lot.
+    encrypt = instrumented(
+        "crypto.encrypt", rows=single_row, nbytes=lambda token, self, password, *args: len(password)
+    )(_encrypt)
+    decrypt = instrumented(
+        "crypto.decrypt", rows=single_row, nbytes=lambda password, *args: len(password)
+    )(_decrypt)
+    decrypt_secret = instrumented(
+        "crypto.decrypt_secret", rows=single_row, nbytes=lambda secret, *args: len(secret)
+    )(_decrypt_secret)
+
+    @instrumented("crypto.encrypt_many", rows=result_length,
+                  nbytes=lambda tokens, self, passwords, *args: sum(map(len, passwords)))
+    def encrypt_many(
+        self, passwords: Sequence[str | SecretBuffer], associated: Sequence[bytes] | None = None
+    ) -> list[bytes]:
+        return self._map(self._encrypt, passwords, associated)
+
+    @instrumented("crypto.decrypt_many", rows=result_length,
+                  nbytes=lambda passwords, *args: sum(map(len, passwords)))
+    def decrypt_many(
+        self, tokens: Sequence[str | bytes], associated: Sequence[bytes] | None = None
+    ) -> list[str]:
+        return self._map(self._decrypt, tokens, associated)
 
+    @instrumented("crypto.decrypt_secrets_many", rows=result_length,
+                  nbytes=lambda secrets, *args: sum(map(len, secrets)))
+    def decrypt_secrets_many(
+        self, tokens: Sequence[str | bytes], associated: Sequence[bytes] | None = None
+    ) -> list[SecretBuffer]:
+        """Comme decrypt_many, mais chaque mot de passe est déchiffré dans un tampon
+        effaçable : aucune chaîne n'est créée. À l'appelant de les effacer."""
+        return self._map(self._decrypt_secret, tokens, associated)
 
-def _get_verify_path() -> Path:
+    def _map(
+        self,
+        func: Callable[[object, bytes], object],
+        items: Sequence,
+        associated: Sequence[bytes] | None,
+    ) -> list:
+        if associated is None:
+            associated = [b""] * len(items)
+        pairs = list(zip(items, associated))
+        if len(pairs) < self.PARALLEL_THRESHOLD or self._max_workers < 2:
+            return [func(item, data) for item, data in pairs]
+
+        chunk_size = -(-len(pairs) // self._max_workers)
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        executor = self._get_executor()
+        futures = [
+            executor.submit(lambda chunk: [func(item, data) for item, data in chunk], chunk)
+            for chunk in chunks
+        ]
+
+        results: list = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="keypass-crypto"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+def encrypt_password(password: str, key: bytes) -> bytes:
+    return VaultCipher(key).encrypt(password)
+
+
+def decrypt_password(token: str | bytes, key: bytes) -> str:
+    return VaultCipher(key).decrypt(token)
+
+
+def get_verify_path() -> Path:
     if hasattr(sys, "_MEIPASS"):
         return get_user_data_dir() / "verify.bin"
     base = get_app_base_path()
@@ -76,23 +238,29 @@ def _get_verify_path() -> Path:
 
 
 def is_first_run() -> bool:
-    return not _get_verify_path().exists()
+    return not get_verify_path().exists()
 
 
 def store_master_verification(key: bytes) -> None:
     fernet = Fernet(key)
     encrypted = fernet.encrypt(_VERIFICATION_TOKEN)
-    _get_verify_path().write_bytes(encrypted)
+    verify_path = get_verify_path()
+    temp_path = verify_path.with_name(verify_path.name + ".tmp")
+    temp_path.write_bytes(encrypted)
+    os.replace(temp_path, verify_path)
 
 
-def verify_master_password(key: bytes) -> bool:
-    verify_path = _get_verify_path()
-    if not verify_path.exists():
-        return True
-
+def check_verification_token(key: bytes, token: bytes) -> bool:
     try:
         fernet = Fernet(key)
-        decrypted = fernet.decrypt(verify_path.read_bytes())
+        decrypted = fernet.decrypt(token)
         return decrypted == _VERIFICATION_TOKEN
     except InvalidToken:
-        return False
\ No newline at end of file
+        return False
+
+
+def verify_master_password(key: bytes) -> bool:
+    verify_path = get_verify_path()
+    if not verify_path.exists():
+        return True
+    return check_verification_token(key, verify_path.read_bytes())
\ No newline at end of file
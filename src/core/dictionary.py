@@ -0,0 +1,178 @@
+import gzip
+import marshal
+import os
+from array import array
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator
+
+MIN_WORD_LENGTH = 3
+
+_FORMAT_VERSION = 2
+_SHIFT = 21
+
+
+class DictionaryMatcher:
+    __slots__ = (
+        "_child_start", "_child_codes", "_child_targets",
+        "_fail", "_length", "_rank", "_out_link",
+    )
+
+    _ARRAYS = __slots__
+
+    def __init__(self, *arrays: array):
+        for name, data in zip(self._ARRAYS, arrays):
+            setattr(self, name, data)
+
+    def __len__(self) -> int:
+        return len(self._length)
+
+    @classmethod
+    def build(cls, words: Iterable[str]) -> "DictionaryMatcher":
+        goto: dict[int, int] = {}
+        length = array("i", [0])
+        rank = array("i", [0])
+        children: list[list[tuple[int, int]]] = [[]]
+
+        for position, word in enumerate(words, start=1):
+            word = word.strip().lower()
+            if len(word) < MIN_WORD_LENGTH:
+                continue
+            node = 0
+            for char in word:
+                code = ord(char)
+                child = goto.get(node << _SHIFT | code)
+                if child is None:
+                    child = len(length)
+                    goto[node << _SHIFT | code] = child
+                    length.append(0)
+                    rank.append(0)
+                    children.append([])
+                    children[node].append((code, child))
+                node = child
+            if not rank[node]:
+                rank[node] = position
+                length[node] = len(word)
+
+        fail = array("i", bytes(4 * len(length)))
+        out_link = array("i", bytes(4 * len(length)))
+        queue = deque(child for _, child in children[0])
+        while queue:
+            node = queue.popleft()
+            for code, child in children[node]:
+                state = fail[node]
+                while True:
+                    target = goto.get(state << _SHIFT | code)
+                    if target is not None and target != child:
+                        fail[child] = target
+                        break
+                    if not state:
+                        break
+                    state = fail[state]
+                suffix = fail[child]
+                out_link[child] = suffix if rank[suffix] else out_link[suffix]
+                queue.append(child)
+
+        child_start = array("i", [0])
+        child_codes = array("i")
+        child_targets = array("i")
+        for edges in children:
+            edges.sort()
+            child_codes.extend(code for code, _ in edges)
+            child_targets.extend(target for _, target in edges)
+            child_start.append(len(child_codes))
+
+        return cls(child_start, child_codes, child_targets, fail, length, rank, out_link)
+
+    def step(self, state: int, char: str) -> int:
+        code = ord(char)
+        codes = self._child_codes
+        while True:
+            lo = self._child_start[state]
+            hi = self._child_start[state + 1]
+            if lo < hi:
+                index = bisect_left(codes, code, lo, hi)
+                if index < hi and codes[index] == code:
+                    return self._child_targets[index]
+            if not state:
+                return 0
+            state = self._fail[state]
+
+    def outputs(self, state: int) -> Iterator[tuple[int, int]]:
+        if not self._rank[state]:
+            state = self._out_link[state]
+        while state:
+            yield self._length[state], self._rank[state]
+            state = self._out_link[state]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, int]]:
+        state = 0
+        for end, char in enumerate(text.lower(), start=1):
+            state = self.step(state, char)
+            for word_length, word_rank in self.outputs(state):
+                yield end - word_length, end, word_rank
+
+    def save(self, path: Path, signature: tuple) -> None:
+        payload = marshal.dumps((
+            _FORMAT_VERSION,
+            signature,
+            *(getattr(self, name).tobytes() for name in self._ARRAYS),
+        ))
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, signature: tuple) -> "DictionaryMatcher | None":
+        try:
+            version, stored_signature, *payload = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != _FORMAT_VERSION or tuple(stored_signature) != tuple(signature):
+            return None
+        if len(payload) != len(cls._ARRAYS):
+            return None
+
+        arrays = []
+        for data in payload:
+            values = array("i")
+            values.frombytes(data)
+            arrays.append(values)
+        return cls(*arrays)
+
+
+def _iter_wordlist(path: Path) -> Iterator[str]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8", errors="ignore") as stream:
+        for line in stream:
+            yield line.split()[0] if line.strip() else ""
+
+
+def load_wordlist_matcher(
+    wordlist_path: Path,
+    builtin_words: Iterable[str] = (),
+    cache_path: Path | None = None,
+    signature: tuple | None = None,
+) -> DictionaryMatcher:
+    builtin_words = list(builtin_words)
+    if signature is None:
+        stat = wordlist_path.stat()
+        signature = (str(wordlist_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    signature = (*signature, len(builtin_words))
+    cache_path = cache_path or wordlist_path.with_suffix(".kpac")
+
+    matcher = DictionaryMatcher.load(cache_path, signature)
+    if matcher is not None:
+        return matcher
+
+    def words() -> Iterator[str]:
+        yield from builtin_words
+        yield from _iter_wordlist(wordlist_path)
+
+    matcher = DictionaryMatcher.build(words())
+    try:
+        matcher.save(cache_path, signature)
+    except OSError:
+        pass
+    return matcher
@@ -0,0 +1,68 @@
+from src.core.crypto import VaultCipher, row_binding
+from src.core.secret import SecretBuffer
+
+
+class Entry:
+    __slots__ = ("id", "application", "userid", "token", "_cipher", "_secret")
+
+    def __init__(
+        self, entry_id: int, application: str, userid: str, token: bytes, cipher: VaultCipher
+    ):
+        self.id = entry_id
+        self.application = application
+        self.userid = userid
+        self.token = token
+        self._cipher = cipher
+        self._secret: SecretBuffer | None = None
+
+    @property
+    def secret(self) -> SecretBuffer:
+        """Mot de passe déchiffré dans un tampon effaçable, gardé jusqu'à `wipe()`.
+
+        Utilisé comme gestionnaire de contexte, il est effacé à la sortie du bloc et
+        sera déchiffré de nouveau au prochain accès.
+        """
+        if not self.is_decrypted:
+            try:
+                self._secret = self._cipher.decrypt_secret(self.token, row_binding(self.id))
+            except Exception as e:
+                raise RuntimeError(f"Erreur de déchiffrement : {e}")
+        return self._secret
+
+    @property
+    def password(self) -> str:
+        return self.secret.reveal()
+
+    @property
+    def is_decrypted(self) -> bool:
+        return self._secret is not None and not self._secret.wiped
+
+    def _set_secret(self, secret: SecretBuffer) -> None:
+        self._secret = secret
+
+    def wipe(self) -> None:
+        if self._secret is not None:
+            self._secret.wipe()
+            self._secret = None
+
+    def __repr__(self) -> str:
+        return f"Entry(id={self.id}, application={self.application!r}, userid={self.userid!r})"
+
+
+def decrypt_entries(entries: list[Entry], cipher: VaultCipher) -> None:
+    pending = [entry for entry in entries if not entry.is_decrypted]
+    if not pending:
+        return
+    try:
+        secrets = cipher.decrypt_secrets_many(
+            [entry.token for entry in pending], [row_binding(entry.id) for entry in pending]
+        )
+    except Exception as e:
+        raise RuntimeError(f"Erreur de déchiffrement : {e}")
+    for entry, secret in zip(pending, secrets):
+        entry._set_secret(secret)
+
+
+def wipe_entries(entries: list[Entry]) -> None:
+    for entry in entries:
+        entry.wipe()
@@ -0,0 +1,199 @@
+import sqlite3
+from typing import Callable
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from src.core.blind_index import BlindIndex, insert_prefix_tokens
+from src.core.crypto import VaultCipher, row_binding
+from src.core.migrations import APPLICATIONS_TABLE_NAME, KEY_TABLE_NAME, TABLE_NAME
+
+LEGACY_KEY_VERSION = 0
+DATA_KEY_VERSION = 1
+RECORD_KEY_VERSION = 2
+REKEY_BATCH_SIZE = 5_000
+
+_ACTIVE = "active"
+_PENDING = "pending"
+
+
+def generate_data_key() -> bytes:
+    return Fernet.generate_key()
+
+
+def load_data_key(conn: sqlite3.Connection, master_key: bytes) -> bytes | None:
+    """Déballe la clé de données avec la clé maître, ou None si le coffre n'en a pas.
+
+    Une clé « pending » qui s'ouvre avec la clé maître est celle d'un changement de
+    mot de passe interrompu après l'écriture du token de vérification : elle est
+    promue. Une clé « pending » qui ne s'ouvre pas provient d'un changement abandonné
+    avant cette étape : elle est supprimée.
+    """
+    rows = dict(conn.execute(f"SELECT slot, wrapped FROM {KEY_TABLE_NAME}").fetchall())
+    if not rows:
+        return None
+
+    fernet = Fernet(master_key)
+    for slot in (_ACTIVE, _PENDING):
+        if slot not in rows:
+            continue
+        try:
+            data_key = fernet.decrypt(rows[slot])
+        except InvalidToken:
+            continue
+        if slot == _PENDING:
+            commit_staged_data_key(conn)
+        elif _PENDING in rows:
+            with conn:
+                conn.execute(f"DELETE FROM {KEY_TABLE_NAME} WHERE slot = ?", (_PENDING,))
+        return data_key
+    raise ValueError("La clé maître ne permet pas d'ouvrir la clé du coffre.")
+
+
+def store_data_key(conn: sqlite3.Connection, master_key: bytes, data_key: bytes) -> None:
+    with conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {KEY_TABLE_NAME} (slot, wrapped) VALUES (?, ?)",
+            (_ACTIVE, Fernet(master_key).encrypt(data_key)),
+        )
+
+
+def stage_data_key(conn: sqlite3.Connection, master_key: bytes, data_key: bytes) -> None:
+    with conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {KEY_TABLE_NAME} (slot, wrapped) VALUES (?, ?)",
+            (_PENDING, Fernet(master_key).encrypt(data_key)),
+        )
+
+
+def commit_staged_data_key(conn: sqlite3.Connection) -> None:
+    with conn:
+        conn.execute(f"DELETE FROM {KEY_TABLE_NAME} WHERE slot = ?", (_ACTIVE,))
+        conn.execute(
+            f"UPDATE {KEY_TABLE_NAME} SET slot = ? WHERE slot = ?", (_ACTIVE, _PENDING)
+        )
+
+
+def count_legacy_rows(conn: sqlite3.Connection) -> int:
+    return conn.execute(
+        # Littéral plutôt que paramètre : l'index partiel idx_passwords_legacy s'applique.
+        f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE key_version < {RECORD_KEY_VERSION}"
+    ).fetchone()[0]
+
+
+def _open_passwords(
+    rows: list[tuple], legacy_cipher: VaultCipher, data_cipher: VaultCipher
+) -> list[str]:
+    # Version 0 : Fernet sous la clé maître ; version 1 : Fernet sous la clé de données.
+    passwords: list[str] = [""] * len(rows)
+    for cipher, version in ((legacy_cipher, LEGACY_KEY_VERSION), (data_cipher, DATA_KEY_VERSION)):
+        positions = [position for position, row in enumerate(rows) if row[4] == version]
+        tokens = [rows[position][3] for position in positions]
+        for position, password in zip(positions, cipher.decrypt_many(tokens)):
+            passwords[position] = password
+    return passwords
+
+
+def _open_names(rows: list[tuple], data_cipher: VaultCipher) -> list[tuple[str, str]]:
+    # Avant les index aveugles, les noms sont en clair ; ensuite, en Fernet.
+    names = [(row[1], row[2]) for row in rows]
+    sealed = [position for position, row in enumerate(rows) if row[5] is not None]
+    values = data_cipher.decrypt_many([value for position in sealed for value in names[position]])
+    for offset, position in enumerate(sealed):
+        names[position] = (values[2 * offset], values[2 * offset + 1])
+    return names
+
+
+def rekey_legacy_rows(
+    conn: sqlite3.Connection,
+    master_key: bytes,
+    data_cipher: VaultCipher,
+    index: BlindIndex,
+    batch_size: int = REKEY_BATCH_SIZE,
+    progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """Réécrit au format courant les entrées des versions antérieures.
+
+    Mots de passe chiffrés par la clé maître ou en jetons Fernet, noms en clair ou
+    en Fernet : tout devient des enregistrements binaires sous la clé de données,
+    liés à leur ligne et à leurs index aveugles.
+
+    Tout est fait dans une seule transaction : une interruption laisse le coffre dans
+    son état d'origine, et la migration reprend à l'ouverture suivante avec la même
+    clé de données, déjà enregistrée. La base est ensuite compactée : aucune page
+    libre ne garde d'ancien nom en clair.
+    """
+    total = count_legacy_rows(conn)
+    if not total:
+        return 0
+
+    legacy_cipher = VaultCipher(master_key)
+    done = 0
+    last_id = 0
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        while True:
+            rows = conn.execute(
+                f"SELECT id, application, userid, password, key_version, "
+                f"application_index, userid_index FROM {TABLE_NAME} "
+                f"WHERE key_version < {RECORD_KEY_VERSION} AND id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            passwords = _open_passwords(rows, legacy_cipher, data_cipher)
+            names = _open_names(rows, data_cipher)
+            indexes = [
+                (index.application(application), index.userid(userid))
+                for application, userid in names
+            ]
+            sealed = data_cipher.encrypt_many(
+                [value for (application, userid), password in zip(names, passwords)
+                 for value in (application, userid, password)],
+                [data for row, (application_index, userid_index) in zip(rows, indexes)
+                 for data in (application_index, userid_index, row_binding(row[0]))],
+            )
+            conn.executemany(
+                f"UPDATE {TABLE_NAME} SET application = ?, userid = ?, password = ?, "
+                "application_index = ?, userid_index = ?, key_version = ? WHERE id = ?",
+                [
+                    (*sealed[3 * position:3 * position + 3], *indexes[position],
+                     RECORD_KEY_VERSION, row[0])
+                    for position, row in enumerate(rows)
+                ],
+            )
+            insert_prefix_tokens(
+                conn, index, [(row[0], *row_names) for row, row_names in zip(rows, names)]
+            )
+            last_id = rows[-1][0]
+            done += len(rows)
+            if progress is not None:
+                progress(done, total)
+        _reseal_application_names(conn, data_cipher)
+        conn.commit()
+    except InvalidToken:
+        conn.rollback()
+        raise RuntimeError("Une entrée ne peut pas être déchiffrée avec la clé maître.")
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        legacy_cipher.close()
+
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return done
+
+
+def _reseal_application_names(conn: sqlite3.Connection, data_cipher: VaultCipher) -> None:
+    # Les noms de la liste des applications copiés depuis des entrées en Fernet.
+    rows = conn.execute(
+        f"SELECT name_index, name FROM {APPLICATIONS_TABLE_NAME} WHERE typeof(name) = 'text'"
+    ).fetchall()
+    if not rows:
+        return
+    indexes = [name_index for name_index, _ in rows]
+    names = data_cipher.decrypt_many([name for _, name in rows], indexes)
+    conn.executemany(
+        f"UPDATE {APPLICATIONS_TABLE_NAME} SET name = ? WHERE name_index = ?",
+        zip(data_cipher.encrypt_many(names, indexes), indexes),
+    )
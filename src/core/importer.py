@@ -0,0 +1,206 @@
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Iterator, TextIO
+from xml.etree.ElementTree import ParseError, iterparse
+
+from src.core.storage import Database
+
+ImportedEntry = tuple[str, str, str]
+
+_CHUNK_SIZE = 64 * 1024
+# Au plus 5 caractères séparent la fin du tampon d'une erreur due à un littéral, un
+# nombre ou un échappement \uXXXX coupé (« fals », « -1e+ », « \u00e »).
+_PARTIAL_TOKEN_LENGTH = 5
+
+_APPLICATION_COLUMNS = ("application", "name", "title", "account", "url", "login_uri", "web site")
+_USERID_COLUMNS = ("userid", "username", "login_username", "login name", "login", "user name", "email")
+_PASSWORD_COLUMNS = ("password", "login_password")
+
+
+def _pick_column(header: list[str], candidates: tuple[str, ...]) -> int | None:
+    normalized = [column.strip().lower() for column in header]
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized.index(candidate)
+    return None
+
+
+def iter_csv(stream: TextIO) -> Iterator[ImportedEntry]:
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    app_index = _pick_column(header, _APPLICATION_COLUMNS)
+    user_index = _pick_column(header, _USERID_COLUMNS)
+    password_index = _pick_column(header, _PASSWORD_COLUMNS)
+    if app_index is None or password_index is None:
+        raise ValueError("Colonnes 'application' et 'mot de passe' introuvables dans le CSV.")
+
+    for row in reader:
+        if len(row) <= max(app_index, password_index):
+            continue
+        application = row[app_index].strip()
+        userid = row[user_index].strip() if user_index is not None and user_index < len(row) else ""
+        password = row[password_index]
+        if application and password:
+            yield application, userid, password
+
+
+class _JsonStream:
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Fin de fichier JSON inattendue.")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"JSON invalide : '{char}' attendu.")
+        self._pos += 1
+
+    def consume_if(self, char: str) -> bool:
+        if self.peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buffer, self._pos)
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return obj
+            except json.JSONDecodeError as e:
+                # Seule une valeur coupée par la fin du tampon attend le morceau suivant ;
+                # toute autre erreur est définitive : relire la suite du fichier pour la
+                # réanalyser à chaque morceau serait quadratique.
+                truncated = (
+                    e.msg.startswith("Unterminated string")
+                    or len(self._buffer) - e.pos <= _PARTIAL_TOKEN_LENGTH
+                )
+                if self._eof or not truncated:
+                    raise ValueError("JSON invalide.")
+            self._fill()
+
+    def iter_object(self) -> Iterator[str]:
+        self.expect("{")
+        if self.consume_if("}"):
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.consume_if("}"):
+                return
+            self.expect(",")
+
+    def iter_array(self) -> Iterator:
+        self.expect("[")
+        if self.consume_if("]"):
+            return
+        while True:
+            yield self.value()
+            if self.consume_if("]"):
+                return
+            self.expect(",")
+
+
+def iter_bitwarden_json(stream: TextIO) -> Iterator[ImportedEntry]:
+    parser = _JsonStream(stream)
+    for key in parser.iter_object():
+        if key != "items":
+            parser.value()
+            continue
+        for item in parser.iter_array():
+            login = item.get("login") if isinstance(item, dict) else None
+            if not login:
+                continue
+            application = (item.get("name") or "").strip()
+            userid = (login.get("username") or "").strip()
+            password = login.get("password") or ""
+            if application and password:
+                yield application, userid, password
+
+
+def iter_keepass_xml(source: str | Path) -> Iterator[ImportedEntry]:
+    stack = []
+    history_depth = 0
+    for event, elem in iterparse(str(source), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "History":
+                history_depth += 1
+            continue
+
+        stack.pop()
+        if elem.tag == "History":
+            history_depth -= 1
+        if elem.tag != "Entry" or history_depth:
+            continue
+
+        fields = {}
+        for string in elem.iterfind("String"):
+            fields[string.findtext("Key", "")] = string.findtext("Value", "") or ""
+        if stack:
+            stack[-1].remove(elem)
+
+        application = (fields.get("Title") or fields.get("URL") or "").strip()
+        userid = fields.get("UserName", "").strip()
+        password = fields.get("Password", "")
+        if application and password:
+            yield application, userid, password
+
+
+def iter_entries(path: str | Path, fmt: str | None = None) -> Iterator[ImportedEntry]:
+    path = Path(path)
+    fmt = (fmt or path.suffix.lstrip(".")).lower()
+
+    try:
+        if fmt == "csv":
+            with path.open(newline="", encoding="utf-8-sig") as stream:
+                yield from iter_csv(stream)
+        elif fmt == "json":
+            with path.open(encoding="utf-8") as stream:
+                yield from iter_bitwarden_json(stream)
+        elif fmt == "xml":
+            yield from iter_keepass_xml(path)
+        else:
+            raise ValueError(f"Format d'import non pris en charge : '{fmt}'.")
+    except (csv.Error, ParseError, UnicodeDecodeError) as e:
+        raise ValueError(f"Fichier d'import invalide : {e}")
+
+
+def import_file(
+    db: Database,
+    path: str | Path,
+    fmt: str | None = None,
+    batch_size: int = 500,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    return db.insert_many(iter_entries(path, fmt), batch_size=batch_size, progress=progress)
@@ -0,0 +1,142 @@
+from time import perf_counter
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+try:
+    from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
+except ImportError:
+    Argon2id = None
+
+KEY_LENGTH = 32
+DEFAULT_TARGET_SECONDS = 1.0
+
+
+class Pbkdf2Kdf:
+    NAME = "pbkdf2"
+    MIN_ITERATIONS = 480_000
+    PROBE_ITERATIONS = 50_000
+
+    def __init__(self, iterations: int = MIN_ITERATIONS):
+        self.iterations = iterations
+
+    def derive(self, password: bytes, salt: bytes) -> bytes:
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=KEY_LENGTH,
+            salt=salt,
+            iterations=self.iterations,
+        )
+        return kdf.derive(password)
+
+    def to_params(self) -> dict:
+        return {"algorithm": self.NAME, "iterations": self.iterations}
+
+    @classmethod
+    def calibrate(cls, salt: bytes, target_seconds: float) -> "Pbkdf2Kdf":
+        elapsed = _measure(cls(cls.PROBE_ITERATIONS), salt)
+        iterations = int(cls.PROBE_ITERATIONS * target_seconds / elapsed)
+        return cls(max(cls.MIN_ITERATIONS, iterations // 1000 * 1000))
+
+
+class ScryptKdf:
+    NAME = "scrypt"
+    MIN_LOG_N = 15
+    MAX_LOG_N = 20
+    PROBE_LOG_N = 14
+
+    def __init__(self, log_n: int = MIN_LOG_N, r: int = 8, p: int = 1):
+        self.log_n = log_n
+        self.r = r
+        self.p = p
+
+    def derive(self, password: bytes, salt: bytes) -> bytes:
+        kdf = Scrypt(salt=salt, length=KEY_LENGTH, n=2 ** self.log_n, r=self.r, p=self.p)
+        return kdf.derive(password)
+
+    def to_params(self) -> dict:
+        return {"algorithm": self.NAME, "log_n": self.log_n, "r": self.r, "p": self.p}
+
+    @classmethod
+    def calibrate(cls, salt: bytes, target_seconds: float) -> "ScryptKdf":
+        elapsed = _measure(cls(cls.PROBE_LOG_N), salt)
+        log_n = cls.PROBE_LOG_N
+        while log_n < cls.MAX_LOG_N and elapsed * 2 <= target_seconds:
+            log_n += 1
+            elapsed *= 2
+        return cls(max(cls.MIN_LOG_N, log_n))
+
+
+class Argon2idKdf:
+    NAME = "argon2id"
+    MIN_ITERATIONS = 3
+    MAX_ITERATIONS = 64
+
+    def __init__(self, iterations: int = MIN_ITERATIONS, memory_cost: int = 64 * 1024, lanes: int = 4):
+        self.iterations = iterations
+        self.memory_cost = memory_cost
+        self.lanes = lanes
+
+    def derive(self, password: bytes, salt: bytes) -> bytes:
+        if Argon2id is None:
+            raise RuntimeError("Argon2id n'est pas disponible avec cette version de 'cryptography'.")
+        kdf = Argon2id(
+            salt=salt,
+            length=KEY_LENGTH,
+            iterations=self.iterations,
+            lanes=self.lanes,
+            memory_cost=self.memory_cost,
+        )
+        return kdf.derive(password)
+
+    def to_params(self) -> dict:
+        return {
+            "algorithm": self.NAME,
+            "iterations": self.iterations,
+            "memory_cost": self.memory_cost,
+            "lanes": self.lanes,
+        }
+
+    @classmethod
+    def calibrate(cls, salt: bytes, target_seconds: float) -> "Argon2idKdf":
+        elapsed = _measure(cls(1), salt)
+        iterations = min(cls.MAX_ITERATIONS, int(target_seconds / elapsed))
+        return cls(max(cls.MIN_ITERATIONS, iterations))
+
+
+_KDF_CLASSES = {kdf.NAME: kdf for kdf in (Pbkdf2Kdf, ScryptKdf, Argon2idKdf)}
+
+DEFAULT_PARAMS = Pbkdf2Kdf().to_params()
+
+
+def _measure(kdf, salt: bytes) -> float:
+    start = perf_counter()
+    kdf.derive(b"keypass-calibration", salt)
+    return max(perf_counter() - start, 1e-6)
+
+
+def available_algorithms() -> list[str]:
+    return [name for name in _KDF_CLASSES if name != Argon2idKdf.NAME or Argon2id is not None]
+
+
+def kdf_from_params(params: dict):
+    options = dict(params)
+    name = options.pop("algorithm", Pbkdf2Kdf.NAME)
+    try:
+        kdf_class = _KDF_CLASSES[name]
+    except KeyError:
+        raise ValueError(f"Algorithme de dérivation inconnu : '{name}'.")
+    return kdf_class(**options)
+
+
+def calibrate(
+    salt: bytes,
+    target_seconds: float = DEFAULT_TARGET_SECONDS,
+    algorithm: str | None = None,
+) -> dict:
+    if algorithm is None:
+        algorithm = available_algorithms()[-1]
+    if algorithm not in available_algorithms():
+        raise ValueError(f"Algorithme de dérivation indisponible : '{algorithm}'.")
+    return _KDF_CLASSES[algorithm].calibrate(salt, target_seconds).to_params()
@@ -0,0 +1,188 @@
+import atexit
+import json
+import os
+from bisect import bisect_left
+from functools import wraps
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import Callable
+
+# Bornes supérieures des seaux de latence, en secondes (1 µs → 10 s).
+LATENCY_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6,
+    1e-5, 2.5e-5, 5e-5,
+    1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3,
+    1e-2, 2.5e-2, 5e-2,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+
+class OperationStats:
+    __slots__ = ("calls", "errors", "rows", "bytes", "total_seconds", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.total_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def quantile(self, fraction: float) -> float:
+        if not self.calls:
+            return 0.0
+        rank = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "total_seconds": self.total_seconds,
+            "p50_seconds": self.quantile(0.50),
+            "p99_seconds": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], self.buckets)),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.enabled = False
+        self._stats: dict[str, OperationStats] = {}
+        self._lock = Lock()
+
+    def record(self, name: str, seconds: float, rows: int = 0, nbytes: int = 0, error: bool = False) -> None:
+        bucket = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = OperationStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.rows += rows
+            stats.bytes += nbytes
+            stats.total_seconds += seconds
+            stats.buckets[bucket] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        for metric, field in (
+            ("keypass_calls_total", "calls"),
+            ("keypass_errors_total", "errors"),
+            ("keypass_rows_total", "rows"),
+            ("keypass_bytes_total", "bytes"),
+        ):
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f'{metric}{{op="{name}"}} {stats[field]}' for name, stats in snapshot.items())
+
+        lines.append("# TYPE keypass_latency_seconds histogram")
+        for name, stats in snapshot.items():
+            cumulative = 0
+            for bound, count in stats["buckets"].items():
+                cumulative += count
+                lines.append(f'keypass_latency_seconds_bucket{{op="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'keypass_latency_seconds_sum{{op="{name}"}} {stats["total_seconds"]}')
+            lines.append(f'keypass_latency_seconds_count{{op="{name}"}} {stats["calls"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: Path) -> None:
+        path = Path(path)
+        content = self.to_json() if path.suffix == ".json" else self.to_prometheus()
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_text(content, encoding="utf-8")
+        os.replace(temp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def enable(dump_path: Path | None = None) -> None:
+    REGISTRY.enabled = True
+    if dump_path is not None:
+        atexit.register(REGISTRY.dump, dump_path)
+
+
+def enable_from_config() -> None:
+    from src.core.config import get_config
+
+    config = get_config()
+    if config.metrics_enabled or config.metrics_dump is not None:
+        enable(config.metrics_dump)
+
+
+def disable() -> None:
+    REGISTRY.enabled = False
+
+
+def is_enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def snapshot() -> dict[str, dict]:
+    return REGISTRY.snapshot()
+
+
+def result_length(result, *args, **kwargs) -> int:
+    return len(result)
+
+
+def single_row(result, *args, **kwargs) -> int:
+    return 1
+
+
+def instrumented(
+    name: str,
+    rows: Callable[..., int] | None = None,
+    nbytes: Callable[..., int] | None = None,
+):
+    """Mesure la fonction décorée lorsque les métriques sont activées.
+
+    `rows` et `nbytes` reçoivent le résultat puis les arguments de l'appel ; ils ne
+    sont évalués que si l'instrumentation est active.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                REGISTRY.record(name, perf_counter() - start, error=True)
+                raise
+            elapsed = perf_counter() - start
+            REGISTRY.record(
+                name,
+                elapsed,
+                rows(result, *args, **kwargs) if rows is not None else 0,
+                nbytes(result, *args, **kwargs) if nbytes is not None else 0,
+            )
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,380 @@
+import sqlite3
+from typing import Callable
+
+TABLE_NAME = "passwords"
+SEARCH_TABLE_NAME = "passwords_search"
+AUDIT_CACHE_TABLE_NAME = "audit_cache"
+KEY_TABLE_NAME = "vault_keys"
+APPLICATIONS_TABLE_NAME = "applications"
+PREFIX_TABLE_NAME = "passwords_prefixes"
+VAULT_INFO_TABLE_NAME = "vault_info"
+SYNC_TREE_TABLE_NAME = "sync_tree"
+SYNC_PEERS_TABLE_NAME = "sync_peers"
+SYNC_BASE_TABLE_NAME = "sync_base"
+
+# Arbre de Merkle des empreintes de lignes : SYNC_TREE_LEVELS niveaux de 2^4 enfants,
+# soit 65 536 feuilles adressées par les 16 bits de poids fort de `row_hash`.
+SYNC_TREE_LEVELS = 5
+SYNC_FANOUT_BITS = 4
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def _create_passwords_table(conn: sqlite3.Connection) -> None:
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            application TEXT NOT NULL,
+            userid TEXT NOT NULL,
+            password TEXT NOT NULL
+        )
+    """)
+
+
+def _add_application_userid_index(conn: sqlite3.Connection) -> None:
+    # Les doublons hérités des anciennes versions sont renommés plutôt que supprimés.
+    conn.execute(f"""
+        UPDATE {TABLE_NAME}
+        SET userid = userid || ' (' || id || ')'
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM {TABLE_NAME} GROUP BY application, userid
+        )
+    """)
+    conn.execute(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_{TABLE_NAME}_application_userid
+        ON {TABLE_NAME} (application, userid)
+    """)
+
+
+def _add_search_index(conn: sqlite3.Connection) -> None:
+    try:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE_NAME} USING fts5(
+                application, userid,
+                content='{TABLE_NAME}', content_rowid='id', tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError:
+        # SQLite compilé sans FTS5 : la recherche se rabat sur LIKE.
+        return
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_search_insert AFTER INSERT ON {TABLE_NAME} BEGIN
+            INSERT INTO {SEARCH_TABLE_NAME} (rowid, application, userid)
+            VALUES (new.id, new.application, new.userid);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_search_delete AFTER DELETE ON {TABLE_NAME} BEGIN
+            INSERT INTO {SEARCH_TABLE_NAME} ({SEARCH_TABLE_NAME}, rowid, application, userid)
+            VALUES ('delete', old.id, old.application, old.userid);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_search_update
+        AFTER UPDATE OF application, userid ON {TABLE_NAME} BEGIN
+            INSERT INTO {SEARCH_TABLE_NAME} ({SEARCH_TABLE_NAME}, rowid, application, userid)
+            VALUES ('delete', old.id, old.application, old.userid);
+            INSERT INTO {SEARCH_TABLE_NAME} (rowid, application, userid)
+            VALUES (new.id, new.application, new.userid);
+        END
+    """)
+    conn.execute(f"INSERT INTO {SEARCH_TABLE_NAME} ({SEARCH_TABLE_NAME}) VALUES ('rebuild')")
+
+
+def _add_audit_cache(conn: sqlite3.Connection) -> None:
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {AUDIT_CACHE_TABLE_NAME} (
+            token_digest BLOB PRIMARY KEY,
+            estimator_version INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            fingerprint BLOB NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+
+def _add_key_envelope(conn: sqlite3.Connection) -> None:
+    # Clé de données emballée par la clé maître ; les entrées existantes restent en
+    # version 0 (clé maître) jusqu'au rechiffrement effectué à l'ouverture.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {KEY_TABLE_NAME} (
+            slot TEXT PRIMARY KEY,
+            wrapped BLOB NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN key_version INTEGER NOT NULL DEFAULT 0")
+
+
+def _add_application_index(conn: sqlite3.Connection) -> None:
+    # Liste des applications avec leur nombre d'entrées, tenue à jour par triggers :
+    # la liste principale ne parcourt plus toute la table.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {APPLICATIONS_TABLE_NAME} (
+            name TEXT PRIMARY KEY,
+            entry_count INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_applications_insert
+        AFTER INSERT ON {TABLE_NAME} BEGIN
+            INSERT INTO {APPLICATIONS_TABLE_NAME} (name, entry_count) VALUES (new.application, 1)
+            ON CONFLICT (name) DO UPDATE SET entry_count = entry_count + 1;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_applications_delete
+        AFTER DELETE ON {TABLE_NAME} BEGIN
+            UPDATE {APPLICATIONS_TABLE_NAME} SET entry_count = entry_count - 1
+            WHERE name = old.application;
+            DELETE FROM {APPLICATIONS_TABLE_NAME} WHERE name = old.application AND entry_count <= 0;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_applications_update
+        AFTER UPDATE OF application ON {TABLE_NAME}
+        WHEN new.application IS NOT old.application BEGIN
+            UPDATE {APPLICATIONS_TABLE_NAME} SET entry_count = entry_count - 1
+            WHERE name = old.application;
+            DELETE FROM {APPLICATIONS_TABLE_NAME} WHERE name = old.application AND entry_count <= 0;
+            INSERT INTO {APPLICATIONS_TABLE_NAME} (name, entry_count) VALUES (new.application, 1)
+            ON CONFLICT (name) DO UPDATE SET entry_count = entry_count + 1;
+        END
+    """)
+    conn.execute(f"""
+        INSERT INTO {APPLICATIONS_TABLE_NAME} (name, entry_count)
+        SELECT application, COUNT(*) FROM {TABLE_NAME} GROUP BY application
+    """)
+
+
+def _add_blind_indexes(conn: sqlite3.Connection) -> None:
+    # `application` et `userid` seront chiffrés : les structures qui les exposent en
+    # clair (index FTS, liste des applications, index unique) sont remplacées par des
+    # équivalents fondés sur des empreintes HMAC. Le chiffrement des entrées existantes
+    # a lieu à l'ouverture, la clé n'étant pas connue ici.
+    for trigger in ("search_insert", "search_delete", "search_update",
+                    "applications_insert", "applications_delete", "applications_update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {TABLE_NAME}_{trigger}")
+    conn.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE_NAME}")
+    conn.execute(f"DROP TABLE IF EXISTS {APPLICATIONS_TABLE_NAME}")
+    conn.execute(f"DROP INDEX IF EXISTS idx_{TABLE_NAME}_application_userid")
+
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN application_index BLOB")
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN userid_index BLOB")
+    conn.execute(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_{TABLE_NAME}_blind_index
+        ON {TABLE_NAME} (application_index, userid_index)
+    """)
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PREFIX_TABLE_NAME} (
+            token BLOB NOT NULL,
+            entry_id INTEGER NOT NULL,
+            PRIMARY KEY (token, entry_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{PREFIX_TABLE_NAME}_entry_id
+        ON {PREFIX_TABLE_NAME} (entry_id)
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_prefixes_delete
+        AFTER DELETE ON {TABLE_NAME} BEGIN
+            DELETE FROM {PREFIX_TABLE_NAME} WHERE entry_id = old.id;
+        END
+    """)
+
+    # Une ligne par application : son empreinte, son nom chiffré et son nombre d'entrées.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {APPLICATIONS_TABLE_NAME} (
+            name_index BLOB PRIMARY KEY,
+            name TEXT NOT NULL,
+            entry_count INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    increment = f"""
+            INSERT INTO {APPLICATIONS_TABLE_NAME} (name_index, name, entry_count)
+            VALUES (new.application_index, new.application, 1)
+            ON CONFLICT (name_index) DO UPDATE SET entry_count = entry_count + 1;"""
+    decrement = f"""
+            UPDATE {APPLICATIONS_TABLE_NAME} SET entry_count = entry_count - 1
+            WHERE name_index = old.application_index;
+            DELETE FROM {APPLICATIONS_TABLE_NAME}
+            WHERE name_index = old.application_index AND entry_count <= 0;"""
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_applications_insert
+        AFTER INSERT ON {TABLE_NAME} WHEN new.application_index IS NOT NULL BEGIN{increment}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_applications_delete
+        AFTER DELETE ON {TABLE_NAME} WHEN old.application_index IS NOT NULL BEGIN{decrement}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_applications_update
+        AFTER UPDATE OF application_index ON {TABLE_NAME}
+        WHEN new.application_index IS NOT old.application_index BEGIN{decrement}{increment}
+        END
+    """)
+
+
+def _add_legacy_rows_index(conn: sqlite3.Connection) -> None:
+    # Entrées à réécrire au format binaire (key_version < 2) : l'index partiel, vide
+    # une fois la migration faite, évite de parcourir la table à chaque ouverture.
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_legacy
+        ON {TABLE_NAME} (id) WHERE key_version < 2
+    """)
+
+
+def _sync_tree_updates(row: str) -> str:
+    # Chaque nœud vaut le XOR des empreintes des lignes de son sous-arbre : l'ajout et
+    # le retrait d'une ligne sont la même opération. SQLite n'a pas de XOR :
+    # a ^ b = (a | b) - (a & b), sans dépassement sur 64 bits.
+    leaf = f"(({row}.row_hash >> 48) + 32768)"
+    statements = []
+    for level in range(SYNC_TREE_LEVELS):
+        shift = SYNC_FANOUT_BITS * (SYNC_TREE_LEVELS - 1 - level)
+        statements.append(f"""
+            INSERT INTO {SYNC_TREE_TABLE_NAME} (level, position, hash)
+            SELECT {level}, {leaf} >> {shift}, {row}.row_hash WHERE {row}.row_hash IS NOT NULL
+            ON CONFLICT (level, position) DO UPDATE
+            SET hash = (hash | excluded.hash) - (hash & excluded.hash);""")
+    return "".join(statements)
+
+
+def _add_sync_state(conn: sqlite3.Connection) -> None:
+    # Révision et empreinte de contenu par ligne, arbre de Merkle tenu par triggers,
+    # et, par coffre pair, l'état commun laissé par la dernière synchronisation.
+    # Les empreintes des lignes existantes sont calculées à l'ouverture.
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN revision INTEGER NOT NULL DEFAULT 1")
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN row_hash INTEGER")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_row_hash ON {TABLE_NAME} (row_hash)")
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SYNC_TREE_TABLE_NAME} (
+            level INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            hash INTEGER NOT NULL,
+            PRIMARY KEY (level, position)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_sync_tree_insert
+        AFTER INSERT ON {TABLE_NAME} BEGIN{_sync_tree_updates("new")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_sync_tree_delete
+        AFTER DELETE ON {TABLE_NAME} BEGIN{_sync_tree_updates("old")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {TABLE_NAME}_sync_tree_update
+        AFTER UPDATE OF row_hash ON {TABLE_NAME}
+        WHEN new.row_hash IS NOT old.row_hash BEGIN{_sync_tree_updates("old")}{_sync_tree_updates("new")}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {VAULT_INFO_TABLE_NAME} (
+            name TEXT PRIMARY KEY,
+            value BLOB NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        f"INSERT OR IGNORE INTO {VAULT_INFO_TABLE_NAME} (name, value) "
+        "VALUES ('vault_id', randomblob(16))"
+    )
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SYNC_PEERS_TABLE_NAME} (
+            peer_id BLOB PRIMARY KEY,
+            token BLOB NOT NULL,
+            synced_at TEXT NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SYNC_BASE_TABLE_NAME} (
+            peer_id BLOB NOT NULL,
+            entry_key BLOB NOT NULL,
+            row_hash INTEGER NOT NULL,
+            PRIMARY KEY (peer_id, entry_key)
+        ) WITHOUT ROWID
+    """)
+
+
+def _add_timestamps(conn: sqlite3.Connection) -> None:
+    # Dates de création et de dernier changement de mot de passe (secondes Unix).
+    # L'âge des entrées existantes est inconnu : elles datent de la migration.
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN created_at INTEGER NOT NULL DEFAULT 0")
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN updated_at INTEGER NOT NULL DEFAULT 0")
+    now = "CAST(strftime('%s', 'now') AS INTEGER)"
+    conn.execute(f"UPDATE {TABLE_NAME} SET created_at = {now}, updated_at = {now}")
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_updated_at ON {TABLE_NAME} (updated_at)
+    """)
+
+
+def _seal_audit_cache(conn: sqlite3.Connection) -> None:
+    # Le score et l'empreinte de réutilisation étaient stockés en clair : joints aux
+    # lignes par l'empreinte du chiffré, ils révélaient les mots de passe faibles ou
+    # partagés. Le cache est recréé avec ces valeurs scellées par la clé du coffre.
+    conn.execute(f"DROP TABLE IF EXISTS {AUDIT_CACHE_TABLE_NAME}")
+    conn.execute(f"""
+        CREATE TABLE {AUDIT_CACHE_TABLE_NAME} (
+            token_digest BLOB PRIMARY KEY,
+            estimator_version INTEGER NOT NULL,
+            sealed BLOB NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+
+MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _create_passwords_table,
+    _add_application_userid_index,
+    _add_search_index,
+    _add_audit_cache,
+    _add_key_envelope,
+    _add_application_index,
+    _add_blind_indexes,
+    _add_legacy_rows_index,
+    _add_sync_state,
+    _add_timestamps,
+    _seal_audit_cache,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def configure(conn: sqlite3.Connection) -> None:
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    version = get_schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"La base de données (version {version}) est plus récente que l'application "
+            f"(version {SCHEMA_VERSION})."
+        )
+
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            MIGRATIONS[target - 1](conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return SCHEMA_VERSION
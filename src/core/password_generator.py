@@ -1,17 +1,76 @@
-from secrets import choice
+import re
+from functools import lru_cache
+from secrets import token_bytes
 from string import ascii_lowercase, ascii_uppercase, digits, punctuation
-from dotenv import load_dotenv
-from os import getenv
+from typing import Callable, Sequence
 
-load_dotenv()
+from src.core.config import get_config
+from src.core.wordlist import WORDS
 
-try:
-    PASSWORD_MIN_SIZE = int(getenv("PASSWORD_MIN_SIZE", "12"))
-    PASSWORD_MAX_SIZE = int(getenv("PASSWORD_MAX_SIZE", "50"))
-except (TypeError, ValueError) as e:
-    raise RuntimeError(
-        f"Erreur lors du chargement des contraintes de taille de mot de passe : {e}"
-    )
+PASSPHRASE_MIN_WORDS = 4
+PASSPHRASE_MAX_WORDS = 12
+
+_CHARACTER_CLASSES = (ascii_lowercase, ascii_uppercase, digits, punctuation)
+
+
+@lru_cache(maxsize=16)
+def _sampling_tables(classes: tuple[bool, ...]) -> tuple[bytes, bytes, Callable[[str], bool], float]:
+    pool = "".join(chars for chars, enabled in zip(_CHARACTER_CLASSES, classes) if enabled)
+    limit = 256 - 256 % len(pool)
+    table = bytes(ord(pool[byte % len(pool)]) if byte < limit else 0 for byte in range(256))
+    rejected = bytes(range(limit, 256))
+    disjoint_checks = [
+        frozenset(chars).isdisjoint
+        for chars, enabled in zip(_CHARACTER_CLASSES, classes)
+        if enabled
+    ]
+
+    def is_compliant(candidate: str) -> bool:
+        for is_disjoint in disjoint_checks:
+            if is_disjoint(candidate):
+                return False
+        return True
+
+    return table, rejected, is_compliant, limit / 256
+
+
+def _check_length(length: int) -> None:
+    config = get_config()
+    if length < config.password_min_size:
+        raise ValueError(f"La longueur doit être d'au moins {config.password_min_size}.")
+    if length > config.password_max_size:
+        raise ValueError(f"La longueur ne doit pas dépasser {config.password_max_size}.")
+
+
+def generate_passwords(
+    count: int,
+    length: int = 12,
+    include_lowercase: bool = True,
+    include_uppercase: bool = True,
+    include_digits: bool = True,
+    include_symbols: bool = True,
+) -> list[str]:
+    _check_length(length)
+    classes = (include_lowercase, include_uppercase, include_digits, include_symbols)
+    if not any(classes):
+        raise ValueError("Au moins un type de caractère doit être sélectionné.")
+    if length < sum(classes):
+        # Un caractère de chaque type au minimum : sinon aucun candidat n'est conforme.
+        raise ValueError(
+            f"La longueur doit être d'au moins {sum(classes)} (un caractère de chaque type)."
+        )
+
+    table, rejected, is_compliant, acceptance = _sampling_tables(classes)
+    candidate_pattern = re.compile(f".{{{length}}}", re.DOTALL)
+    passwords: list[str] = []
+    while len(passwords) < count:
+        # Rejet des octets hors du plus grand multiple de la taille du pool, puis des
+        # mots de passe incomplets : la distribution reste uniforme sur les conformes.
+        wanted = (count - len(passwords)) * length
+        raw = token_bytes(int(wanted / acceptance * 1.25) + length)
+        candidates = candidate_pattern.findall(raw.translate(table, rejected).decode())
+        passwords.extend(filter(is_compliant, candidates))
+    return passwords[:count]
 
 
 def generate_password(
@@ -20,33 +79,51 @@ def generate_password(
     include_digits: bool = True,
     include_symbols: bool = True,
 ) -> str:
-    if length < PASSWORD_MIN_SIZE:
-        raise ValueError(f"La longueur doit être d'au moins {PASSWORD_MIN_SIZE}.")
-    if length > PASSWORD_MAX_SIZE:
-        raise ValueError(f"La longueur ne doit pas dépasser {PASSWORD_MAX_SIZE}.")
-
-    pool = ""
-    required_chars: list[str] = []
-
-    if include_letters:
-        pool += ascii_lowercase + ascii_uppercase
-        required_chars.append(choice(ascii_uppercase))
-        required_chars.append(choice(ascii_lowercase))
-    if include_digits:
-        pool += digits
-        required_chars.append(choice(digits))
-    if include_symbols:
-        pool += punctuation
-        required_chars.append(choice(punctuation))
-
-    if not pool:
-        raise ValueError("Au moins un type de caractère doit être sélectionné.")
+    return generate_passwords(
+        1,
+        length,
+        include_lowercase=include_letters,
+        include_uppercase=include_letters,
+        include_digits=include_digits,
+        include_symbols=include_symbols,
+    )[0]
+
 
-    remaining_length = length - len(required_chars)
-    password_chars = required_chars + [choice(pool) for _ in range(remaining_length)]
-    from secrets import randbelow
-    for i in range(len(password_chars) - 1, 0, -1):
-        j = randbelow(i + 1)
-        password_chars[i], password_chars[j] = password_chars[j], password_chars[i]
+def _random_indices(count: int, upper: int) -> list[int]:
+    limit = 2 ** 32 - 2 ** 32 % upper
+    indices: list[int] = []
+    while len(indices) < count:
+        needed = count - len(indices)
+        values = memoryview(token_bytes(4 * (needed + needed // 4 + 1))).cast("I")
+        indices.extend(value % upper for value in values if value < limit)
+    return indices[:count]
 
-    return "".join(password_chars)
\ No newline at end of file
+
+def generate_passphrases(
+    count: int,
+    words: int = 6,
+    separator: str = "-",
+    wordlist: Sequence[str] = WORDS,
+    capitalize: bool = False,
+) -> list[str]:
+    if words < PASSPHRASE_MIN_WORDS:
+        raise ValueError(f"Une phrase de passe doit contenir au moins {PASSPHRASE_MIN_WORDS} mots.")
+    if words > PASSPHRASE_MAX_WORDS:
+        raise ValueError(f"Une phrase de passe ne doit pas dépasser {PASSPHRASE_MAX_WORDS} mots.")
+    if len(wordlist) < 2:
+        raise ValueError("La liste de mots doit contenir au moins deux mots.")
+
+    indices = _random_indices(count * words, len(wordlist))
+    chosen = [wordlist[index] for index in indices]
+    if capitalize:
+        chosen = [word.capitalize() for word in chosen]
+    return [separator.join(chosen[i:i + words]) for i in range(0, len(chosen), words)]
+
+
+def generate_passphrase(
+    words: int = 6,
+    separator: str = "-",
+    wordlist: Sequence[str] = WORDS,
+    capitalize: bool = False,
+) -> str:
+    return generate_passphrases(1, words, separator, wordlist, capitalize)[0]
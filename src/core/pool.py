@@ -0,0 +1,108 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from src.core.migrations import configure
+
+DEFAULT_MAX_READERS = 8
+
+
+class ConnectionPool:
+    """Connexions SQLite partagées entre threads.
+
+    Une seule connexion écrit, sous verrou ; les lectures empruntent une connexion
+    d'un pool borné et, en WAL, ne bloquent jamais l'écrivain.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_readers: int = DEFAULT_MAX_READERS,
+        setup: Callable[[sqlite3.Connection], None] = configure,
+    ):
+        self._db_path = str(db_path)
+        self._setup = setup
+        self._max_readers = max_readers
+        self._idle_readers: list[sqlite3.Connection] = []
+        self._all_readers: list[sqlite3.Connection] = []
+        self._readers_available = threading.Condition(threading.Lock())
+        self._write_lock = threading.RLock()
+        self._writer = self._open()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        self._setup(conn)
+        return conn
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        with self._readers_available:
+            while not self._idle_readers:
+                if len(self._all_readers) < self._max_readers:
+                    conn = self._open()
+                    conn.execute("PRAGMA query_only = ON")
+                    self._all_readers.append(conn)
+                    return conn
+                self._readers_available.wait()
+            return self._idle_readers.pop()
+
+    def _release_reader(self, conn: sqlite3.Connection) -> None:
+        with self._readers_available:
+            self._idle_readers.append(conn)
+            self._readers_available.notify()
+
+    @contextmanager
+    def read(self, snapshot: bool = False) -> Iterator[sqlite3.Connection]:
+        """Connexion de lecture ; avec `snapshot`, toutes les requêtes du bloc voient
+        le même état de la base."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        conn = self._acquire_reader()
+        try:
+            if not snapshot:
+                yield conn
+                return
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+        finally:
+            self._release_reader(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Accès exclusif à la connexion d'écriture, sans transaction implicite."""
+        with self._write_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            yield self._writer
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.writer() as conn:
+            if conn.in_transaction:
+                # Transaction imbriquée : elle appartient à l'appelant englobant.
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self) -> None:
+        with self._write_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._writer.close()
+        with self._readers_available:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+            self._idle_readers.clear()
@@ -0,0 +1,189 @@
+import heapq
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+from src.core.migrations import TABLE_NAME
+from src.core.password_generator import generate_passwords
+from src.core.storage import Database
+
+DAY = 86_400
+DEFAULT_LOOKAHEAD = 7 * DAY
+_ID_BATCH_SIZE = 500
+
+
+class RotationCandidate:
+    """Entrée dont le mot de passe n'a pas changé depuis plus que l'âge maximal."""
+
+    __slots__ = ("id", "application", "userid", "updated_at")
+
+    def __init__(self, entry_id: int, application: str, userid: str, updated_at: int):
+        self.id = entry_id
+        self.application = application
+        self.userid = userid
+        self.updated_at = updated_at
+
+    def age_days(self, now: int | None = None) -> int:
+        return ((int(time.time()) if now is None else now) - self.updated_at) // DAY
+
+    def __repr__(self) -> str:
+        return (
+            f"RotationCandidate(id={self.id}, application={self.application!r}, "
+            f"userid={self.userid!r}, updated_at={self.updated_at})"
+        )
+
+
+class RotationUpdate:
+    """Ce qui a changé depuis la vérification précédente."""
+
+    __slots__ = ("due", "cleared", "overdue", "next_check")
+
+    def __init__(self, due: list[int], cleared: list[int], overdue: int, next_check: int):
+        self.due = due
+        self.cleared = cleared
+        self.overdue = overdue
+        self.next_check = next_check
+
+
+class RotationScheduler:
+    """Échéances de rotation des mots de passe, les plus proches en tête d'un tas.
+
+    Une entrée arrive à échéance `max_age` secondes après son dernier changement de
+    mot de passe. Le tas ne contient que les échéances d'une fenêtre glissante de
+    `lookahead` secondes, chargées tranche par tranche par une requête d'intervalle
+    sur l'index `updated_at` : la table n'est jamais parcourue en entier. Une entrée
+    modifiée entre-temps est revalidée quand son ancienne échéance sort du tas.
+
+    `check()` ne renvoie que les différences depuis l'appel précédent ; les appels
+    concurrents sont sérialisés.
+    """
+
+    def __init__(self, db: Database, max_age: int, lookahead: int = DEFAULT_LOOKAHEAD):
+        if max_age <= 0:
+            raise ValueError("L'âge maximal d'un mot de passe doit être positif.")
+        self._db = db
+        self.max_age = max_age
+        self.lookahead = min(lookahead, max_age)
+        self._heap: list[tuple[int, int]] = []
+        self._horizon: int | None = None
+        self._overdue: set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def overdue(self) -> frozenset[int]:
+        with self._lock:
+            return frozenset(self._overdue)
+
+    def reset(self) -> None:
+        """Recharge les échéances à la prochaine vérification : à appeler quand des
+        dates ont pu reculer (synchronisation avec une autre copie)."""
+        with self._lock:
+            self._heap.clear()
+            self._horizon = None
+
+    def _load(self, conn: sqlite3.Connection, horizon: int) -> None:
+        # Tranche [ancien horizon, nouvel horizon) des échéances, soit un intervalle
+        # de updated_at : parcours de l'index, sans lecture des autres lignes.
+        if self._horizon is not None and horizon <= self._horizon:
+            return
+        if self._horizon is None:
+            rows = conn.execute(
+                f"SELECT updated_at + ?, id FROM {TABLE_NAME} WHERE updated_at < ?",
+                (self.max_age, horizon - self.max_age),
+            )
+        else:
+            rows = conn.execute(
+                f"SELECT updated_at + ?, id FROM {TABLE_NAME} "
+                "WHERE updated_at >= ? AND updated_at < ?",
+                (self.max_age, self._horizon - self.max_age, horizon - self.max_age),
+            )
+        self._heap.extend(rows)
+        heapq.heapify(self._heap)
+        self._horizon = horizon
+
+    def check(self, now: int | None = None) -> RotationUpdate:
+        now = int(time.time()) if now is None else now
+        with self._lock:
+            try:
+                with self._db.read() as conn:
+                    self._load(conn, now + self.lookahead)
+                    candidates: set[int] = set()
+                    while self._heap and self._heap[0][0] <= now:
+                        candidates.add(heapq.heappop(self._heap)[1])
+                    current = _updated_at(conn, candidates | self._overdue)
+            except sqlite3.Error as e:
+                raise RuntimeError(f"Erreur lors de la lecture des dates de modification : {e}")
+
+            due = []
+            for entry_id in sorted(candidates):
+                updated_at = current.get(entry_id)
+                if updated_at is None:
+                    continue
+                if updated_at + self.max_age <= now:
+                    if entry_id not in self._overdue:
+                        due.append(entry_id)
+                elif updated_at + self.max_age < self._horizon:
+                    # Modifiée depuis le chargement : nouvelle échéance dans la fenêtre.
+                    heapq.heappush(self._heap, (updated_at + self.max_age, entry_id))
+            cleared = sorted(
+                entry_id for entry_id in self._overdue
+                if entry_id not in current or current[entry_id] + self.max_age > now
+            )
+            self._overdue.difference_update(cleared)
+            self._overdue.update(due)
+            next_check = min(self._heap[0][0], self._horizon) if self._heap else self._horizon
+            return RotationUpdate(due, cleared, len(self._overdue), next_check)
+
+
+def _updated_at(conn: sqlite3.Connection, ids: Iterable[int]) -> dict[int, int]:
+    ids = list(ids)
+    current: dict[int, int] = {}
+    for start in range(0, len(ids), _ID_BATCH_SIZE):
+        batch = ids[start:start + _ID_BATCH_SIZE]
+        current.update(conn.execute(
+            f"SELECT id, updated_at FROM {TABLE_NAME} "
+            f"WHERE id IN ({', '.join('?' * len(batch))})",
+            batch,
+        ))
+    return current
+
+
+def get_candidates(db: Database, ids: Iterable[int]) -> list[RotationCandidate]:
+    """Noms et date de modification des entrées `ids`, les plus anciennes d'abord."""
+    ids = list(ids)
+    rows = []
+    try:
+        with db.read() as conn:
+            for start in range(0, len(ids), _ID_BATCH_SIZE):
+                batch = ids[start:start + _ID_BATCH_SIZE]
+                rows.extend(conn.execute(
+                    f"SELECT id, application, userid, application_index, userid_index, "
+                    f"updated_at FROM {TABLE_NAME} WHERE id IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ))
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Erreur lors de la lecture des entrées : {e}")
+
+    try:
+        names = db.cipher.decrypt_many(
+            [name for row in rows for name in (row[1], row[2])],
+            [index for row in rows for index in (row[3], row[4])],
+        )
+    except Exception as e:
+        raise RuntimeError(f"Erreur de déchiffrement : {e}")
+    candidates = [
+        RotationCandidate(row[0], names[2 * position], names[2 * position + 1], row[5])
+        for position, row in enumerate(rows)
+    ]
+    candidates.sort(key=lambda candidate: (candidate.updated_at, candidate.application))
+    return candidates
+
+
+def propose_replacements(
+    candidates: list[RotationCandidate], length: int, **options
+) -> list[tuple[int, str]]:
+    """Un mot de passe généré par entrée, tirés en un seul lot ; le résultat se
+    passe tel quel à `Database.update_many`."""
+    passwords = generate_passwords(len(candidates), length, **options)
+    return [(candidate.id, password) for candidate, password in zip(candidates, passwords)]
@@ -0,0 +1,87 @@
+import sqlite3
+
+from src.core.blind_index import PREFIX_MAX_LENGTH, BlindIndex, NameCache
+from src.core.crypto import VaultCipher
+from src.core.migrations import APPLICATIONS_TABLE_NAME, PREFIX_TABLE_NAME, TABLE_NAME
+
+DEFAULT_LIMIT = 500
+
+
+def _search_short(
+    conn: sqlite3.Connection, names: NameCache, tokens: dict[str, bytes]
+) -> list[tuple[bool, str]]:
+    rows = conn.execute(
+        f"""
+        SELECT a.name_index, a.name, MAX(t.token = :application)
+        FROM {PREFIX_TABLE_NAME} t
+        JOIN {TABLE_NAME} p ON p.id = t.entry_id
+        JOIN {APPLICATIONS_TABLE_NAME} a ON a.name_index = p.application_index
+        WHERE t.token IN (:application, :userid)
+        GROUP BY p.application_index
+        """,
+        tokens,
+    ).fetchall()
+    applications = names.resolve((name_index, name) for name_index, name, _ in rows)
+    return [
+        (not application_match, application)
+        for application, (_, _, application_match) in zip(applications, rows)
+    ]
+
+
+def _search_long(
+    conn: sqlite3.Connection,
+    names: NameCache,
+    cipher: VaultCipher,
+    tokens: dict[str, bytes],
+    needle: str,
+) -> list[tuple[bool, str]]:
+    # Les jetons s'arrêtent à PREFIX_MAX_LENGTH caractères : ils restreignent les
+    # candidats, dont les noms sont ensuite déchiffrés et comparés en entier.
+    rows = conn.execute(
+        f"""
+        SELECT p.application_index, p.application, p.userid_index, p.userid
+        FROM {PREFIX_TABLE_NAME} t
+        JOIN {TABLE_NAME} p ON p.id = t.entry_id
+        WHERE t.token IN (:application, :userid)
+        GROUP BY p.id
+        """,
+        tokens,
+    ).fetchall()
+    applications = names.resolve((name_index, name) for name_index, name, _, _ in rows)
+    userids = cipher.decrypt_many(
+        [userid for _, _, _, userid in rows], [userid_index for _, _, userid_index, _ in rows]
+    )
+    matches: dict[str, bool] = {}
+    for application, userid in zip(applications, userids):
+        if application.casefold().startswith(needle):
+            matches[application] = False
+        elif userid.casefold().startswith(needle):
+            matches.setdefault(application, True)
+    return [(user_only, application) for application, user_only in matches.items()]
+
+
+def search_applications(
+    conn: sqlite3.Connection,
+    index: BlindIndex,
+    names: NameCache,
+    cipher: VaultCipher,
+    query: str,
+    limit: int = DEFAULT_LIMIT,
+) -> list[str]:
+    """Applications dont le nom ou un identifiant commence par `query`, sans tenir
+    compte de la casse. Les correspondances sur le nom de l'application viennent en
+    premier, puis l'ordre alphabétique."""
+    needle = query.strip().casefold()
+    if not needle:
+        rows = conn.execute(f"SELECT name_index, name FROM {APPLICATIONS_TABLE_NAME}").fetchall()
+        return sorted(names.resolve(rows))[:limit]
+
+    tokens = {
+        "application": index.application_prefix(needle),
+        "userid": index.userid_prefix(needle),
+    }
+    if len(needle) <= PREFIX_MAX_LENGTH:
+        matches = _search_short(conn, names, tokens)
+    else:
+        matches = _search_long(conn, names, cipher, tokens, needle)
+    return [application for _, application in sorted(matches)][:limit]
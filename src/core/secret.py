@@ -0,0 +1,79 @@
+import hmac
+from typing import Iterable
+
+
+class SecretBuffer:
+    """Secret en clair dans un tampon modifiable, effaçable sur demande.
+
+    Une `str` ne peut être ni effacée ni libérée à coup sûr : chaque couche qui la
+    manipule en laisse une copie. Le tampon, lui, est rempli directement par le
+    déchiffrement, prêté sans copie par `view()` (hachage, chiffrement, comparaison)
+    et mis à zéro par `wipe()`, à la sortie d'un bloc `with` ou à sa destruction.
+    Seul `reveal()` en fait une chaîne, pour un widget ou une sortie qui l'exige.
+    """
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, data: int | bytes | bytearray | memoryview = 0):
+        # Un bytearray est adopté sans copie (il sera effacé avec le secret) ; tout
+        # autre contenu est copié dans un tampon neuf.
+        self._buffer: bytearray | None = data if type(data) is bytearray else bytearray(data)
+
+    @classmethod
+    def from_text(cls, text: str) -> "SecretBuffer":
+        return cls(text.encode())
+
+    @property
+    def wiped(self) -> bool:
+        return self._buffer is None
+
+    def view(self) -> memoryview:
+        if self._buffer is None:
+            raise ValueError("Ce secret a déjà été effacé.")
+        return memoryview(self._buffer)
+
+    def reveal(self) -> str:
+        """Copie du secret en `str` : elle, ne pourra pas être effacée."""
+        if self._buffer is None:
+            raise ValueError("Ce secret a déjà été effacé.")
+        return self._buffer.decode()
+
+    def wipe(self) -> None:
+        # Mise à zéro en place : les vues encore prêtées ne voient plus que des zéros.
+        buffer, self._buffer = self._buffer, None
+        if buffer:
+            buffer[:] = bytes(len(buffer))
+
+    def __len__(self) -> int:
+        return len(self._buffer) if self._buffer is not None else 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SecretBuffer):
+            other = other._buffer
+        if not isinstance(other, (bytes, bytearray, memoryview)) or self._buffer is None:
+            return NotImplemented
+        return hmac.compare_digest(self._buffer, other)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        raise TypeError("Un secret ne peut pas être sérialisé.")
+
+    def __repr__(self) -> str:
+        return "SecretBuffer(<effacé>)" if self._buffer is None else f"SecretBuffer(<{len(self)} octets>)"
+
+    def __enter__(self) -> "SecretBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.wipe()
+
+    def __del__(self) -> None:
+        buffer = getattr(self, "_buffer", None)
+        if buffer:
+            buffer[:] = bytes(len(buffer))
+
+
+def wipe_all(secrets: Iterable[SecretBuffer]) -> None:
+    for secret in secrets:
+        secret.wipe()
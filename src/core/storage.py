@@ -1,101 +1,518 @@
+import hmac
 import sqlite3
-from src.core.crypto import get_db_path, encrypt_password, decrypt_password
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from src.core.blind_index import BlindIndex, NameCache, fill_row_hashes, insert_prefix_tokens
+from src.core.changes import ApplicationChange, application_counts, diff_counts
+from src.core.crypto import (
+    derive_key,
+    get_db_path,
+    row_binding,
+    store_master_verification,
+    VaultCipher,
+)
+from src.core.entry import Entry, decrypt_entries, wipe_entries
+from src.core.envelope import (
+    RECORD_KEY_VERSION,
+    commit_staged_data_key,
+    generate_data_key,
+    load_data_key,
+    rekey_legacy_rows,
+    stage_data_key,
+    store_data_key,
+)
+from src.core.metrics import instrumented, result_length, single_row
+from src.core.migrations import APPLICATIONS_TABLE_NAME, TABLE_NAME, migrate
+from src.core.pool import ConnectionPool
+from src.core.search import DEFAULT_LIMIT, search_applications
+
+_BULK_TABLE_NAME = "bulk_keys"
 
 
 class Database:
-    TABLE_NAME = "passwords"
+    TABLE_NAME = TABLE_NAME
 
-    def __init__(self, derived_key: bytes):
-        self.key = derived_key
-        self._db_path = get_db_path()
+    def __init__(
+        self,
+        derived_key: bytes,
+        db_path: Path | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ):
+        self.master_key = derived_key
+        self._entries: dict[int, tuple[bytes, Entry]] = {}
+        self._listeners: list[Callable[[list[ApplicationChange]], None]] = []
+        self._pending_changes: list[ApplicationChange] = []
+        self._db_path = db_path or get_db_path()
         self._connect()
+        self._open_data_key(progress)
+
+    @property
+    def path(self) -> Path:
+        return self._db_path
 
     def _connect(self) -> None:
         try:
-            self.conn = sqlite3.connect(str(self._db_path))
-            self.cursor = self.conn.cursor()
-            self.cursor.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    application TEXT NOT NULL,
-                    userid TEXT NOT NULL,
-                    password TEXT NOT NULL
-                )
-            """)
-            self.conn.commit()
+            self._pool = ConnectionPool(self._db_path)
+            with self._pool.writer() as conn:
+                migrate(conn)
         except sqlite3.Error as e:
             raise RuntimeError(
                 f"Erreur lors de l'initialisation de la base de données : {e}"
             )
 
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Connexion de lecture empruntée au pool, sur un instantané cohérent."""
+        with self._pool.read(snapshot=True) as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction d'écriture sérialisée, validée à la sortie ou annulée sur erreur.
+
+        Les changements de la liste des applications ne sont publiés qu'une fois la
+        transaction la plus externe validée.
+        """
+        with self._pool.writer() as writer:
+            outermost = not writer.in_transaction
+            try:
+                with self._pool.transaction() as conn:
+                    yield conn
+            except BaseException:
+                if outermost:
+                    self._pending_changes.clear()
+                raise
+            if not outermost:
+                return
+            changes, self._pending_changes = self._pending_changes, []
+        self._publish(changes)
+
+    def subscribe(
+        self, listener: Callable[[list[ApplicationChange]], None]
+    ) -> Callable[[], None]:
+        """Abonne `listener` aux changements de la liste des applications.
+
+        Il est appelé depuis le thread qui a écrit ; la fonction renvoyée le désabonne.
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _publish(self, changes: list[ApplicationChange]) -> None:
+        if not changes:
+            return
+        for listener in list(self._listeners):
+            listener(changes)
+
+    @contextmanager
+    def _track_applications(
+        self, conn: sqlite3.Connection, applications: Iterable[str]
+    ) -> Iterator[None]:
+        if not self._listeners:
+            yield
+            return
+        names = {self.index.application(application): application for application in applications}
+        before = application_counts(conn, names)
+        yield
+        self._pending_changes.extend(diff_counts(before, application_counts(conn, names)))
+
+    def _open_data_key(self, progress: Callable[[int, int], None] | None) -> None:
+        # Les entrées sont chiffrées par une clé de données aléatoire ; la clé maître
+        # ne fait que l'emballer. Les coffres antérieurs sont rechiffrés une fois ici.
+        try:
+            with self._pool.writer() as conn:
+                data_key = load_data_key(conn, self.master_key)
+                if data_key is None:
+                    data_key = generate_data_key()
+                    store_data_key(conn, self.master_key, data_key)
+                self.key = data_key
+                self.cipher = VaultCipher(data_key)
+                self.index = BlindIndex(data_key)
+                self._names = NameCache(self.cipher)
+                rekey_legacy_rows(
+                    conn, self.master_key, self.cipher, self.index, progress=progress
+                )
+                fill_row_hashes(conn, self.cipher, self.index)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors de l'ouverture de la clé du coffre : {e}")
+
+    def change_master_password(self, current_password: str, new_password: str) -> None:
+        if not hmac.compare_digest(derive_key(current_password), self.master_key):
+            raise ValueError("Mot de passe maître actuel invalide.")
+        if not new_password:
+            raise ValueError("Le nouveau mot de passe ne peut pas être vide.")
+
+        # Seule la clé de données est ré-emballée. L'ordre des étapes garde le coffre
+        # ouvrable par l'un ou l'autre mot de passe si le processus est interrompu.
+        new_master_key = derive_key(new_password)
+        try:
+            with self._pool.writer() as conn:
+                stage_data_key(conn, new_master_key, self.key)
+                store_master_verification(new_master_key)
+                commit_staged_data_key(conn)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors du changement de mot de passe : {e}")
+        self.master_key = new_master_key
+
     def close(self) -> None:
-        if hasattr(self, "conn") and self.conn:
-            self.conn.close()
-            self.conn = None
+        if hasattr(self, "cipher"):
+            self.cipher.close()
+        if hasattr(self, "_entries"):
+            wipe_entries([entry for _, entry in self._entries.values()])
+            self._entries.clear()
+        if hasattr(self, "_names"):
+            self._names.clear()
+        if hasattr(self, "_pool"):
+            self._pool.close()
 
     def __del__(self):
         self.close()
 
+    def _decrypt_names(self, tokens: list[bytes], indexes: list[bytes]) -> list[str]:
+        try:
+            return self.cipher.decrypt_many(tokens, indexes)
+        except Exception as e:
+            raise RuntimeError(f"Erreur de déchiffrement : {e}")
+
+    @instrumented("db.get_applications", rows=result_length)
     def get_applications(self) -> list[str]:
         try:
-            self.cursor.execute(
-                f"SELECT DISTINCT application FROM {self.TABLE_NAME}"
-            )
-            return [row[0] for row in self.cursor.fetchall()]
+            with self._pool.read() as conn:
+                rows = conn.execute(
+                    f"SELECT name_index, name FROM {APPLICATIONS_TABLE_NAME}"
+                ).fetchall()
         except sqlite3.Error as e:
             raise RuntimeError(f"Erreur lors de la récupération des applications : {e}")
+        return sorted(self._names.resolve(rows))
 
-    def get_info(self, application: str) -> list[tuple[str, str]]:
+    @instrumented("db.get_application_counts", rows=result_length)
+    def get_application_counts(self, applications: Iterable[str] | None = None) -> dict[str, int]:
+        """Nombre d'entrées par application, triées par nom, lus dans l'index des applications."""
         try:
-            self.cursor.execute(
-                f"SELECT userid, password FROM {self.TABLE_NAME} WHERE application = ?",
-                (application,),
-            )
-            rows = self.cursor.fetchall()
-            return [(uid, decrypt_password(pwd, self.key)) for uid, pwd in rows]
+            with self._pool.read() as conn:
+                if applications is not None:
+                    names = {self.index.application(name): name for name in applications}
+                    counts = application_counts(conn, names)
+                else:
+                    rows = conn.execute(
+                        f"SELECT name_index, name, entry_count FROM {APPLICATIONS_TABLE_NAME}"
+                    ).fetchall()
+                    names = self._names.resolve((name_index, name) for name_index, name, _ in rows)
+                    counts = {name: count for name, (_, _, count) in zip(names, rows)}
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors de la récupération des applications : {e}")
+        return {name: counts[name] for name in sorted(counts)}
+
+    @instrumented("db.search_applications", rows=result_length)
+    def search_applications(self, query: str, limit: int = DEFAULT_LIMIT) -> list[str]:
+        try:
+            with self._pool.read() as conn:
+                return search_applications(conn, self.index, self._names, self.cipher, query, limit)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors de la recherche : {e}")
+
+    @instrumented("db.get_info", rows=result_length)
+    def get_info(self, application: str) -> list[Entry]:
+        try:
+            with self._pool.read() as conn:
+                rows = conn.execute(
+                    f"SELECT id, userid_index, userid, password FROM {self.TABLE_NAME} "
+                    "WHERE application_index = ?",
+                    (self.index.application(application),),
+                ).fetchall()
         except sqlite3.Error as e:
             raise RuntimeError(f"Erreur lors de la récupération des informations : {e}")
-        except Exception as e:
-            raise RuntimeError(f"Erreur de déchiffrement : {e}")
 
+        # Seuls les identifiants des entrées absentes du cache sont déchiffrés.
+        entries: list[Entry | None] = [self._cached_entry(*row) for row in rows]
+        missing = [position for position, entry in enumerate(entries) if entry is None]
+        userids = self._decrypt_names(
+            [rows[position][2] for position in missing], [rows[position][1] for position in missing]
+        )
+        for position, userid in zip(missing, userids):
+            entry_id, userid_index, _, token = rows[position]
+            entry = Entry(entry_id, application, userid, token, self.cipher)
+            self._entries[entry_id] = (userid_index, entry)
+            entries[position] = entry
+        return entries
+
+    def _cached_entry(
+        self, entry_id: int, userid_index: bytes, sealed_userid: bytes, token: bytes
+    ) -> Entry | None:
+        cached = self._entries.get(entry_id)
+        if cached is None or cached[0] != userid_index or cached[1].token != token:
+            return None
+        return cached[1]
+
+    @instrumented("db.decrypt_entries", rows=lambda result, self, entries: len(entries))
+    def decrypt_entries(self, entries: list[Entry]) -> None:
+        decrypt_entries(entries, self.cipher)
+
+    @instrumented("db.get_users_for_application", rows=result_length)
     def get_users_for_application(self, application: str) -> list[str]:
         try:
-            self.cursor.execute(
-                f"SELECT DISTINCT userid FROM {self.TABLE_NAME} WHERE application = ?",
-                (application,),
-            )
-            return [row[0] for row in self.cursor.fetchall()]
+            with self._pool.read() as conn:
+                rows = conn.execute(
+                    f"SELECT userid_index, userid FROM {self.TABLE_NAME} "
+                    "WHERE application_index = ?",
+                    (self.index.application(application),),
+                ).fetchall()
         except sqlite3.Error as e:
             raise RuntimeError(f"Erreur lors de la récupération des utilisateurs : {e}")
+        return sorted(
+            self._decrypt_names([userid for _, userid in rows], [index for index, _ in rows])
+        )
 
+    _UPSERT_SQL = (
+        f"INSERT INTO {TABLE_NAME} "
+        "(id, application, userid, password, application_index, userid_index, row_hash, "
+        "created_at, updated_at, key_version) "
+        f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, {RECORD_KEY_VERSION}) "
+        "ON CONFLICT (id) DO UPDATE SET "
+        "password = excluded.password, key_version = excluded.key_version, "
+        "revision = revision + (row_hash IS NOT excluded.row_hash), row_hash = excluded.row_hash, "
+        "updated_at = CASE WHEN row_hash IS excluded.row_hash THEN updated_at "
+        "ELSE excluded.updated_at END"
+    )
+
+    def _resolve_ids(self, conn: sqlite3.Connection, keys: list[tuple[bytes, bytes]]) -> list[int]:
+        # Le mot de passe est lié à l'identifiant de sa ligne : celui-ci doit être connu
+        # avant le chiffrement. Les nouvelles entrées reçoivent les identifiants suivants
+        # de la séquence AUTOINCREMENT, sous le verrou d'écriture.
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = ?", (self.TABLE_NAME,)
+        ).fetchone()
+        next_id = (row[0] if row else 0) + 1
+        ids: dict[tuple[bytes, bytes], int] = {}
+        for key in keys:
+            if key in ids:
+                continue
+            existing = conn.execute(
+                f"SELECT id FROM {self.TABLE_NAME} "
+                "WHERE application_index = ? AND userid_index = ?",
+                key,
+            ).fetchone()
+            if existing is not None:
+                ids[key] = existing[0]
+            else:
+                ids[key] = next_id
+                next_id += 1
+        return [ids[key] for key in keys]
+
+    def _upsert_entries(
+        self, conn: sqlite3.Connection, entries: list[tuple[str, str, str]]
+    ) -> list[int]:
+        keys = [
+            (self.index.application(application), self.index.userid(userid))
+            for application, userid, _ in entries
+        ]
+        ids = self._resolve_ids(conn, keys)
+        sealed = self.cipher.encrypt_many(
+            [value for entry in entries for value in entry],
+            [
+                data
+                for entry_id, (application_index, userid_index) in zip(ids, keys)
+                for data in (application_index, userid_index, row_binding(entry_id))
+            ],
+        )
+        now = int(time.time())
+        conn.executemany(
+            self._UPSERT_SQL,
+            [
+                (
+                    entry_id,
+                    *sealed[3 * position:3 * position + 3],
+                    *keys[position],
+                    self.index.row_hash(*keys[position], entries[position][2]),
+                    now,
+                    now,
+                )
+                for position, entry_id in enumerate(ids)
+            ],
+        )
+        insert_prefix_tokens(
+            conn,
+            self.index,
+            [
+                (entry_id, application, userid)
+                for entry_id, (application, userid, _) in zip(ids, entries)
+            ],
+        )
+        return ids
+
+    @instrumented("db.insert", rows=single_row)
     def insert(self, application: str, userid: str, password: str) -> None:
-        encrypted_password = encrypt_password(password, self.key)
         try:
-            self.cursor.execute(
-                f"INSERT INTO {self.TABLE_NAME} (application, userid, password) VALUES (?, ?, ?)",
-                (application, userid, encrypted_password),
-            )
-            self.conn.commit()
+            with self.transaction() as conn, self._track_applications(conn, [application]):
+                self._upsert_entries(conn, [(application, userid, password)])
         except sqlite3.Error as e:
             raise RuntimeError(f"Erreur lors de l'insertion : {e}")
 
-    def delete_entry_by_app_and_user(self, application: str, userid: str) -> None:
+    @instrumented("db.insert_many", rows=lambda total, *args, **kwargs: total)
+    def insert_many(
+        self,
+        entries: Iterable[tuple[str, str, str]],
+        batch_size: int = 500,
+        progress: Callable[[int], None] | None = None,
+    ) -> int:
+        iterator = iter(entries)
+        total = 0
         try:
-            self.cursor.execute(
-                f"SELECT id FROM {self.TABLE_NAME} WHERE application = ? AND userid = ?",
-                (application, userid),
-            )
-            result = self.cursor.fetchone()
+            while batch := list(islice(iterator, batch_size)):
+                applications = (application for application, _, _ in batch)
+                with self.transaction() as conn, self._track_applications(conn, applications):
+                    self._upsert_entries(conn, batch)
+                total += len(batch)
+                if progress is not None:
+                    progress(total)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors de l'import : {e}")
+        return total
 
-            if result is None:
-                raise ValueError(
-                    f"Aucune entrée trouvée pour '{application}' avec l'utilisateur '{userid}'."
+    @instrumented("db.upsert_many", rows=result_length)
+    def upsert_many(self, entries: Iterable[tuple[str, str, str]]) -> list[int]:
+        """Ajoute ou met à jour des entrées (application, utilisateur, mot de passe) en
+        une seule transaction ; renvoie leurs identifiants, dans l'ordre donné."""
+        entries = list(entries)
+        if not entries:
+            return []
+        applications = (application for application, _, _ in entries)
+        try:
+            with self.transaction() as conn, self._track_applications(conn, applications):
+                return self._upsert_entries(conn, entries)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors de l'enregistrement : {e}")
+
+    def _stage(self, conn: sqlite3.Connection, rows: Iterable[tuple]) -> None:
+        # Les clés (et valeurs) d'une opération groupée passent par une table
+        # temporaire : une seule instruction ensembliste les traite, et RETURNING
+        # rend ses lignes, ce que executemany ne fait pas.
+        conn.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {_BULK_TABLE_NAME} "
+            "(key PRIMARY KEY, value, row_hash) WITHOUT ROWID"
+        )
+        conn.execute(f"DELETE FROM temp.{_BULK_TABLE_NAME}")
+        conn.executemany(
+            f"INSERT OR REPLACE INTO temp.{_BULK_TABLE_NAME} (key, value, row_hash) "
+            "VALUES (?, ?, ?)",
+            rows,
+        )
+
+    def _publish_deletions(self, conn: sqlite3.Connection, rows: list[tuple]) -> None:
+        # Les lignes rendues par RETURNING donnent les compteurs d'avant la suppression.
+        if not self._listeners or not rows:
+            return
+        deleted: dict[bytes, int] = {}
+        sealed: dict[bytes, bytes] = {}
+        for _, application_index, application in rows:
+            deleted[application_index] = deleted.get(application_index, 0) + 1
+            sealed[application_index] = application
+        names = dict(zip(sealed, self._names.resolve(sealed.items())))
+        after = application_counts(conn, names)
+        before = {
+            names[application_index]: after.get(names[application_index], 0) + count
+            for application_index, count in deleted.items()
+        }
+        self._pending_changes.extend(diff_counts(before, after))
+
+    @instrumented("db.delete_many", rows=result_length)
+    def delete_many(
+        self,
+        ids: Iterable[int] | None = None,
+        applications: Iterable[str] | None = None,
+    ) -> list[int]:
+        """Supprime en une transaction les entrées désignées par identifiant, et toutes
+        celles des applications données ; renvoie les identifiants supprimés."""
+        keys = [(entry_id, None, None) for entry_id in ids or ()]
+        keys += [
+            (self.index.application(application), None, None)
+            for application in applications or ()
+        ]
+        if not keys:
+            return []
+        try:
+            with self.transaction() as conn:
+                self._stage(conn, keys)
+                rows = conn.execute(
+                    f"DELETE FROM {self.TABLE_NAME} "
+                    f"WHERE id IN (SELECT key FROM temp.{_BULK_TABLE_NAME}) "
+                    f"OR application_index IN (SELECT key FROM temp.{_BULK_TABLE_NAME}) "
+                    "RETURNING id, application_index, application"
+                ).fetchall()
+                conn.execute(f"DELETE FROM temp.{_BULK_TABLE_NAME}")
+                self._publish_deletions(conn, rows)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors de la suppression : {e}")
+
+        for entry_id, _, _ in rows:
+            self._entries.pop(entry_id, None)
+        return sorted(entry_id for entry_id, _, _ in rows)
+
+    @instrumented("db.update_many", rows=result_length)
+    def update_many(self, passwords: Iterable[tuple[int, str]]) -> list[int]:
+        """Remplace les mots de passe des entrées (identifiant, nouveau mot de passe) en
+        une transaction ; renvoie les identifiants effectivement modifiés."""
+        passwords = dict(passwords)
+        if not passwords:
+            return []
+        ids = list(passwords)
+        sealed = self.cipher.encrypt_many(
+            [passwords[entry_id] for entry_id in ids],
+            [row_binding(entry_id) for entry_id in ids],
+        )
+        try:
+            with self.transaction() as conn:
+                # L'empreinte de contenu dépend des index aveugles de chaque entrée.
+                self._stage(conn, ((entry_id, None, None) for entry_id in ids))
+                keys = {
+                    entry_id: (application_index, userid_index)
+                    for entry_id, application_index, userid_index in conn.execute(
+                        f"SELECT id, application_index, userid_index FROM {self.TABLE_NAME} "
+                        f"WHERE id IN (SELECT key FROM temp.{_BULK_TABLE_NAME})"
+                    )
+                }
+                self._stage(
+                    conn,
+                    (
+                        (entry_id, token, self.index.row_hash(*keys[entry_id], passwords[entry_id]))
+                        for entry_id, token in zip(ids, sealed)
+                        if entry_id in keys
+                    ),
                 )
+                rows = conn.execute(
+                    f"UPDATE {self.TABLE_NAME} SET password = bulk.value, "
+                    f"key_version = {RECORD_KEY_VERSION}, row_hash = bulk.row_hash, "
+                    "revision = revision + 1, updated_at = ? "
+                    f"FROM temp.{_BULK_TABLE_NAME} AS bulk WHERE {self.TABLE_NAME}.id = bulk.key "
+                    f"RETURNING {self.TABLE_NAME}.id",
+                    (int(time.time()),),
+                ).fetchall()
+                conn.execute(f"DELETE FROM temp.{_BULK_TABLE_NAME}")
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Erreur lors de la mise à jour : {e}")
+        return sorted(entry_id for entry_id, in rows)
 
-            self.cursor.execute(
-                f"DELETE FROM {self.TABLE_NAME} WHERE id = ?",
-                (result[0],),
-            )
-            self.conn.commit()
+    @instrumented("db.delete_entry_by_app_and_user", rows=single_row)
+    def delete_entry_by_app_and_user(self, application: str, userid: str) -> None:
+        try:
+            with self.transaction() as conn, self._track_applications(conn, [application]):
+                deleted = conn.execute(
+                    f"DELETE FROM {self.TABLE_NAME} "
+                    "WHERE application_index = ? AND userid_index = ?",
+                    (self.index.application(application), self.index.userid(userid)),
+                ).rowcount
         except sqlite3.Error as e:
             raise RuntimeError(f"Erreur base de données : {e}")
+
+        if deleted == 0:
+            raise ValueError(
+                f"Aucune entrée trouvée pour '{application}' avec l'utilisateur '{userid}'."
+            )
@@ -0,0 +1,282 @@
+import hashlib
+import math
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from src.core.config import get_config
+from src.core.dictionary import DictionaryMatcher, load_wordlist_matcher
+from src.core.wordlist import WORDS
+
+# Liste intégrée, classée par fréquence (voir README) : mots de passe courants, mots
+# français et anglais, prénoms et noms de famille. Compilée en .kpac au premier usage.
+BUILTIN_WORDLIST = Path(__file__).resolve().parent / "data" / "strength_words.txt.gz"
+
+COMMON_PASSWORDS = (
+    "123456", "password", "123456789", "12345678", "12345", "qwerty", "1234567",
+    "111111", "1234567890", "123123", "abc123", "password1", "iloveyou", "000000",
+    "1q2w3e4r", "qwerty123", "azerty", "admin", "letmein", "welcome", "monkey",
+    "master", "dragon", "login", "princess", "football", "shadow", "sunshine",
+    "trustno1", "superman", "baseball", "starwars", "passw0rd", "freedom",
+    "whatever", "qazwsx", "hello", "secret", "michael", "jordan", "charlie",
+    "soleil", "bonjour", "motdepasse", "doudou", "loulou", "chouchou", "marseille",
+    "nicolas", "camille", "julien", "thomas", "chocolat", "amour", "jetaime",
+    "summer", "winter", "autumn", "spring", "computer", "internet", "love",
+    "pass", "test", "user", "root", "guest", "default", "changeme", "azertyuiop",
+)
+
+_LEET_TABLE = {
+    "4": "a", "@": "a", "8": "b", "(": "c", "3": "e", "6": "g", "9": "g",
+    "1": "i", "!": "i", "|": "i", "0": "o", "$": "s", "5": "s", "7": "t",
+    "+": "t", "2": "z",
+}
+
+_KEYBOARD_LAYOUTS = (
+    ("1234567890-=", "qwertyuiop[]", "asdfghjkl;'", "zxcvbnm,./"),
+    ("1234567890)=", "azertyuiop^$", "qsdfghjklmù", "wxcvbn,;:!"),
+)
+
+_DATE_SEPARATORS = "/-._ "
+
+BRUTEFORCE_CARDINALITY = 10
+MATCH_PENALTY = 10
+KEYBOARD_STARTING_POSITIONS = 47
+KEYBOARD_AVERAGE_DEGREE = 4
+DATE_GUESSES = 365 * 120
+YEAR_GUESSES = 120
+MIN_YEAR = 1900
+MAX_YEAR = 2049
+
+SCORE_THRESHOLDS = (3, 6, 8, 10, 12)
+
+
+def _build_keyboard_graph() -> dict[str, dict[str, tuple[int, int]]]:
+    graph: dict[str, dict[str, tuple[int, int]]] = {}
+    for rows in _KEYBOARD_LAYOUTS:
+        for r, row in enumerate(rows):
+            for c, key in enumerate(row):
+                neighbours = graph.setdefault(key, {})
+                for dr, dc in ((0, -1), (0, 1), (-1, 0), (-1, 1), (1, 0), (1, -1)):
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < len(rows) and 0 <= nc < len(rows[nr]):
+                        neighbours.setdefault(rows[nr][nc], (dr, dc))
+    return graph
+
+
+_KEYBOARD_GRAPH = _build_keyboard_graph()
+
+
+class StrengthEstimate:
+    __slots__ = ("guesses", "score", "matches")
+
+    def __init__(self, guesses: float, score: int, matches: list[tuple[str, int, int, float]]):
+        self.guesses = guesses
+        self.score = score
+        self.matches = matches
+
+    @property
+    def log10_guesses(self) -> float:
+        return math.log10(max(self.guesses, 1))
+
+    def __repr__(self) -> str:
+        return f"StrengthEstimate(score={self.score}, log10_guesses={self.log10_guesses:.1f})"
+
+
+def _builtin_cache_path() -> Path:
+    if hasattr(sys, "_MEIPASS"):
+        from src.core.crypto import get_user_data_dir
+
+        return get_user_data_dir() / "strength_words.kpac"
+    return BUILTIN_WORDLIST.with_name("strength_words.kpac")
+
+
+@lru_cache(maxsize=1)
+def get_matcher() -> DictionaryMatcher:
+    # Les mots des phrases de passe passent en tête : un attaquant connaît la liste.
+    builtin_words = COMMON_PASSWORDS + WORDS
+    wordlist = get_config().strength_dictionary
+    if wordlist is not None and wordlist.is_file():
+        return load_wordlist_matcher(wordlist, builtin_words)
+    if BUILTIN_WORDLIST.is_file():
+        # Empreinte du contenu plutôt que chemin et date : l'exécutable PyInstaller
+        # extrait ses fichiers dans un dossier différent à chaque lancement.
+        digest = hashlib.sha256(BUILTIN_WORDLIST.read_bytes()).hexdigest()
+        return load_wordlist_matcher(
+            BUILTIN_WORDLIST, builtin_words, _builtin_cache_path(), signature=(digest,)
+        )
+    return DictionaryMatcher.build(builtin_words)
+
+
+def _variations(changed: int, unchanged: int) -> int:
+    if not changed:
+        return 1
+    if not unchanged:
+        return 2
+    return max(2, sum(math.comb(changed + unchanged, i) for i in range(1, min(changed, unchanged) + 1)))
+
+
+def _is_ascii_digits(text: str) -> bool:
+    # str.isdigit() accepte aussi les exposants et autres chiffres Unicode, que int() refuse.
+    return text.isascii() and text.isdigit()
+
+
+def _lower(text: str) -> str:
+    # Minuscules caractère par caractère, sans changer la longueur : « İ ».lower() en
+    # compte deux et décalerait toutes les positions calculées sur le mot de passe.
+    return "".join(lower if len(lower := char.lower()) == 1 else char for char in text)
+
+
+def _dictionary_guesses(token: str, normalized: str, rank: int) -> float:
+    upper = sum(1 for char in token if char.isupper())
+    lower = sum(1 for char in token if char.islower())
+    if upper and (upper == len(token) or (upper == 1 and token[0].isupper())):
+        case_variations = 2
+    else:
+        case_variations = _variations(upper, lower)
+    substituted = sum(1 for char, plain in zip(_lower(token), normalized) if char != plain)
+    return rank * case_variations * _variations(substituted, len(token) - substituted)
+
+
+def _sequence_guesses(token: str, descending: bool) -> float:
+    first = token[0]
+    if first in "aAzZ019":
+        base = 4
+    elif first.isdigit():
+        base = 10
+    else:
+        base = 26
+    return base * len(token) * (2 if descending else 1)
+
+
+def _date_guesses(token: str) -> float | None:
+    separator = next((char for char in token if char in _DATE_SEPARATORS), None)
+    if separator is not None:
+        parts = token.split(separator)
+        if len(parts) != 3 or not all(_is_ascii_digits(part) for part in parts):
+            return None
+        candidates = [parts, parts[::-1], [parts[1], parts[0], parts[2]]]
+        extra = 4
+    else:
+        if len(token) not in (4, 6, 8):
+            return None
+        if len(token) == 4:
+            year = int(token)
+            return YEAR_GUESSES if MIN_YEAR <= year <= MAX_YEAR else None
+        candidates = [
+            [token[:2], token[2:4], token[4:]],
+            [token[2:4], token[:2], token[4:]],
+            [token[-2:], token[-4:-2], token[:-4]],
+        ]
+        extra = 1
+
+    for day, month, year in candidates:
+        if len(year) not in (2, 4) or not day or not month:
+            continue
+        day, month, year = int(day), int(month), int(year)
+        if len(str(year)) <= 2:
+            year += 2000 if year < 50 else 1900
+        if 1 <= day <= 31 and 1 <= month <= 12 and MIN_YEAR <= year <= MAX_YEAR:
+            return DATE_GUESSES * extra
+    return None
+
+
+def _score(guesses: float) -> int:
+    log_guesses = math.log10(max(guesses, 1))
+    return sum(1 for threshold in SCORE_THRESHOLDS if log_guesses >= threshold)
+
+
+def estimate_strength(password: str) -> StrengthEstimate:
+    length = len(password)
+    if not length:
+        return StrengthEstimate(1, 0, [])
+
+    matcher = get_matcher()
+    matches: list[tuple[str, int, int, float]] = []
+    lowered = _lower(password)
+    normalized = "".join(_LEET_TABLE.get(char, char) for char in lowered)
+    has_leet = normalized != lowered
+
+    plain_state = 0
+    leet_state = 0
+    repeat_start = sequence_start = keyboard_start = date_start = 0
+    sequence_delta = 0
+    turns = 0
+    direction = None
+
+    for i in range(length + 1):
+        char = lowered[i] if i < length else ""
+
+        if i < length:
+            end = i + 1
+            plain_state = matcher.step(plain_state, char)
+            for word_length, rank in matcher.outputs(plain_state):
+                start = end - word_length
+                guesses = _dictionary_guesses(password[start:end], lowered[start:end], rank)
+                matches.append(("dictionary", start, end, guesses))
+            if has_leet:
+                leet_state = matcher.step(leet_state, normalized[i])
+                for word_length, rank in matcher.outputs(leet_state):
+                    start = end - word_length
+                    if normalized[start:end] != lowered[start:end]:
+                        guesses = _dictionary_guesses(password[start:end], normalized[start:end], rank)
+                        matches.append(("dictionary", start, end, guesses))
+
+        previous = lowered[i - 1] if i else ""
+
+        if i and char != previous:
+            if i - repeat_start >= 3:
+                matches.append(("repeat", repeat_start, i, BRUTEFORCE_CARDINALITY * (i - repeat_start)))
+            repeat_start = i
+
+        delta = ord(char) - ord(previous) if i and char else 0
+        if not (i and char and delta == sequence_delta and abs(delta) == 1):
+            if i - sequence_start >= 3 and abs(sequence_delta) == 1:
+                guesses = _sequence_guesses(password[sequence_start:i], sequence_delta < 0)
+                matches.append(("sequence", sequence_start, i, guesses))
+            sequence_start = i - 1 if i and char and abs(delta) == 1 else i
+            sequence_delta = delta
+
+        step = _KEYBOARD_GRAPH.get(previous, {}).get(char) if i and char else None
+        if step is None:
+            if i - keyboard_start >= 4:
+                guesses = (
+                    KEYBOARD_STARTING_POSITIONS * (i - keyboard_start)
+                    * KEYBOARD_AVERAGE_DEGREE ** (turns + 1)
+                )
+                matches.append(("keyboard", keyboard_start, i, guesses))
+            keyboard_start = i
+            turns = 0
+            direction = None
+        else:
+            if direction is not None and step != direction:
+                turns += 1
+            direction = step
+
+        if not (_is_ascii_digits(char) or (char and char in _DATE_SEPARATORS and i > date_start)):
+            token = password[date_start:i].strip(_DATE_SEPARATORS)
+            if len(token) >= 4:
+                guesses = _date_guesses(token)
+                if guesses is not None:
+                    start = date_start + password[date_start:i].index(token)
+                    matches.append(("date", start, start + len(token), guesses))
+                elif _is_ascii_digits(token):
+                    for offset in range(len(token) - 3):
+                        if MIN_YEAR <= int(token[offset:offset + 4]) <= MAX_YEAR:
+                            start = date_start + offset
+                            matches.append(("date", start, start + 4, YEAR_GUESSES))
+            date_start = i + 1
+
+    best = [0.0] * (length + 1)
+    best[0] = 1.0
+    ending_at: list[list[tuple[str, int, int, float]]] = [[] for _ in range(length + 1)]
+    for match in matches:
+        ending_at[match[2]].append(match)
+    for end in range(1, length + 1):
+        best[end] = best[end - 1] * BRUTEFORCE_CARDINALITY
+        for _, start, _, guesses in ending_at[end]:
+            candidate = best[start] * max(guesses, 1) * (MATCH_PENALTY if start else 1)
+            if candidate < best[end]:
+                best[end] = candidate
+
+    guesses = best[length]
+    return StrengthEstimate(guesses, _score(guesses), matches)
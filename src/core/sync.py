@@ -0,0 +1,383 @@
+import hmac
+import os
+import sqlite3
+import time
+from typing import Iterable
+
+from src.core.crypto import row_binding
+from src.core.envelope import RECORD_KEY_VERSION
+from src.core.migrations import (
+    PREFIX_TABLE_NAME,
+    SYNC_BASE_TABLE_NAME,
+    SYNC_FANOUT_BITS,
+    SYNC_PEERS_TABLE_NAME,
+    SYNC_TREE_LEVELS,
+    SYNC_TREE_TABLE_NAME,
+    TABLE_NAME,
+    VAULT_INFO_TABLE_NAME,
+)
+from src.core.secret import wipe_all
+from src.core.storage import Database
+
+LOCAL = "local"
+REMOTE = "remote"
+
+_LEAF_SHIFT = 64 - SYNC_FANOUT_BITS * (SYNC_TREE_LEVELS - 1)
+_LEAF_OFFSET = 1 << (63 - _LEAF_SHIFT)
+_PEER_TOKEN_SIZE = 16
+
+_MERGE_SQL = (
+    f"INSERT INTO {TABLE_NAME} "
+    "(id, application, userid, password, application_index, userid_index, revision, row_hash, "
+    "created_at, updated_at, key_version) "
+    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {RECORD_KEY_VERSION}) "
+    "ON CONFLICT (id) DO UPDATE SET "
+    "password = excluded.password, key_version = excluded.key_version, "
+    "revision = excluded.revision, row_hash = excluded.row_hash, updated_at = excluded.updated_at"
+)
+
+
+class SyncRow:
+    """Ligne telle que stockée : rien n'est déchiffré pour la comparer."""
+
+    __slots__ = (
+        "id", "application_index", "userid_index", "application", "userid", "password",
+        "revision", "row_hash", "created_at", "updated_at",
+    )
+
+    COLUMNS = (
+        "id, application_index, userid_index, application, userid, password, revision, row_hash, "
+        "created_at, updated_at"
+    )
+
+    def __init__(self, entry_id, application_index, userid_index, application, userid, password,
+                 revision, row_hash, created_at, updated_at):
+        self.id = entry_id
+        self.application_index = application_index
+        self.userid_index = userid_index
+        self.application = application
+        self.userid = userid
+        self.password = password
+        self.revision = revision
+        self.row_hash = row_hash
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @property
+    def key(self) -> bytes:
+        return self.application_index + self.userid_index
+
+
+class SyncConflict:
+    """Entrée modifiée des deux côtés depuis la dernière synchronisation."""
+
+    __slots__ = ("application", "userid", "kept")
+
+    def __init__(self, application: str, userid: str, kept: str):
+        self.application = application
+        self.userid = userid
+        self.kept = kept
+
+    def __repr__(self) -> str:
+        return f"SyncConflict({self.application!r}, {self.userid!r}, kept={self.kept})"
+
+
+class SyncReport:
+
+    def __init__(self, pulled: int, pushed: int, conflicts: list[SyncConflict], compared: int,
+                 first_sync: bool):
+        self.pulled = pulled
+        self.pushed = pushed
+        self.conflicts = conflicts
+        self.compared = compared
+        self.first_sync = first_sync
+
+
+def _ranges(positions: list[int]) -> list[tuple[int, int]]:
+    # Positions triées regroupées en intervalles contigus : une requête par intervalle.
+    ranges: list[tuple[int, int]] = []
+    for position in positions:
+        if ranges and ranges[-1][1] == position - 1:
+            ranges[-1] = (ranges[-1][0], position)
+        else:
+            ranges.append((position, position))
+    return ranges
+
+
+def _tree_nodes(conn: sqlite3.Connection, level: int, ranges: list[tuple[int, int]]) -> dict:
+    nodes: dict[int, int] = {}
+    for lo, hi in ranges:
+        nodes.update(conn.execute(
+            f"SELECT position, hash FROM {SYNC_TREE_TABLE_NAME} "
+            "WHERE level = ? AND position BETWEEN ? AND ?",
+            (level, lo, hi),
+        ))
+    return nodes
+
+
+def tree_root(conn: sqlite3.Connection) -> int:
+    return _tree_nodes(conn, 0, [(0, 0)]).get(0, 0)
+
+
+def differing_leaves(local: sqlite3.Connection, remote: sqlite3.Connection) -> list[int]:
+    """Feuilles de l'arbre de Merkle qui diffèrent entre deux coffres.
+
+    La descente ne suit que les sous-arbres dont les empreintes diffèrent : le coût
+    est proportionnel au nombre de changements fois la profondeur de l'arbre.
+    """
+    frontier = [0]
+    for level in range(SYNC_TREE_LEVELS):
+        if level:
+            frontier = [
+                (parent << SYNC_FANOUT_BITS) | child
+                for parent in frontier
+                for child in range(1 << SYNC_FANOUT_BITS)
+            ]
+        ranges = _ranges(frontier)
+        local_nodes = _tree_nodes(local, level, ranges)
+        remote_nodes = _tree_nodes(remote, level, ranges)
+        frontier = [
+            position for position in frontier
+            if local_nodes.get(position, 0) != remote_nodes.get(position, 0)
+        ]
+        if not frontier:
+            break
+    return frontier
+
+
+def _leaf_rows(conn: sqlite3.Connection, leaves: list[int]) -> list[SyncRow]:
+    rows = []
+    for lo, hi in _ranges(leaves):
+        rows.extend(
+            SyncRow(*row)
+            for row in conn.execute(
+                f"SELECT {SyncRow.COLUMNS} FROM {TABLE_NAME} WHERE row_hash BETWEEN ? AND ?",
+                ((lo - _LEAF_OFFSET) << _LEAF_SHIFT, ((hi + 1 - _LEAF_OFFSET) << _LEAF_SHIFT) - 1),
+            )
+        )
+    return rows
+
+
+def _vault_id(conn: sqlite3.Connection) -> bytes:
+    return conn.execute(
+        f"SELECT value FROM {VAULT_INFO_TABLE_NAME} WHERE name = 'vault_id'"
+    ).fetchone()[0]
+
+
+def _peer_token(conn: sqlite3.Connection, peer_id: bytes) -> bytes | None:
+    row = conn.execute(
+        f"SELECT token FROM {SYNC_PEERS_TABLE_NAME} WHERE peer_id = ?", (peer_id,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _load_base(conn: sqlite3.Connection, peer_id: bytes, keys: Iterable[bytes]) -> dict:
+    base: dict[bytes, int] = {}
+    for key in keys:
+        row = conn.execute(
+            f"SELECT row_hash FROM {SYNC_BASE_TABLE_NAME} WHERE peer_id = ? AND entry_key = ?",
+            (peer_id, key),
+        ).fetchone()
+        if row is not None:
+            base[key] = row[0]
+    return base
+
+
+def _store_base(
+    conn: sqlite3.Connection, peer_id: bytes, token: bytes, merged: dict | None
+) -> None:
+    # `merged` : {clé: empreinte retenue ou None} des seules clés modifiées ; None
+    # quand l'état commun précédent est inconnu, il est alors recopié en entier.
+    if merged is None:
+        conn.execute(f"DELETE FROM {SYNC_BASE_TABLE_NAME} WHERE peer_id = ?", (peer_id,))
+        # Concaténés en SQL, les index deviendraient du texte : la clé est formée ici.
+        conn.executemany(
+            f"INSERT INTO {SYNC_BASE_TABLE_NAME} (peer_id, entry_key, row_hash) VALUES (?, ?, ?)",
+            [
+                (peer_id, application_index + userid_index, row_hash)
+                for application_index, userid_index, row_hash in conn.execute(
+                    f"SELECT application_index, userid_index, row_hash FROM {TABLE_NAME}"
+                ).fetchall()
+            ],
+        )
+    else:
+        conn.executemany(
+            f"DELETE FROM {SYNC_BASE_TABLE_NAME} WHERE peer_id = ? AND entry_key = ?",
+            [(peer_id, key) for key, row_hash in merged.items() if row_hash is None],
+        )
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {SYNC_BASE_TABLE_NAME} (peer_id, entry_key, row_hash) "
+            "VALUES (?, ?, ?)",
+            [(peer_id, key, row_hash) for key, row_hash in merged.items() if row_hash is not None],
+        )
+    conn.execute(
+        f"INSERT OR REPLACE INTO {SYNC_PEERS_TABLE_NAME} (peer_id, token, synced_at) "
+        "VALUES (?, ?, ?)",
+        (peer_id, token, time.strftime("%Y-%m-%dT%H:%M:%S%z")),
+    )
+
+
+def _resolve(
+    local: SyncRow | None, remote: SyncRow | None, base: int | None
+) -> tuple[SyncRow | None, bool]:
+    """Fusion à trois voies d'une clé ; renvoie la ligne retenue et s'il y a conflit.
+
+    Un côté inchangé depuis l'état commun prend la version de l'autre, suppression
+    comprise. Si les deux ont changé : une modification l'emporte sur une suppression,
+    sinon la révision la plus haute, puis la plus grande empreinte. La règle ne dépend
+    pas du côté d'où l'on synchronise.
+    """
+    local_hash = local.row_hash if local else None
+    remote_hash = remote.row_hash if remote else None
+    if local_hash == base:
+        return remote, False
+    if remote_hash == base:
+        return local, False
+    if local is None or remote is None:
+        return local or remote, True
+    return max(local, remote, key=lambda row: (row.revision, row.row_hash)), True
+
+
+def _apply(
+    target: Database,
+    conn: sqlite3.Connection,
+    source: Database,
+    adopted: list[SyncRow],
+    deleted: list[SyncRow],
+) -> None:
+    # Les noms sont chiffrés sous leur index aveugle, identique dans les deux copies :
+    # ils sont recopiés tels quels. Seul le mot de passe, lié à l'identifiant de sa
+    # ligne, est déchiffré puis rechiffré pour sa ligne de destination.
+    if not adopted and not deleted:
+        return
+    applications = target._names.resolve(
+        (row.application_index, row.application) for row in adopted + deleted
+    )
+    with target._track_applications(conn, applications):
+        conn.executemany(f"DELETE FROM {TABLE_NAME} WHERE id = ?", [(row.id,) for row in deleted])
+        for row in deleted:
+            target._entries.pop(row.id, None)
+        if not adopted:
+            return
+        ids = target._resolve_ids(
+            conn, [(row.application_index, row.userid_index) for row in adopted]
+        )
+        try:
+            secrets = source.cipher.decrypt_secrets_many(
+                [row.password for row in adopted], [row_binding(row.id) for row in adopted]
+            )
+        except Exception as e:
+            raise RuntimeError(f"Erreur de déchiffrement : {e}")
+        try:
+            sealed = target.cipher.encrypt_many(secrets, [row_binding(entry_id) for entry_id in ids])
+        finally:
+            wipe_all(secrets)
+        conn.executemany(
+            _MERGE_SQL,
+            [
+                (entry_id, row.application, row.userid, password, row.application_index,
+                 row.userid_index, row.revision, row.row_hash, row.created_at, row.updated_at)
+                for entry_id, row, password in zip(ids, adopted, sealed)
+            ],
+        )
+        # Les jetons de préfixe dérivent des noms et de la clé, communs aux deux copies.
+        with source.read() as source_conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {PREFIX_TABLE_NAME} (token, entry_id) VALUES (?, ?)",
+                [
+                    (token, entry_id)
+                    for entry_id, row in zip(ids, adopted)
+                    for token, in source_conn.execute(
+                        f"SELECT token FROM {PREFIX_TABLE_NAME} WHERE entry_id = ?", (row.id,)
+                    )
+                ],
+            )
+
+
+def sync_vaults(local: Database, remote: Database) -> SyncReport:
+    """Synchronise deux copies d'un même coffre, dans les deux sens.
+
+    Les différences sont trouvées en descendant les arbres de Merkle des deux bases,
+    sans déchiffrer les lignes inchangées. Chaque coffre garde, par pair, l'empreinte
+    de chaque entrée après la dernière synchronisation : c'est l'ancêtre commun de la
+    fusion à trois voies. Sans ancêtre valide (première synchronisation, ou précédente
+    interrompue entre les deux écritures), la fusion est une union.
+    """
+    if not hmac.compare_digest(local.key, remote.key):
+        raise ValueError(
+            "Les deux coffres n'ont pas la même clé de données : seules des copies "
+            "d'un même coffre peuvent être synchronisées."
+        )
+    if local.path.resolve() == remote.path.resolve():
+        raise ValueError("Un coffre ne peut pas être synchronisé avec lui-même.")
+
+    try:
+        with local.transaction() as local_conn, remote.transaction() as remote_conn:
+            local_id, remote_id = _vault_id(local_conn), _vault_id(remote_conn)
+            if local_id == remote_id:
+                # Copie de fichier : la copie distante reçoit sa propre identité.
+                remote_id = os.urandom(len(remote_id))
+                remote_conn.execute(
+                    f"UPDATE {VAULT_INFO_TABLE_NAME} SET value = ? WHERE name = 'vault_id'",
+                    (remote_id,),
+                )
+            token = _peer_token(local_conn, remote_id)
+            has_base = token is not None and token == _peer_token(remote_conn, local_id)
+
+            leaves = differing_leaves(local_conn, remote_conn)
+            local_rows = _leaf_rows(local_conn, leaves)
+            remote_rows = _leaf_rows(remote_conn, leaves)
+            local_hashes = {row.row_hash for row in local_rows}
+            remote_hashes = {row.row_hash for row in remote_rows}
+            local_changed = {row.key: row for row in local_rows if row.row_hash not in remote_hashes}
+            remote_changed = {row.key: row for row in remote_rows if row.row_hash not in local_hashes}
+            keys = sorted(local_changed.keys() | remote_changed.keys())
+            base = _load_base(local_conn, remote_id, keys) if has_base else {}
+
+            pulled: list[SyncRow] = []
+            pushed: list[SyncRow] = []
+            local_deleted: list[SyncRow] = []
+            remote_deleted: list[SyncRow] = []
+            conflicts: list[tuple[SyncRow, str]] = []
+            merged: dict[bytes, int | None] = {}
+            for key in keys:
+                local_row, remote_row = local_changed.get(key), remote_changed.get(key)
+                kept, conflict = _resolve(local_row, remote_row, base.get(key))
+                merged[key] = kept.row_hash if kept else None
+                if kept is None:
+                    (local_deleted if local_row else remote_deleted).append(local_row or remote_row)
+                elif kept is remote_row:
+                    pulled.append(remote_row)
+                else:
+                    pushed.append(local_row)
+                if conflict:
+                    conflicts.append((kept or local_row or remote_row, LOCAL if kept is local_row else REMOTE))
+
+            _apply(local, local_conn, remote, pulled, local_deleted)
+            _apply(remote, remote_conn, local, pushed, remote_deleted)
+            if tree_root(local_conn) != tree_root(remote_conn):
+                raise RuntimeError("La synchronisation n'a pas abouti au même état des deux côtés.")
+
+            token = os.urandom(_PEER_TOKEN_SIZE)
+            _store_base(local_conn, remote_id, token, merged if has_base else None)
+            _store_base(remote_conn, local_id, token, merged if has_base else None)
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Erreur lors de la synchronisation : {e}")
+
+    try:
+        names = local.cipher.decrypt_many(
+            [name for row, _ in conflicts for name in (row.application, row.userid)],
+            [index for row, _ in conflicts for index in (row.application_index, row.userid_index)],
+        )
+    except Exception as e:
+        raise RuntimeError(f"Erreur de déchiffrement : {e}")
+    return SyncReport(
+        pulled=len(pulled) + len(local_deleted),
+        pushed=len(pushed) + len(remote_deleted),
+        conflicts=[
+            SyncConflict(names[2 * position], names[2 * position + 1], kept)
+            for position, (_, kept) in enumerate(conflicts)
+        ],
+        compared=len(local_rows) + len(remote_rows),
+        first_sync=not has_base,
+    )
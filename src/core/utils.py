@@ -1,34 +1,8 @@
-import re
-
-_COMMON_PASSWORDS = frozenset({
-    "123456", "password", "123456789", "12345", "qwerty", "abc123",
-    "password1", "111111", "1234567", "iloveyou", "admin", "letmein",
-    "welcome", "monkey", "master", "dragon", "login", "princess",
-    "football", "shadow", "sunshine", "trustno1", "azerty", "000000",
-})
+from src.core.strength import estimate_strength
 
 
 def evaluate_password_strength(password: str) -> int:
-    if password in _COMMON_PASSWORDS:
-        return 0
-
-    score = 0
-
-    if len(password) >= 12:
-        score += 1
-    if len(password) >= 16:
-        score += 1
-
-    if re.search(r"[A-Z]", password):
-        score += 1
-    if re.search(r"[a-z]", password):
-        score += 1
-    if re.search(r"\d", password):
-        score += 1
-    if re.search(r"[!@#$%^&*()\-_=+\[\]{};:'\",.<>?/\\|`~]", password):
-        score += 1
-
-    return min(score, 5)
+    return estimate_strength(password).score
 
 
 def get_strength_label(score: int) -> str:
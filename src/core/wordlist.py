@@ -0,0 +1,102 @@
+WORDS = (
+    "abeille", "abime", "abricot", "acacia", "accord", "acier", "actif", "adresse",
+    "affiche", "agate", "agneau", "aigle", "aiguille", "aile", "aimant", "airelle", "album",
+    "alcove", "alerte", "algue", "allee", "allure", "alouette", "alpage", "amande",
+    "ambition", "ambre", "ami", "amiral", "ananas", "ancre", "anemone", "ange", "angle",
+    "animal", "anneau", "antenne", "apogee", "appel", "aquarium", "araignee", "arbre",
+    "arc", "arcade", "arche", "ardoise", "arene", "argent", "argile", "armure", "arome",
+    "arrosoir", "artichaut", "asperge", "astre", "atelier", "atlas", "atome", "aube",
+    "auberge", "aurore", "autel", "automne", "avenir", "aventure", "averse", "avion",
+    "avoine", "azur", "badge", "badiane", "bagage", "baguette", "baie", "balade", "balcon",
+    "baleine", "balise", "ballon", "bambou", "banane", "banc", "bandeau", "banjo",
+    "banquise", "baobab", "barque", "barrage", "basalte", "bassin", "bastion", "bateau",
+    "baton", "baume", "bazar", "bazooka", "belette", "berceau", "bergamote", "beton",
+    "betterave", "beurre", "biche", "bijou", "bille", "biscuit", "bison", "bivouac",
+    "blaireau", "blason", "bleu", "bleuet", "bobine", "bocage", "bocal", "bois", "boisson",
+    "bolide", "bonbon", "bonnet", "bordure", "bosquet", "botte", "bouclier", "bougie",
+    "boulon", "bourgeon", "boussole", "bouteille", "bouton", "bracelet", "brebis",
+    "brindille", "brioche", "brise", "brochet", "brouette", "brume", "buisson", "bulle",
+    "bureau", "butte", "cabane", "cabine", "cacao", "cachet", "cactus", "cadeau", "cadran",
+    "cafe", "cahier", "caille", "caillou", "calepin", "calme", "camelia", "camion",
+    "campagne", "canal", "canard", "canif", "cannelle", "canoe", "canot", "canyon",
+    "capitaine", "capuche", "carafe", "caramel", "caravane", "cargo", "carnet", "carotte",
+    "carrousel", "cartable", "carton", "cascade", "caserne", "casque", "castagnette",
+    "castor", "cedre", "cellule", "cerceau", "cerf", "cerise", "chaise", "chalet",
+    "chaloupe", "chameau", "chamois", "champ", "chandelle", "chanson", "chapeau", "charbon",
+    "chardon", "chariot", "charrue", "chateau", "chaton", "chemin", "chene", "chenille",
+    "cheval", "chevre", "chiffre", "chimere", "chocolat", "chouette", "cidre", "ciel",
+    "cigale", "cime", "cinema", "citadelle", "citron", "citrouille", "clairiere", "clairon",
+    "clavier", "clementine", "cloche", "clou", "cobalt", "cocon", "cocotte", "coffre",
+    "colibri", "collier", "colline", "colombe", "comete", "compas", "comptoir", "concert",
+    "condor", "coquelicot", "corail", "corbeau", "corde", "cornemuse", "cornet", "costume",
+    "coton", "cotonnier", "couloir", "coupole", "courage", "courgette", "couronne",
+    "coussin", "crabe", "crapaud", "crayon", "creme", "crepe", "crevette", "criquet",
+    "cristal", "crochet", "crocus", "cube", "cuivre", "cumulus", "cyclone", "cygne",
+    "dahlia", "dauphin", "degre", "delta", "dentelle", "desert", "dessin", "diamant",
+    "digue", "dinde", "disque", "dolmen", "domino", "donjon", "dorade", "dragon", "drapeau",
+    "dune", "echarpe", "echelle", "eclair", "ecluse", "ecorce", "ecran", "ecureuil",
+    "edelweiss", "eglantine", "eglise", "elan", "email", "embrun", "emeraude", "enclume",
+    "encre", "energie", "enigme", "epave", "epice", "epine", "erable", "escale", "escargot",
+    "espace", "esquif", "estuaire", "etable", "etang", "etincelle", "etoile", "etui",
+    "eventail", "fable", "facteur", "faisan", "falaise", "fanal", "fanfare", "farine",
+    "faucon", "fauteuil", "fenetre", "ferme", "feuille", "feutre", "fiacre", "ficelle",
+    "figue", "filet", "flamant", "flamme", "flanelle", "fleuve", "flocon", "flute",
+    "fontaine", "foret", "forge", "fossile", "fougere", "fourmi", "fourneau", "fraise",
+    "framboise", "frelon", "fresque", "fromage", "fruit", "fuchsia", "fusee", "gabarit",
+    "galet", "galion", "gamme", "garage", "garenne", "gateau", "gaufre", "gazelle", "gazon",
+    "geant", "genet", "gentiane", "geyser", "gilet", "girafe", "girouette", "glace",
+    "glaieul", "gland", "globe", "glycine", "gobelet", "goeland", "golfe", "gondole",
+    "gorille", "gousse", "goutte", "grain", "granit", "granule", "grappe", "gravure",
+    "grenier", "grenouille", "griffe", "grillon", "grotte", "guepard", "guirlande",
+    "guitare", "hache", "hamac", "hameau", "hangar", "haricot", "harmonie", "harpe",
+    "hautbois", "helice", "herbe", "heron", "hetre", "hibou", "hirondelle", "hiver",
+    "homard", "horloge", "houblon", "houx", "hublot", "hussard", "hysope", "iceberg",
+    "icone", "igloo", "ile", "image", "indigo", "insecte", "iris", "ivoire", "jacinthe",
+    "jade", "jaguar", "jardin", "jasmin", "javelot", "jeton", "jockey", "jongleur",
+    "jonquille", "jouet", "journal", "jungle", "jupe", "kayak", "kiosque", "kiwi", "koala",
+    "lac", "lagon", "lagune", "laine", "lama", "lamelle", "lampe", "landau", "lanterne",
+    "lapin", "lapis", "lasso", "latte", "laurier", "lavande", "legende", "lemurien",
+    "lentille", "levure", "lezard", "libellule", "licorne", "lierre", "lilas", "limace",
+    "limon", "lin", "linotte", "lion", "lisiere", "livre", "loquet", "loriot", "lotus",
+    "loutre", "luciole", "lueur", "lumiere", "lune", "lutin", "luxe", "lynx", "macaron",
+    "machine", "magie", "magnolia", "maillot", "maison", "majorque", "mammouth", "manchot",
+    "mandarine", "mandoline", "manege", "mangue", "manoir", "manteau", "marais", "marbre",
+    "marche", "marelle", "marguerite", "marin", "marmotte", "marteau", "mascotte", "masque",
+    "matelas", "matin", "mazurka", "meandre", "medaille", "melodie", "melon", "menthe",
+    "merle", "mesange", "meteo", "meteore", "meule", "micro", "miel", "mimosa", "minerai",
+    "mirabelle", "miroir", "mistral", "moka", "mollusque", "momie", "monocle", "montagne",
+    "morse", "mosaique", "mouette", "moulin", "mousse", "mouton", "muguet", "muraille",
+    "muscade", "musee", "mustang", "myrtille", "nacre", "narval", "navire", "nectar",
+    "neige", "nenuphar", "neon", "nid", "noisette", "nomade", "nougat", "noyer", "nuage",
+    "oasis", "obelisque", "ocean", "ocelot", "oeillet", "oiseau", "olive", "ombre",
+    "ombrelle", "onde", "opale", "orage", "orange", "orbite", "orchidee", "oreiller",
+    "orge", "orgue", "origami", "ortie", "ortolan", "otarie", "ours", "oursin", "outil",
+    "ouvrage", "pagaie", "pagode", "paille", "palette", "palmier", "palourde",
+    "pamplemousse", "panache", "panda", "panier", "panthere", "paon", "papaye", "papillon",
+    "paquet", "parasol", "parchemin", "parfum", "passage", "pastel", "pastille", "patin",
+    "pavot", "pelican", "pelouse", "pendule", "penombre", "perdrix", "pergola", "perle",
+    "perroquet", "peuplier", "phalene", "phare", "piano", "pieuvre", "pigeon", "pilote",
+    "pinceau", "pingouin", "pinson", "pirate", "piste", "pivoine", "placard", "plage",
+    "planete", "plateau", "plume", "poire", "poisson", "poivre", "polaire", "pollen",
+    "pomme", "pommier", "pont", "porcelaine", "portail", "porte", "potager", "potiron",
+    "poudre", "poulpe", "poussin", "prairie", "primevere", "prisme", "prune", "puits",
+    "puma", "pupitre", "pyramide", "quai", "quartz", "quetsche", "quille", "quinoa",
+    "racine", "radeau", "radis", "raisin", "rameau", "rampe", "raquette", "rayon", "recif",
+    "refuge", "renard", "renne", "requin", "rhubarbe", "rideau", "rivage", "riviere",
+    "robot", "rocher", "romarin", "roseau", "rossignol", "rouage", "roulotte", "rubis",
+    "ruche", "ruisseau", "sable", "sablier", "sabot", "safran", "saison", "salade",
+    "salamandre", "sanglier", "saphir", "sapin", "sarcelle", "sardine", "satin", "saule",
+    "sauterelle", "savane", "savon", "scarabee", "semaphore", "sentier", "sequoia",
+    "serpent", "sextant", "sifflet", "signal", "silex", "silo", "sirop", "sloop", "soja",
+    "soleil", "sommet", "sonnet", "sorbet", "soupape", "source", "spatule", "sphinx",
+    "spirale", "squelette", "statue", "steppe", "sucre", "sureau", "tableau", "tamarin",
+    "tambour", "tanche", "tandem", "tapir", "tapis", "tartine", "tatou", "taupe",
+    "telescope", "tempete", "temple", "termite", "terrasse", "theiere", "thym", "tigre",
+    "tilleul", "tipi", "tison", "toile", "tomate", "tonneau", "topaze", "tornade",
+    "torrent", "tortue", "toucan", "toundra", "toupie", "tour", "tourbillon", "train",
+    "traineau", "tramway", "trapeze", "trefle", "tremble", "tresor", "tribu", "trompette",
+    "truffe", "tuba", "tulipe", "tunique", "tunnel", "turquoise", "tuyau", "ukulele",
+    "vague", "vallee", "vanille", "vapeur", "varan", "velo", "velours", "vent", "ventail",
+    "verger", "vernis", "verveine", "vigie", "violon", "vipere", "vitrail", "voile",
+    "volcan", "voyage", "wagon", "wapiti", "yacht", "yaourt", "zebre", "zenith", "zephyr",
+)
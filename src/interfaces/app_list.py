@@ -0,0 +1,90 @@
+from bisect import bisect_left
+
+import wx
+
+from src.core.changes import ADDED, REMOVED, ApplicationChange
+
+
+class ApplicationListCtrl(wx.ListCtrl):
+
+    COUNT_COLUMN_WIDTH = 60
+
+    def __init__(self, parent, size=wx.DefaultSize):
+        super().__init__(
+            parent,
+            size=size,
+            style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_NO_HEADER,
+        )
+        self.InsertColumn(0, "Application")
+        self.InsertColumn(1, "Entrées", wx.LIST_FORMAT_RIGHT, self.COUNT_COLUMN_WIDTH)
+        self._items: list[str] = []
+        self._counts: dict[str, int] = {}
+        self.Bind(wx.EVT_SIZE, self.on_size)
+
+    def set_items(self, counts: dict[str, int]) -> None:
+        selected = self.get_selections()
+        self._clear_selection()
+        self._items = list(counts)
+        self._counts = dict(counts)
+        self.SetItemCount(len(self._items))
+        positions = {application: index for index, application in enumerate(self._items)}
+        for application in selected:
+            if application in positions:
+                self.Select(positions[application])
+        self.Refresh()
+
+    def apply_changes(self, changes: list[ApplicationChange]) -> None:
+        """Applique des changements à une liste triée par nom, sans la recharger."""
+        selected = self.get_selections()
+        self._clear_selection()
+        for change in changes:
+            index = bisect_left(self._items, change.application)
+            present = index < len(self._items) and self._items[index] == change.application
+            if change.kind == REMOVED:
+                if present:
+                    del self._items[index]
+                    self._counts.pop(change.application, None)
+            else:
+                if not present and change.kind == ADDED:
+                    self._items.insert(index, change.application)
+                if present or change.kind == ADDED:
+                    self._counts[change.application] = change.count
+
+        self.SetItemCount(len(self._items))
+        for application in selected:
+            if application in self._counts:
+                self.Select(bisect_left(self._items, application))
+        self.Refresh()
+
+    def _clear_selection(self) -> None:
+        index = self.GetFirstSelected()
+        while index != -1:
+            self.Select(index, False)
+            index = self.GetNextSelected(index)
+
+    def get_selection(self) -> str:
+        index = self.GetFirstSelected()
+        if index == -1 or index >= len(self._items):
+            return ""
+        return self._items[index]
+
+    def get_selections(self) -> list[str]:
+        selected = []
+        index = self.GetFirstSelected()
+        while index != -1:
+            if index < len(self._items):
+                selected.append(self._items[index])
+            index = self.GetNextSelected(index)
+        return selected
+
+    def OnGetItemText(self, item, column):
+        application = self._items[item]
+        if column == 1:
+            return str(self._counts.get(application, ""))
+        return application
+
+    def on_size(self, event):
+        width = self.GetClientSize().width
+        self.SetColumnWidth(0, max(width - self.COUNT_COLUMN_WIDTH, 0))
+        self.SetColumnWidth(1, self.COUNT_COLUMN_WIDTH)
+        event.Skip()
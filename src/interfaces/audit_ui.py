@@ -0,0 +1,56 @@
+import wx
+
+from src.core.audit import WEAK_SCORE, AuditReport
+from src.core.utils import get_strength_label
+
+
+class AuditReportFrame(wx.Dialog):
+
+    def __init__(self, parent, report: AuditReport):
+        super().__init__(parent, title="Audit du coffre", size=(560, 420))
+
+        panel = wx.Panel(self)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+
+        weak_ids = {finding.id for finding in report.weak}
+        reused_ids = {finding.id for group in report.reused for finding in group}
+        summary = wx.StaticText(
+            panel,
+            label=(
+                f"{len(report.findings)} entrées analysées — "
+                f"{len(weak_ids)} faibles, {len(reused_ids)} réutilisées "
+                f"({len(report.reused)} groupes)."
+            ),
+        )
+        summary.SetFont(
+            wx.Font(11, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+        )
+
+        self.results = wx.ListCtrl(panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.results.InsertColumn(0, "Application", width=160)
+        self.results.InsertColumn(1, "Utilisateur", width=140)
+        self.results.InsertColumn(2, "Problème", width=220)
+
+        flagged = sorted(
+            (finding for finding in report.findings
+             if finding.id in reused_ids or finding.id in weak_ids),
+            key=lambda finding: (finding.score, finding.application, finding.userid),
+        )
+        for finding in flagged:
+            problems = []
+            if finding.id in reused_ids:
+                problems.append("Réutilisé")
+            if finding.score <= WEAK_SCORE:
+                problems.append(get_strength_label(finding.score))
+            index = self.results.InsertItem(self.results.GetItemCount(), finding.application)
+            self.results.SetItem(index, 1, finding.userid)
+            self.results.SetItem(index, 2, " — ".join(problems))
+
+        vbox.Add(summary, flag=wx.EXPAND | wx.ALL, border=15)
+        vbox.Add(self.results, proportion=1, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=15)
+
+        close_btn = wx.Button(panel, id=wx.ID_CLOSE, label="Fermer")
+        close_btn.Bind(wx.EVT_BUTTON, lambda e: self.EndModal(wx.ID_CLOSE))
+        vbox.Add(close_btn, flag=wx.ALIGN_CENTER | wx.ALL, border=10)
+
+        panel.SetSizer(vbox)
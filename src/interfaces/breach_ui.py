@@ -0,0 +1,41 @@
+import wx
+
+from src.core.breach import BreachReport
+
+
+class BreachReportFrame(wx.Dialog):
+
+    def __init__(self, parent, report: BreachReport):
+        super().__init__(parent, title="Recherche de fuites", size=(500, 380))
+
+        panel = wx.Panel(self)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+
+        summary = wx.StaticText(
+            panel,
+            label=(
+                f"{report.scanned} entrées analysées — "
+                f"{len(report.findings)} mots de passe présents dans une fuite connue."
+            ),
+        )
+        summary.SetFont(
+            wx.Font(11, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+        )
+
+        self.results = wx.ListCtrl(panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.results.InsertColumn(0, "Application", width=220)
+        self.results.InsertColumn(1, "Utilisateur", width=220)
+
+        findings = sorted(report.findings, key=lambda item: (item.application, item.userid))
+        for finding in findings:
+            index = self.results.InsertItem(self.results.GetItemCount(), finding.application)
+            self.results.SetItem(index, 1, finding.userid)
+
+        vbox.Add(summary, flag=wx.EXPAND | wx.ALL, border=15)
+        vbox.Add(self.results, proportion=1, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=15)
+
+        close_btn = wx.Button(panel, id=wx.ID_CLOSE, label="Fermer")
+        close_btn.Bind(wx.EVT_BUTTON, lambda e: self.EndModal(wx.ID_CLOSE))
+        vbox.Add(close_btn, flag=wx.ALIGN_CENTER | wx.ALL, border=10)
+
+        panel.SetSizer(vbox)
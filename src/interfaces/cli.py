@@ -0,0 +1,429 @@
+import argparse
+import sys
+from getpass import getpass
+
+
+def _error(message: str) -> int:
+    print(f"Erreur : {message}", file=sys.stderr)
+    return 1
+
+
+def _open_database():
+    from src.core.crypto import derive_key, is_first_run, verify_master_password
+    from src.core.storage import Database
+
+    if is_first_run():
+        raise RuntimeError("Aucun coffre initialisé. Lancez d'abord l'application graphique.")
+
+    key = derive_key(getpass("Mot de passe maître : "))
+    if not verify_master_password(key):
+        raise ValueError("Mot de passe invalide.")
+    return Database(key)
+
+
+def _agent_request(op: str, **params):
+    from src.core.agent_client import AgentUnavailable, agent_request
+
+    try:
+        return agent_request(op, **params)
+    except AgentUnavailable:
+        return None
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    applications = _agent_request("search", query=args.query) if args.query else _agent_request("list")
+    if applications is None:
+        db = _open_database()
+        try:
+            applications = db.search_applications(args.query) if args.query else db.get_applications()
+        finally:
+            db.close()
+    for application in applications:
+        print(application)
+    return 0
+
+
+def cmd_get(args: argparse.Namespace) -> int:
+    credentials = _agent_request("get", application=args.application, user=args.user)
+    if credentials is None:
+        from src.core.entry import wipe_entries
+
+        db = _open_database()
+        try:
+            entries = [
+                entry for entry in db.get_info(args.application)
+                if args.user is None or entry.userid == args.user
+            ]
+            db.decrypt_entries(entries)
+            credentials = [{"userid": entry.userid, "password": entry.password} for entry in entries]
+            wipe_entries(entries)
+        finally:
+            db.close()
+
+    if not credentials:
+        return _error(f"Aucune entrée trouvée pour '{args.application}'.")
+    for item in credentials:
+        print(item["password"] if args.password_only else f"{item['userid']}\t{item['password']}")
+    return 0
+
+
+def cmd_add(args: argparse.Namespace) -> int:
+    if args.generate:
+        from src.core.password_generator import generate_password
+
+        password = generate_password(args.length)
+    else:
+        password = getpass("Mot de passe de l'entrée : ")
+        if password != getpass("Confirmer : "):
+            return _error("Les mots de passe ne correspondent pas.")
+    if not password:
+        return _error("Le mot de passe ne peut pas être vide.")
+
+    db = _open_database()
+    try:
+        db.insert(args.application, args.userid, password)
+    finally:
+        db.close()
+    if args.generate:
+        print(password)
+    return 0
+
+
+def cmd_gen(args: argparse.Namespace) -> int:
+    from src.core.password_generator import generate_passphrases, generate_passwords
+
+    if args.passphrase:
+        passwords = generate_passphrases(args.count, args.words)
+    else:
+        passwords = generate_passwords(
+            args.count,
+            args.length,
+            include_uppercase=not args.no_uppercase,
+            include_digits=not args.no_digits,
+            include_symbols=not args.no_symbols,
+        )
+    sys.stdout.write("\n".join(passwords) + "\n")
+    return 0
+
+
+def cmd_audit(args: argparse.Namespace) -> int:
+    from src.core.audit import run_audit
+    from src.core.utils import get_strength_label
+
+    db = _open_database()
+    try:
+        report = run_audit(db)
+    finally:
+        db.close()
+
+    reused_ids = {finding.id for group in report.reused for finding in group}
+    weak_ids = {finding.id for finding in report.weak}
+    print(
+        f"{len(report.findings)} entrées analysées ({report.recomputed} recalculées) — "
+        f"{len(weak_ids)} faibles, {len(reused_ids)} réutilisées."
+    )
+    for finding in report.findings:
+        if finding.id in weak_ids or finding.id in reused_ids:
+            problems = [get_strength_label(finding.score)] if finding.id in weak_ids else []
+            if finding.id in reused_ids:
+                problems.append("Réutilisé")
+            print(f"{finding.application}\t{finding.userid}\t{' — '.join(problems)}")
+    return 1 if weak_ids or reused_ids else 0
+
+
+def _open_breach_corpus(args: argparse.Namespace):
+    from src.core.breach import BreachCorpus, get_breach_corpus
+
+    corpus = BreachCorpus(args.corpus) if args.corpus else get_breach_corpus()
+    if corpus is None:
+        raise ValueError("Aucun fichier de fuites : utilisez --corpus ou BREACH_CORPUS.")
+    return corpus
+
+
+def cmd_breach(args: argparse.Namespace) -> int:
+    if args.action == "build":
+        from src.core.breach import build_corpus
+
+        count = build_corpus(args.source, args.target, prefix_size=args.prefix_size)
+        print(f"{count} empreintes écrites dans {args.target}.")
+        return 0
+
+    corpus = _open_breach_corpus(args)
+    if args.action == "check":
+        if corpus.contains_password(getpass("Mot de passe à vérifier : ")):
+            print("Ce mot de passe figure dans une fuite de données connue.")
+            return 1
+        print("Absent des fuites de données connues.")
+        return 0
+
+    from src.core.breach import scan_vault
+
+    db = _open_database()
+    try:
+        report = scan_vault(db, corpus)
+    finally:
+        db.close()
+    print(
+        f"{report.scanned} entrées analysées — "
+        f"{len(report.findings)} mots de passe présents dans une fuite connue."
+    )
+    for finding in report.findings:
+        print(f"{finding.application}\t{finding.userid}")
+    return 1 if report.findings else 0
+
+
+def cmd_rotate(args: argparse.Namespace) -> int:
+    from src.core.config import get_config
+    from src.core.rotation import DAY, RotationScheduler, get_candidates, propose_replacements
+
+    days = args.days if args.days is not None else get_config().rotation_days
+    if days <= 0:
+        return _error(
+            "L'âge maximal doit être d'au moins un jour (ROTATION_DAYS = 0 désactive la rotation)."
+        )
+
+    proposals = []
+    db = _open_database()
+    try:
+        candidates = get_candidates(db, RotationScheduler(db, days * DAY).check().due)
+        if args.apply and candidates:
+            proposals = propose_replacements(candidates, args.length)
+            db.update_many(proposals)
+    finally:
+        db.close()
+
+    print(f"{len(candidates)} mots de passe inchangés depuis plus de {days} jours.")
+    if args.apply:
+        for candidate, (_, password) in zip(candidates, proposals):
+            print(f"{candidate.application}\t{candidate.userid}\t{password}")
+        return 0
+    for candidate in candidates:
+        print(f"{candidate.application}\t{candidate.userid}\t{candidate.age_days()} jours")
+    return 1 if candidates else 0
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+    from pathlib import Path
+
+    from src.core.crypto import derive_key
+    from src.core.storage import Database
+    from src.core.sync import LOCAL, sync_vaults
+
+    other_path = Path(args.other)
+    if not other_path.is_file():
+        return _error(f"Coffre introuvable : {other_path}")
+
+    db = _open_database()
+    try:
+        other_password = getpass("Mot de passe maître de l'autre coffre (vide : le même) : ")
+        other = Database(derive_key(other_password) if other_password else db.master_key, other_path)
+        try:
+            report = sync_vaults(db, other)
+        finally:
+            other.close()
+    finally:
+        db.close()
+
+    print(
+        f"{report.pulled} entrées reçues, {report.pushed} envoyées"
+        + (" (première synchronisation : union des deux coffres)." if report.first_sync else ".")
+    )
+    for conflict in report.conflicts:
+        kept = "ce coffre" if conflict.kept == LOCAL else "l'autre coffre"
+        print(f"Conflit\t{conflict.application}\t{conflict.userid}\tversion de {kept} conservée")
+    return 0
+
+
+def cmd_passwd(args: argparse.Namespace) -> int:
+    db = _open_database()
+    try:
+        current = getpass("Confirmer le mot de passe maître actuel : ")
+        new = getpass("Nouveau mot de passe maître : ")
+        if new != getpass("Confirmer : "):
+            return _error("Les mots de passe ne correspondent pas.")
+        db.change_master_password(current, new)
+    finally:
+        db.close()
+    print("Mot de passe maître modifié.")
+    return 0
+
+
+def cmd_backup(args: argparse.Namespace) -> int:
+    from src.core.backup import create_backup
+
+    db = _open_database()
+    try:
+        header = create_backup(db.master_key, args.archive, base_path=args.base, db_path=db.path)
+    finally:
+        db.close()
+    kind = "incrémentale" if header.kind == "incremental" else "complète"
+    print(f"Sauvegarde {kind} écrite dans {args.archive} ({header.page_count} pages).")
+    return 0
+
+
+def cmd_restore(args: argparse.Namespace) -> int:
+    from src.core.backup import restore_backup
+    from src.core.crypto import is_first_run
+
+    if not is_first_run() and not args.force:
+        return _error("Un coffre existe déjà : relancez avec --force pour le remplacer.")
+    header = restore_backup(args.archives, getpass("Mot de passe maître de la sauvegarde : "))
+    print(f"Coffre restauré ({header.created}).")
+    return 0
+
+
+def cmd_agent(args: argparse.Namespace) -> int:
+    from src.core.agent_client import AgentUnavailable, agent_request
+
+    if args.action == "start":
+        from src.core.agent import run_agent
+
+        db = _open_database()
+        key = db.master_key
+        db.close()
+        print("Agent démarré (Ctrl+C pour l'arrêter).", file=sys.stderr)
+        run_agent(key, idle_timeout=args.timeout)
+        return 0
+
+    try:
+        if args.action == "stop":
+            agent_request("lock")
+            print("Agent arrêté.")
+        else:
+            status = agent_request("ping")
+            print(f"Agent actif (pid {status['pid']}, inactivité max. {status['idle_timeout']} s).")
+    except AgentUnavailable:
+        print("Aucun agent actif.")
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="keypass", description="Gestionnaire de mots de passe local.")
+    parser.add_argument(
+        "--metrics", metavar="FICHIER",
+        help="Écrire les métriques (Prometheus, ou JSON si .json) à la sortie",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="Lister ou rechercher les applications")
+    list_parser.add_argument("query", nargs="?", default="", help="Filtre de recherche")
+    list_parser.set_defaults(handler=cmd_list)
+
+    get_parser = subparsers.add_parser("get", help="Afficher les identifiants d'une application")
+    get_parser.add_argument("application")
+    get_parser.add_argument("-u", "--user", help="Restreindre à un utilisateur")
+    get_parser.add_argument(
+        "-p", "--password-only", action="store_true", help="N'afficher que le mot de passe"
+    )
+    get_parser.set_defaults(handler=cmd_get)
+
+    add_parser = subparsers.add_parser("add", help="Ajouter ou mettre à jour une entrée")
+    add_parser.add_argument("application")
+    add_parser.add_argument("userid")
+    add_parser.add_argument("-g", "--generate", action="store_true", help="Générer le mot de passe")
+    add_parser.add_argument("-l", "--length", type=int, default=16, help="Longueur générée")
+    add_parser.set_defaults(handler=cmd_add)
+
+    gen_parser = subparsers.add_parser("gen", help="Générer des mots de passe")
+    gen_parser.add_argument("-n", "--count", type=int, default=1)
+    gen_parser.add_argument("-l", "--length", type=int, default=16)
+    gen_parser.add_argument("--no-uppercase", action="store_true")
+    gen_parser.add_argument("--no-digits", action="store_true")
+    gen_parser.add_argument("--no-symbols", action="store_true")
+    gen_parser.add_argument("--passphrase", action="store_true", help="Générer des phrases de passe")
+    gen_parser.add_argument("-w", "--words", type=int, default=6, help="Mots par phrase de passe")
+    gen_parser.set_defaults(handler=cmd_gen)
+
+    audit_parser = subparsers.add_parser("audit", help="Auditer tout le coffre")
+    audit_parser.set_defaults(handler=cmd_audit)
+
+    breach_parser = subparsers.add_parser(
+        "breach", help="Comparer les mots de passe à un fichier de fuites hors ligne"
+    )
+    breach_actions = breach_parser.add_subparsers(dest="action", required=True)
+    for action, help_text in (
+        ("scan", "Rechercher les mots de passe du coffre présents dans une fuite"),
+        ("check", "Vérifier un mot de passe saisi"),
+    ):
+        action_parser = breach_actions.add_parser(action, help=help_text)
+        action_parser.add_argument(
+            "-c", "--corpus", help="Fichier de fuites (.kphb), à défaut BREACH_CORPUS"
+        )
+    corpus_parser = breach_actions.add_parser(
+        "build", help="Compiler un export Have I Been Pwned (SHA-1 trié par empreinte)"
+    )
+    corpus_parser.add_argument("source", help="Export texte « SHA1:occurrences »")
+    corpus_parser.add_argument("target", help="Fichier de fuites à écrire (.kphb)")
+    corpus_parser.add_argument(
+        "--prefix-size", type=int, default=10, help="Octets conservés par empreinte (6 à 20)"
+    )
+    breach_parser.set_defaults(handler=cmd_breach)
+
+    agent_parser = subparsers.add_parser("agent", help="Gérer l'agent de déverrouillage")
+    agent_parser.add_argument("action", choices=("start", "stop", "status"))
+    agent_parser.add_argument(
+        "-t", "--timeout", type=int, default=None,
+        help="Verrouiller après ce nombre de secondes d'inactivité (0 : jamais)",
+    )
+    agent_parser.set_defaults(handler=cmd_agent)
+
+    rotate_parser = subparsers.add_parser(
+        "rotate", help="Lister ou renouveler les mots de passe les plus anciens"
+    )
+    rotate_parser.add_argument(
+        "-d", "--days", type=int, default=None, help="Âge maximal (jours), à défaut ROTATION_DAYS"
+    )
+    rotate_parser.add_argument(
+        "--apply", action="store_true", help="Les remplacer par des mots de passe générés"
+    )
+    rotate_parser.add_argument("-l", "--length", type=int, default=20, help="Longueur générée")
+    rotate_parser.set_defaults(handler=cmd_rotate)
+
+    sync_parser = subparsers.add_parser(
+        "sync", help="Synchroniser avec une copie du coffre (autre poste, clé USB…)"
+    )
+    sync_parser.add_argument("other", help="Fichier de base de données de l'autre copie")
+    sync_parser.set_defaults(handler=cmd_sync)
+
+    passwd_parser = subparsers.add_parser("passwd", help="Changer le mot de passe maître")
+    passwd_parser.set_defaults(handler=cmd_passwd)
+
+    backup_parser = subparsers.add_parser("backup", help="Sauvegarder le coffre (archive chiffrée)")
+    backup_parser.add_argument("archive", help="Fichier de sauvegarde (.kpbak)")
+    backup_parser.add_argument(
+        "-b", "--base", help="Sauvegarde précédente : n'écrire que les pages modifiées depuis"
+    )
+    backup_parser.set_defaults(handler=cmd_backup)
+
+    restore_parser = subparsers.add_parser("restore", help="Restaurer le coffre depuis des sauvegardes")
+    restore_parser.add_argument(
+        "archives", nargs="+", help="Sauvegarde complète suivie des sauvegardes incrémentales"
+    )
+    restore_parser.add_argument("--force", action="store_true", help="Remplacer le coffre existant")
+    restore_parser.set_defaults(handler=cmd_restore)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        if args.metrics:
+            from src.core.metrics import enable
+
+            enable(args.metrics)
+        else:
+            from src.core.metrics import enable_from_config
+
+            enable_from_config()
+        return args.handler(args)
+    except (ValueError, RuntimeError) as e:
+        return _error(str(e))
+    except EOFError:
+        # Entrée standard fermée ou redirigée : aucune saisie (mot de passe) possible.
+        return _error(
+            "Saisie interrompue : l'entrée standard est fermée ou n'est pas un terminal."
+        )
+    except KeyboardInterrupt:
+        return 130
@@ -1,17 +1,43 @@
 import wx
 import sys
 import os
+import threading
+import time
 from pathlib import Path
 
+from src.core.audit import run_audit, shutdown_pool
+from src.core.backup import ARCHIVE_SUFFIX, create_backup
+from src.core.breach import get_breach_corpus, scan_vault
+from src.core.changes import ApplicationChange
+from src.core.config import get_config
 from src.core.crypto import (
     derive_key,
     is_first_run,
     store_master_verification,
     verify_master_password,
 )
+from src.core.entry import Entry, wipe_entries
+from src.core.importer import import_file
+from src.core.metrics import is_enabled as metrics_enabled
+from src.core.password_generator import generate_passwords
+from src.core.rotation import (
+    DAY,
+    RotationScheduler,
+    RotationUpdate,
+    get_candidates,
+    propose_replacements,
+)
 from src.core.storage import Database
+from src.core.strength import get_matcher
+from src.core.sync import LOCAL, sync_vaults
+from src.core.utils import evaluate_password_strength
+from src.interfaces.app_list import ApplicationListCtrl
+from src.interfaces.audit_ui import AuditReportFrame
+from src.interfaces.breach_ui import BreachReportFrame
+from src.interfaces.metrics_ui import MetricsFrame
 from src.interfaces.password_generator_ui import PasswordGeneratorFrame
 from src.interfaces.security_checker_ui import SecurityCheckerFrame
+from src.interfaces.tasks import Task, TaskExecutor
 
 
 def resource_path(relative_path: str) -> str:
@@ -24,7 +50,7 @@ def resource_path(relative_path: str) -> str:
 
 class LoginFrame(wx.Frame):
     def __init__(self):
-        super().__init__(None, title="Connexion sécurisée", size=(350, 200))
+        super().__init__(None, title="Connexion sécurisée", size=(350, 250))
         panel = wx.Panel(self)
         vbox = wx.BoxSizer(wx.VERTICAL)
 
@@ -35,9 +61,21 @@ class LoginFrame(wx.Frame):
         self.login_button = wx.Button(panel, label="Connexion")
         self.login_button.Bind(wx.EVT_BUTTON, self.on_login)
 
+        self.cancel_button = wx.Button(panel, label="Annuler")
+        self.cancel_button.Bind(wx.EVT_BUTTON, self.on_cancel)
+        self.cancel_button.Hide()
+
+        self.progress_gauge = wx.Gauge(panel, range=100, size=(-1, 12))
+        self.progress_gauge.Hide()
+        self.progress_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, lambda e: self.progress_gauge.Pulse(), self.progress_timer)
+
         self.error_text = wx.StaticText(panel, label="", style=wx.ALIGN_CENTER)
         self.error_text.SetForegroundColour(wx.RED)
 
+        self._cancel_event: threading.Event | None = None
+        self.tasks = TaskExecutor(self, max_workers=1)
+
         if is_first_run():
             info = wx.StaticText(
                 panel,
@@ -50,11 +88,27 @@ class LoginFrame(wx.Frame):
         vbox.Add(self.password_label, flag=wx.ALL, border=10)
         vbox.Add(self.password_input, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
         vbox.Add(self.login_button, flag=wx.ALIGN_CENTER | wx.ALL, border=10)
+        vbox.Add(self.progress_gauge, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
+        vbox.Add(self.cancel_button, flag=wx.ALIGN_CENTER | wx.ALL, border=5)
         vbox.Add(self.error_text, flag=wx.ALIGN_CENTER | wx.ALL, border=5)
 
         panel.SetSizer(vbox)
+        self.panel = panel
         self.Centre()
 
+    def _set_busy(self, busy: bool) -> None:
+        self.password_input.Enable(not busy)
+        self.login_button.Enable(not busy)
+        self.progress_gauge.Show(busy)
+        self.cancel_button.Show(busy)
+        if busy:
+            self.error_text.SetLabel("")
+            self.progress_timer.Start(100)
+        else:
+            self.progress_timer.Stop()
+            self.progress_gauge.SetValue(0)
+        self.panel.Layout()
+
     def on_login(self, event):
         password = self.password_input.GetValue().strip()
 
@@ -62,8 +116,38 @@ class LoginFrame(wx.Frame):
             self.error_text.SetLabel("Veuillez entrer un mot de passe.")
             return
 
+        self._cancel_event = threading.Event()
+        self._set_busy(True)
+        threading.Thread(
+            target=self._derive_in_background,
+            args=(password, self._cancel_event),
+            daemon=True,
+        ).start()
+
+    def on_cancel(self, event):
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self._cancel_event = None
+        self._set_busy(False)
+        self.error_text.SetLabel("Connexion annulée.")
+
+    def _derive_in_background(self, password: str, cancel_event: threading.Event) -> None:
         try:
-            key = derive_key(password)
+            key, error = derive_key(password), None
+        except Exception as e:
+            key, error = None, e
+        if not cancel_event.is_set():
+            wx.CallAfter(self._on_key_derived, key, error, cancel_event)
+
+    def _on_key_derived(self, key: bytes | None, error: Exception | None, cancel_event: threading.Event):
+        if not self or cancel_event.is_set():
+            return
+        self._cancel_event = None
+        self._set_busy(False)
+
+        try:
+            if error is not None:
+                raise error
 
             if is_first_run():
                 store_master_verification(key)
@@ -72,26 +156,82 @@ class LoginFrame(wx.Frame):
                 self.password_input.SetValue("")
                 return
 
+            self._open_database(key)
+
+        except Exception as e:
+            self._show_open_error(e)
+
+    def _open_database(self, key: bytes) -> None:
+        # Le premier déverrouillage après la mise à niveau rechiffre toutes les entrées :
+        # hors du thread graphique, avec une progression dès que le rechiffrement commence.
+        self._set_busy(True)
+        self.cancel_button.Hide()
+        progress_dialog: wx.ProgressDialog | None = None
+
+        def update_progress(done: int, total: int) -> None:
+            nonlocal progress_dialog
+            if progress_dialog is None:
+                progress_dialog = wx.ProgressDialog(
+                    "Mise à niveau du coffre",
+                    "Rechiffrement des entrées avec la clé de données…",
+                    maximum=1000,
+                    parent=self,
+                    style=(
+                        wx.PD_APP_MODAL | wx.PD_AUTO_HIDE
+                        | wx.PD_ELAPSED_TIME | wx.PD_REMAINING_TIME
+                    ),
+                )
+            progress_dialog.Update(min(done * 1000 // max(total, 1), 999))
+
+        def finish() -> None:
+            if progress_dialog is not None:
+                progress_dialog.Destroy()
+            self._set_busy(False)
+
+        def on_success(db: Database) -> None:
+            finish()
+            try:
+                main_frame = MainFrame(None, db)
+            except Exception as e:
+                self._show_open_error(e)
+                return
+            self.tasks.shutdown()
             self.Hide()
-            db = Database(key)
-            main_frame = MainFrame(None, db)
             main_frame.Show()
 
-        except Exception as e:
-            wx.MessageBox(
-                f"Erreur : {e}",
-                "Erreur lors de la connexion",
-                wx.OK | wx.ICON_ERROR,
-            )
-            self.error_text.SetLabel("Erreur de clé ou accès à la base.")
-            self.password_input.SetValue("")
+        def on_error(error: Exception) -> None:
+            finish()
+            self._show_open_error(error)
+
+        self.tasks.submit(
+            lambda task: Database(key, progress=task.report),
+            key="open_database",
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=update_progress,
+        )
+
+    def _show_open_error(self, error: Exception) -> None:
+        wx.MessageBox(
+            f"Erreur : {error}",
+            "Erreur lors de la connexion",
+            wx.OK | wx.ICON_ERROR,
+        )
+        self.error_text.SetLabel("Erreur de clé ou accès à la base.")
+        self.password_input.SetValue("")
 
 
 class MainFrame(wx.Frame):
 
+    SEARCH_DELAY_MS = 150
+    GENERATED_LENGTH = 20
+    ROTATION_CHECK_MAX_DELAY = 6 * 3600
+
     def __init__(self, parent, db: Database):
-        super().__init__(parent, title="Gestionnaire de mots de passe", size=(600, 500))
+        super().__init__(parent, title="Gestionnaire de mots de passe", size=(600, 660))
         self.db = db
+        self.tasks = TaskExecutor(self)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
 
         try:
             self.SetIcon(wx.Icon(resource_path("logo.ico")))
@@ -101,18 +241,57 @@ class MainFrame(wx.Frame):
         panel = wx.Panel(self)
         vbox = wx.BoxSizer(wx.VERTICAL)
 
-        self.app_list = wx.ListBox(panel, size=(500, 200))
+        self.search_input = wx.SearchCtrl(panel, style=wx.TE_PROCESS_ENTER)
+        self.search_input.SetDescriptiveText("Rechercher une application ou un utilisateur")
+        self.search_input.ShowCancelButton(True)
+        self.search_input.Bind(wx.EVT_TEXT, self.on_search)
+        self.search_input.Bind(wx.EVT_SEARCHCTRL_CANCEL_BTN, lambda e: self.search_input.SetValue(""))
+        self._search_call: wx.CallLater | None = None
+
+        self.app_list = ApplicationListCtrl(panel, size=(500, 200))
+        self._changes_since_load: list[ApplicationChange] | None = None
+        self._unsubscribe = self.db.subscribe(
+            lambda changes: wx.CallAfter(self._on_applications_changed, changes)
+        )
         self.load_apps()
 
+        # Échéances de rotation : vérifiées au démarrage, puis à la prochaine échéance
+        # connue du planificateur (ou après une modification des mots de passe).
+        rotation_days = get_config().rotation_days
+        self.rotation = (
+            RotationScheduler(self.db, rotation_days * DAY) if rotation_days > 0 else None
+        )
+        self._overdue: set[int] = set()
+        self._rotation_call: wx.CallLater | None = None
+        self.rotation_status = wx.StaticText(panel, label="")
+        self._check_rotations()
+        # Le dictionnaire intégré est compilé au premier lancement (quelques secondes) :
+        # hors du thread graphique, avant la première évaluation de robustesse.
+        self.tasks.submit(lambda task: get_matcher())
+
         buttons = [
             ("Ajouter un mot de passe", self.on_add_password),
             ("Générer un mot de passe", self.on_generate_password),
-            ("Supprimer l'entrée", self.on_delete_password),
+            ("Importer des mots de passe", self.on_import_passwords),
+            ("Supprimer des entrées", self.on_delete_password),
+            ("Régénérer les mots de passe", self.on_regenerate_passwords),
             ("Afficher le mot de passe", self.on_show_password),
             ("Vérifier la sécurité", self.on_check_security),
+            ("Auditer le coffre", self.on_audit_vault),
+            ("Sauvegarder le coffre", self.on_backup_vault),
+            ("Synchroniser avec une copie", self.on_sync_vault),
+            ("Changer le mot de passe maître", self.on_change_master_password),
         ]
-
+        if get_config().breach_corpus is not None:
+            buttons.insert(8, ("Rechercher les fuites", self.on_scan_breaches))
+        if self.rotation is not None:
+            buttons.insert(5, ("Renouveler les anciens mots de passe", self.on_rotate_passwords))
+        if metrics_enabled():
+            buttons.append(("Métriques (débogage)", self.on_show_metrics))
+
+        vbox.Add(self.search_input, flag=wx.EXPAND | wx.LEFT | wx.RIGHT | wx.TOP, border=10)
         vbox.Add(self.app_list, flag=wx.EXPAND | wx.ALL, border=10)
+        vbox.Add(self.rotation_status, flag=wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, border=10)
         for label, handler in buttons:
             btn = wx.Button(panel, label=label)
             btn.Bind(wx.EVT_BUTTON, handler)
@@ -122,8 +301,118 @@ class MainFrame(wx.Frame):
         self.Centre()
 
     def load_apps(self):
-        applications = self.db.get_applications()
-        self.app_list.Set(applications)
+        query = self.search_input.GetValue().strip()
+
+        def fetch(task: Task) -> dict[str, int]:
+            if not query:
+                return self.db.get_application_counts()
+            applications = self.db.search_applications(query)
+            task.check()
+            counts = self.db.get_application_counts(applications)
+            return {application: counts.get(application, 0) for application in applications}
+
+        def on_success(counts: dict[str, int]) -> None:
+            self.app_list.set_items(counts)
+            # Rejoue les changements publiés pendant la lecture : ils portent des
+            # compteurs absolus, les appliquer deux fois est sans effet.
+            if not query and self._changes_since_load:
+                self.app_list.apply_changes(self._changes_since_load)
+            self._changes_since_load = None
+
+        # Une seule actualisation en vol : la précédente est annulée et son résultat ignoré.
+        self._changes_since_load = []
+        self.tasks.submit(
+            fetch,
+            key="load_apps",
+            on_success=on_success,
+            on_error=self._error_handler("Erreur"),
+        )
+
+    def _on_applications_changed(self, changes: list[ApplicationChange]) -> None:
+        if not self:
+            return
+        if self.search_input.GetValue().strip():
+            # Les résultats de recherche sont classés par pertinence : on les recalcule.
+            self.load_apps()
+            return
+        self.app_list.apply_changes(changes)
+        if self._changes_since_load is not None:
+            self._changes_since_load.extend(changes)
+
+    def on_search(self, event):
+        if self._search_call is not None and self._search_call.IsRunning():
+            self._search_call.Restart(self.SEARCH_DELAY_MS)
+        else:
+            self._search_call = wx.CallLater(self.SEARCH_DELAY_MS, self.load_apps)
+
+    def _check_rotations(self, reset: bool = False) -> None:
+        if self.rotation is None:
+            return
+        if reset:
+            self.rotation.reset()
+
+        def on_success(update: RotationUpdate) -> None:
+            # Le planificateur ne renvoie que les différences depuis la vérification
+            # précédente : la liste des entrées échues est tenue à jour ici.
+            self._overdue.difference_update(update.cleared)
+            self._overdue.update(update.due)
+            self._show_rotation_status()
+            if update.due and self.IsShown():
+                self.RequestUserAttention()
+            if self._rotation_call is not None:
+                self._rotation_call.Stop()
+            delay = min(max(update.next_check - int(time.time()), 1), self.ROTATION_CHECK_MAX_DELAY)
+            self._rotation_call = wx.CallLater(delay * 1000, self._check_rotations)
+
+        self.tasks.submit(
+            lambda task: self.rotation.check(),
+            on_success=on_success,
+            on_error=self._error_handler("Erreur"),
+        )
+
+    def _show_rotation_status(self) -> None:
+        if not self._overdue:
+            self.rotation_status.SetLabel("")
+            return
+        self.rotation_status.SetLabel(
+            f"{len(self._overdue)} mot(s) de passe inchangé(s) depuis plus de "
+            f"{get_config().rotation_days} jours."
+        )
+
+    def on_close(self, event):
+        if self._rotation_call is not None:
+            self._rotation_call.Stop()
+        self._unsubscribe()
+        self.tasks.shutdown()
+        shutdown_pool()
+        event.Skip()
+
+    @staticmethod
+    def _error_handler(title: str):
+        def show(error: Exception) -> None:
+            wx.MessageBox(str(error), title, wx.OK | wx.ICON_ERROR)
+
+        return show
+
+    def _require_selections(self) -> list[str]:
+        selected_apps = self.app_list.get_selections()
+        if not selected_apps:
+            wx.MessageBox(
+                "Veuillez sélectionner au moins une application.",
+                "Erreur",
+                wx.OK | wx.ICON_ERROR,
+            )
+        return selected_apps
+
+    def _require_selection(self) -> str | None:
+        selected_app = self.app_list.get_selection()
+        if not selected_app:
+            wx.MessageBox(
+                "Veuillez sélectionner une application.",
+                "Erreur",
+                wx.OK | wx.ICON_ERROR,
+            )
+        return selected_app
 
     def on_add_password(self, event):
         dialog = wx.TextEntryDialog(
@@ -148,8 +437,11 @@ class MainFrame(wx.Frame):
                     wx.OK | wx.ICON_ERROR,
                 )
                 return
-            self.db.insert(application, userid, password)
-            self.load_apps()
+            self.tasks.submit(
+                lambda task: self.db.insert(application, userid, password),
+                on_success=lambda _: self._check_rotations(),
+                on_error=self._error_handler("Erreur lors de l'ajout"),
+            )
         dialog.Destroy()
 
     def on_generate_password(self, event):
@@ -157,80 +449,470 @@ class MainFrame(wx.Frame):
         dialog.ShowModal()
         dialog.Destroy()
 
+    def on_import_passwords(self, event):
+        with wx.FileDialog(
+            self,
+            "Importer des mots de passe",
+            wildcard="Exports (*.csv;*.json;*.xml)|*.csv;*.json;*.xml",
+            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+        ) as file_dialog:
+            if file_dialog.ShowModal() != wx.ID_OK:
+                return
+            path = file_dialog.GetPath()
+
+        progress_dialog = wx.ProgressDialog(
+            "Import en cours",
+            "Lecture du fichier…",
+            parent=self,
+            style=wx.PD_APP_MODAL | wx.PD_AUTO_HIDE,
+        )
+
+        def on_success(count: int) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox(f"{count} entrées importées.", "Succès", wx.OK | wx.ICON_INFORMATION)
+
+        def on_error(error: Exception) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox(str(error), "Erreur lors de l'import", wx.OK | wx.ICON_ERROR)
+
+        self.tasks.submit(
+            lambda task: import_file(self.db, path, progress=task.report),
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=lambda n: progress_dialog.Pulse(f"{n} entrées importées…"),
+        )
+
+    def _fetch_entries(self, applications: list[str]):
+        def fetch(task: Task) -> list[Entry]:
+            entries = []
+            for application in applications:
+                task.check()
+                entries.extend(self.db.get_info(application))
+            return entries
+
+        return fetch
+
+    def _choose_entries(self, entries: list[Entry], message: str, title: str) -> list[Entry]:
+        if not entries:
+            wx.MessageBox("Aucune entrée trouvée.", "Info", wx.OK | wx.ICON_INFORMATION)
+            return []
+        entries = sorted(entries, key=lambda entry: (entry.application, entry.userid))
+        with wx.MultiChoiceDialog(
+            self,
+            message,
+            title,
+            [f"{entry.application} — {entry.userid}" for entry in entries],
+        ) as dialog:
+            dialog.SetSelections(list(range(len(entries))))
+            if dialog.ShowModal() != wx.ID_OK:
+                return []
+            return [entries[index] for index in dialog.GetSelections()]
+
     def on_delete_password(self, event):
-        selected_app = self.app_list.GetStringSelection()
-        if not selected_app:
+        selected_apps = self._require_selections()
+        if not selected_apps:
+            return
+
+        def on_deleted(ids: list[int]) -> None:
             wx.MessageBox(
-                "Veuillez sélectionner une application.",
-                "Erreur",
-                wx.OK | wx.ICON_ERROR,
+                f"{len(ids)} entrée(s) supprimée(s).", "Succès", wx.OK | wx.ICON_INFORMATION
             )
-            return
 
-        users = self.db.get_users_for_application(selected_app)
-        if not users:
-            wx.MessageBox("Aucun utilisateur trouvé.", "Info", wx.OK | wx.ICON_INFORMATION)
+        if len(selected_apps) > 1:
+            confirm = wx.MessageBox(
+                f"Supprimer toutes les entrées des {len(selected_apps)} applications "
+                "sélectionnées ?",
+                "Confirmation",
+                wx.YES_NO | wx.NO_DEFAULT | wx.ICON_QUESTION,
+            )
+            if confirm == wx.YES:
+                self.tasks.submit(
+                    lambda task: self.db.delete_many(applications=selected_apps),
+                    on_success=on_deleted,
+                    on_error=self._error_handler("Erreur"),
+                )
             return
 
-        dialog = wx.SingleChoiceDialog(
-            self,
-            f"Choisir l'utilisateur à supprimer pour '{selected_app}' :",
-            "Supprimer un mot de passe",
-            users,
-        )
-        if dialog.ShowModal() == wx.ID_OK:
-            selected_user = dialog.GetStringSelection()
+        def choose_entries(entries: list[Entry]) -> None:
+            chosen = self._choose_entries(
+                entries,
+                f"Choisir les utilisateurs à supprimer pour '{selected_apps[0]}' :",
+                "Supprimer des mots de passe",
+            )
+            if not chosen:
+                return
             confirm = wx.MessageBox(
-                f"Supprimer l'entrée de '{selected_user}' pour '{selected_app}' ?",
+                f"Supprimer {len(chosen)} entrée(s) de '{selected_apps[0]}' ?",
                 "Confirmation",
                 wx.YES_NO | wx.ICON_QUESTION,
             )
             if confirm == wx.YES:
-                try:
-                    self.db.delete_entry_by_app_and_user(selected_app, selected_user)
-                    wx.MessageBox("Entrée supprimée.", "Succès", wx.OK | wx.ICON_INFORMATION)
-                    self.load_apps()
-                except (ValueError, RuntimeError) as e:
-                    wx.MessageBox(str(e), "Erreur", wx.OK | wx.ICON_ERROR)
-        dialog.Destroy()
+                ids = [entry.id for entry in chosen]
+                self.tasks.submit(
+                    lambda task: self.db.delete_many(ids=ids),
+                    on_success=on_deleted,
+                    on_error=self._error_handler("Erreur"),
+                )
 
-    def on_show_password(self, event):
-        selected_app = self.app_list.GetStringSelection()
-        if not selected_app:
-            wx.MessageBox(
-                "Veuillez sélectionner une application.",
-                "Erreur",
-                wx.OK | wx.ICON_ERROR,
+        self.tasks.submit(
+            self._fetch_entries(selected_apps),
+            on_success=choose_entries,
+            on_error=self._error_handler("Erreur"),
+        )
+
+    def on_regenerate_passwords(self, event):
+        selected_apps = self._require_selections()
+        if not selected_apps:
+            return
+
+        def choose_entries(entries: list[Entry]) -> None:
+            chosen = self._choose_entries(
+                entries,
+                "Choisir les entrées dont le mot de passe sera remplacé "
+                "par un mot de passe généré :",
+                "Régénérer les mots de passe",
             )
+            if not chosen:
+                return
+            ids = [entry.id for entry in chosen]
+            self.tasks.submit(
+                lambda task: self.db.update_many(
+                    zip(ids, generate_passwords(len(ids), self._generated_length()))
+                ),
+                on_success=self._on_passwords_replaced,
+                on_error=self._error_handler("Erreur"),
+            )
+
+        self.tasks.submit(
+            self._fetch_entries(selected_apps),
+            on_success=choose_entries,
+            on_error=self._error_handler("Erreur"),
+        )
+
+    def on_rotate_passwords(self, event):
+        if not self._overdue:
+            wx.MessageBox("Aucun mot de passe à renouveler.", "Info", wx.OK | wx.ICON_INFORMATION)
             return
+        ids = sorted(self._overdue)
+
+        def choose_entries(candidates) -> None:
+            chosen = self._choose_entries(
+                candidates,
+                f"Mots de passe inchangés depuis plus de {get_config().rotation_days} jours. "
+                "Choisir ceux à remplacer par un mot de passe généré :",
+                "Renouveler les anciens mots de passe",
+            )
+            if not chosen:
+                return
+            self.tasks.submit(
+                lambda task: self.db.update_many(
+                    propose_replacements(chosen, self._generated_length())
+                ),
+                on_success=self._on_passwords_replaced,
+                on_error=self._error_handler("Erreur"),
+            )
 
-        data = self.db.get_info(selected_app)
-        if not data:
-            wx.MessageBox("Aucune donnée trouvée.", "Info", wx.OK | wx.ICON_INFORMATION)
+        self.tasks.submit(
+            lambda task: get_candidates(self.db, ids),
+            on_success=choose_entries,
+            on_error=self._error_handler("Erreur"),
+        )
+
+    def _on_passwords_replaced(self, updated: list[int]) -> None:
+        wx.MessageBox(
+            f"{len(updated)} mot(s) de passe régénéré(s).",
+            "Succès",
+            wx.OK | wx.ICON_INFORMATION,
+        )
+        self._check_rotations()
+
+    @classmethod
+    def _generated_length(cls) -> int:
+        config = get_config()
+        return min(max(cls.GENERATED_LENGTH, config.password_min_size), config.password_max_size)
+
+    def on_show_password(self, event):
+        selected_app = self._require_selection()
+        if not selected_app:
             return
 
-        message = "\n".join(
-            f"Utilisateur : {uid}\nMot de passe : {pwd}\n"
-            for uid, pwd in data
+        def fetch(task: Task) -> list[Entry]:
+            data = self.db.get_info(selected_app)
+            task.check()
+            self.db.decrypt_entries(data)
+            return data
+
+        def show(data: list[Entry]) -> None:
+            if not data:
+                wx.MessageBox("Aucune donnée trouvée.", "Info", wx.OK | wx.ICON_INFORMATION)
+                return
+            message = "\n".join(
+                f"Utilisateur : {entry.userid}\nMot de passe : {entry.password}\n"
+                for entry in data
+            )
+            wipe_entries(data)
+            wx.MessageBox(message, f"Informations — {selected_app}", wx.OK | wx.ICON_INFORMATION)
+
+        self.tasks.submit(
+            fetch, key="show_password", on_success=show, on_error=self._error_handler("Erreur")
         )
-        wx.MessageBox(message, f"Informations — {selected_app}", wx.OK | wx.ICON_INFORMATION)
 
     def on_check_security(self, event):
-        selected_app = self.app_list.GetStringSelection()
+        selected_app = self._require_selection()
         if not selected_app:
+            return
+
+        def evaluate(task: Task) -> tuple[str, int, bool | None] | None:
+            data = self.db.get_info(selected_app)
+            if not data:
+                return None
+            with data[0].secret as secret:
+                task.check()
+                corpus = get_breach_corpus()
+                breached = corpus.contains_password(secret) if corpus is not None else None
+                password = secret.reveal()
+            return password, evaluate_password_strength(password), breached
+
+        def show(result: tuple[str, int, bool | None] | None) -> None:
+            if result is None:
+                wx.MessageBox("Aucune donnée trouvée.", "Info", wx.OK | wx.ICON_INFORMATION)
+                return
+            password, score, breached = result
+            dialog = SecurityCheckerFrame(self, password, score, breached)
+            dialog.ShowModal()
+            dialog.Destroy()
+
+        self.tasks.submit(
+            evaluate, key="check_security", on_success=show, on_error=self._error_handler("Erreur")
+        )
+
+    def on_audit_vault(self, event):
+        progress_dialog = wx.ProgressDialog(
+            "Audit en cours",
+            "Audit du coffre…",
+            maximum=1000,
+            parent=self,
+            style=wx.PD_APP_MODAL | wx.PD_CAN_ABORT | wx.PD_AUTO_HIDE,
+        )
+
+        def update_progress(done: int, total: int) -> None:
+            if not progress_dialog.Update(min(done * 1000 // max(total, 1), 999))[0]:
+                task.cancel()
+                progress_dialog.Destroy()
+
+        def on_success(report) -> None:
+            progress_dialog.Destroy()
+            dialog = AuditReportFrame(self, report)
+            dialog.ShowModal()
+            dialog.Destroy()
+
+        def on_error(error: Exception) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox(str(error), "Erreur", wx.OK | wx.ICON_ERROR)
+
+        task = self.tasks.submit(
+            lambda task: run_audit(self.db, progress=task.report),
+            key="audit",
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=update_progress,
+        )
+
+    def on_scan_breaches(self, event):
+        progress_dialog = wx.ProgressDialog(
+            "Recherche de fuites",
+            "Comparaison des mots de passe aux fuites connues…",
+            maximum=1000,
+            parent=self,
+            style=wx.PD_APP_MODAL | wx.PD_CAN_ABORT | wx.PD_AUTO_HIDE,
+        )
+
+        def run(task: Task):
+            return scan_vault(self.db, get_breach_corpus(), progress=task.report)
+
+        def update_progress(done: int, total: int) -> None:
+            if not progress_dialog.Update(min(done * 1000 // max(total, 1), 999))[0]:
+                task.cancel()
+                progress_dialog.Destroy()
+
+        def on_success(report) -> None:
+            progress_dialog.Destroy()
+            dialog = BreachReportFrame(self, report)
+            dialog.ShowModal()
+            dialog.Destroy()
+
+        def on_error(error: Exception) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox(str(error), "Erreur", wx.OK | wx.ICON_ERROR)
+
+        task = self.tasks.submit(
+            run, key="scan_breaches", on_success=on_success, on_error=on_error,
+            on_progress=update_progress,
+        )
+
+    def on_backup_vault(self, event):
+        wildcard = f"Sauvegardes KeyPass (*{ARCHIVE_SUFFIX})|*{ARCHIVE_SUFFIX}"
+        with wx.FileDialog(
+            self,
+            "Enregistrer la sauvegarde",
+            defaultFile=f"keypass{ARCHIVE_SUFFIX}",
+            wildcard=wildcard,
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        ) as file_dialog:
+            if file_dialog.ShowModal() != wx.ID_OK:
+                return
+            archive_path = Path(file_dialog.GetPath())
+
+        base_path = None
+        incremental = wx.MessageBox(
+            "Sauvegarde incrémentale (seules les modifications depuis une sauvegarde précédente) ?",
+            "Type de sauvegarde",
+            wx.YES_NO | wx.NO_DEFAULT | wx.ICON_QUESTION,
+        )
+        if incremental == wx.YES:
+            with wx.FileDialog(
+                self,
+                "Sauvegarde précédente",
+                wildcard=wildcard,
+                style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+            ) as file_dialog:
+                if file_dialog.ShowModal() != wx.ID_OK:
+                    return
+                base_path = Path(file_dialog.GetPath())
+
+        progress_dialog = wx.ProgressDialog(
+            "Sauvegarde en cours",
+            "Copie du coffre…",
+            maximum=1000,
+            parent=self,
+            style=wx.PD_APP_MODAL | wx.PD_CAN_ABORT | wx.PD_AUTO_HIDE,
+        )
+
+        def run(task: Task):
+            return create_backup(
+                self.db.master_key, archive_path, base_path, self.db.path, task.report, task.cancel_event
+            )
+
+        def update_progress(done: int, total: int) -> None:
+            if not progress_dialog.Update(min(done * 1000 // max(total, 1), 999))[0]:
+                task.cancel()
+                progress_dialog.Destroy()
+
+        def on_success(header) -> None:
+            progress_dialog.Destroy()
+            kind = "incrémentale" if header.kind == "incremental" else "complète"
             wx.MessageBox(
-                "Veuillez sélectionner une application.",
-                "Erreur",
-                wx.OK | wx.ICON_ERROR,
+                f"Sauvegarde {kind} enregistrée dans {archive_path.name}.",
+                "Succès",
+                wx.OK | wx.ICON_INFORMATION,
             )
-            return
 
-        data = self.db.get_info(selected_app)
-        if not data:
-            wx.MessageBox("Aucune donnée trouvée.", "Info", wx.OK | wx.ICON_INFORMATION)
+        def on_error(error: Exception) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox(str(error), "Erreur lors de la sauvegarde", wx.OK | wx.ICON_ERROR)
+
+        task = self.tasks.submit(
+            run, key="backup", on_success=on_success, on_error=on_error, on_progress=update_progress
+        )
+
+    def on_sync_vault(self, event):
+        with wx.FileDialog(
+            self,
+            "Copie du coffre à synchroniser",
+            wildcard="Coffres KeyPass (*.db)|*.db",
+            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+        ) as file_dialog:
+            if file_dialog.ShowModal() != wx.ID_OK:
+                return
+            other_path = Path(file_dialog.GetPath())
+
+        with wx.PasswordEntryDialog(
+            self,
+            "Mot de passe maître de la copie (vide : le même) :",
+            "Synchroniser avec une copie",
+        ) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            other_password = dialog.GetValue()
+
+        progress_dialog = wx.ProgressDialog(
+            "Synchronisation",
+            "Comparaison des deux coffres…",
+            parent=self,
+            style=wx.PD_APP_MODAL | wx.PD_AUTO_HIDE,
+        )
+        progress_dialog.Pulse()
+
+        def run(task: Task):
+            key = derive_key(other_password) if other_password else self.db.master_key
+            other = Database(key, other_path)
+            try:
+                return sync_vaults(self.db, other)
+            finally:
+                other.close()
+
+        def on_success(report) -> None:
+            progress_dialog.Destroy()
+            lines = [f"{report.pulled} entrées reçues, {report.pushed} envoyées."]
+            if report.first_sync:
+                lines.append("Première synchronisation : les deux coffres ont été réunis.")
+            for conflict in report.conflicts:
+                kept = "ce coffre" if conflict.kept == LOCAL else "la copie"
+                lines.append(
+                    f"Conflit sur {conflict.application} / {conflict.userid} : "
+                    f"version de {kept} conservée."
+                )
+            wx.MessageBox("\n".join(lines), "Synchronisation terminée", wx.OK | wx.ICON_INFORMATION)
+            # Les dates reçues de la copie peuvent être antérieures aux échéances chargées.
+            self._check_rotations(reset=True)
+
+        def on_error(error: Exception) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox(str(error), "Erreur lors de la synchronisation", wx.OK | wx.ICON_ERROR)
+
+        self.tasks.submit(run, key="sync", on_success=on_success, on_error=on_error)
+
+    def on_change_master_password(self, event):
+        passwords = []
+        for prompt in (
+            "Mot de passe maître actuel :",
+            "Nouveau mot de passe maître :",
+            "Confirmer le nouveau mot de passe :",
+        ):
+            with wx.PasswordEntryDialog(self, prompt, "Changer le mot de passe maître") as dialog:
+                if dialog.ShowModal() != wx.ID_OK:
+                    return
+                passwords.append(dialog.GetValue())
+
+        current, new, confirmation = passwords
+        if new != confirmation:
+            wx.MessageBox("Les mots de passe ne correspondent pas.", "Erreur", wx.OK | wx.ICON_ERROR)
             return
 
-        password = data[0][1]
-        dialog = SecurityCheckerFrame(self, password)
+        progress_dialog = wx.ProgressDialog(
+            "Changer le mot de passe maître",
+            "Changement du mot de passe maître…",
+            parent=self,
+            style=wx.PD_APP_MODAL | wx.PD_AUTO_HIDE,
+        )
+        progress_dialog.Pulse()
+
+        def on_success(_) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox("Mot de passe maître modifié.", "Succès", wx.OK | wx.ICON_INFORMATION)
+
+        def on_error(error: Exception) -> None:
+            progress_dialog.Destroy()
+            wx.MessageBox(str(error), "Erreur", wx.OK | wx.ICON_ERROR)
+
+        self.tasks.submit(
+            lambda task: self.db.change_master_password(current, new),
+            key="change_master_password",
+            on_success=on_success,
+            on_error=on_error,
+        )
+
+    def on_show_metrics(self, event):
+        dialog = MetricsFrame(self)
         dialog.ShowModal()
-        dialog.Destroy()
\ No newline at end of file
+        dialog.Destroy()
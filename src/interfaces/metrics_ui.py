@@ -0,0 +1,102 @@
+import wx
+
+from src.core.metrics import REGISTRY
+
+
+class MetricsFrame(wx.Dialog):
+
+    COLUMNS = (
+        ("Opération", 200),
+        ("Appels", 70),
+        ("Erreurs", 60),
+        ("p50", 80),
+        ("p99", 80),
+        ("Total", 80),
+        ("Lignes", 80),
+        ("Octets", 90),
+    )
+
+    def __init__(self, parent):
+        super().__init__(
+            parent,
+            title="Métriques (débogage)",
+            size=(780, 420),
+            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER,
+        )
+
+        panel = wx.Panel(self)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+
+        self.results = wx.ListCtrl(panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        for column, (label, width) in enumerate(self.COLUMNS):
+            self.results.InsertColumn(column, label, width=width)
+
+        buttons = wx.BoxSizer(wx.HORIZONTAL)
+        for label, handler in (
+            ("Rafraîchir", self.on_refresh),
+            ("Réinitialiser", self.on_reset),
+            ("Exporter…", self.on_export),
+        ):
+            btn = wx.Button(panel, label=label)
+            btn.Bind(wx.EVT_BUTTON, handler)
+            buttons.Add(btn, flag=wx.RIGHT, border=5)
+        close_btn = wx.Button(panel, id=wx.ID_CLOSE, label="Fermer")
+        close_btn.Bind(wx.EVT_BUTTON, lambda e: self.EndModal(wx.ID_CLOSE))
+        buttons.Add(close_btn)
+
+        vbox.Add(self.results, proportion=1, flag=wx.EXPAND | wx.ALL, border=10)
+        vbox.Add(buttons, flag=wx.ALIGN_CENTER | wx.BOTTOM, border=10)
+
+        panel.SetSizer(vbox)
+        self.refresh()
+        self.Centre()
+
+    @staticmethod
+    def _format_seconds(seconds: float) -> str:
+        if seconds == float("inf"):
+            return "> 10 s"
+        if seconds < 1e-3:
+            return f"{seconds * 1e6:.0f} µs"
+        if seconds < 1:
+            return f"{seconds * 1e3:.1f} ms"
+        return f"{seconds:.2f} s"
+
+    def refresh(self) -> None:
+        self.results.DeleteAllItems()
+        for name, stats in REGISTRY.snapshot().items():
+            index = self.results.InsertItem(self.results.GetItemCount(), name)
+            values = (
+                str(stats["calls"]),
+                str(stats["errors"]),
+                self._format_seconds(stats["p50_seconds"]),
+                self._format_seconds(stats["p99_seconds"]),
+                self._format_seconds(stats["total_seconds"]),
+                str(stats["rows"]),
+                str(stats["bytes"]),
+            )
+            for column, value in enumerate(values, start=1):
+                self.results.SetItem(index, column, value)
+
+    def on_refresh(self, event):
+        self.refresh()
+
+    def on_reset(self, event):
+        REGISTRY.reset()
+        self.refresh()
+
+    def on_export(self, event):
+        with wx.FileDialog(
+            self,
+            "Exporter les métriques",
+            defaultFile="keypass_metrics.prom",
+            wildcard="Prometheus (*.prom)|*.prom|JSON (*.json)|*.json",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        ) as file_dialog:
+            if file_dialog.ShowModal() != wx.ID_OK:
+                return
+            path = file_dialog.GetPath()
+
+        try:
+            REGISTRY.dump(path)
+        except OSError as e:
+            wx.MessageBox(str(e), "Erreur lors de l'export", wx.OK | wx.ICON_ERROR)
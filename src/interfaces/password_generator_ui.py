@@ -1,26 +1,39 @@
 import wx
-from secrets import choice
-from string import ascii_lowercase, ascii_uppercase, digits, punctuation
 
-from src.core.password_generator import PASSWORD_MIN_SIZE, PASSWORD_MAX_SIZE
+from src.core.config import get_config
+from src.core.password_generator import (
+    PASSPHRASE_MAX_WORDS,
+    PASSPHRASE_MIN_WORDS,
+    generate_passphrase,
+    generate_passwords,
+)
 
 
 class PasswordGeneratorFrame(wx.Dialog):
 
     def __init__(self, parent):
-        super().__init__(parent, title="Générateur de mot de passe", size=(420, 380))
+        super().__init__(parent, title="Générateur de mot de passe", size=(420, 480))
 
         panel = wx.Panel(self)
         vbox = wx.BoxSizer(wx.VERTICAL)
 
+        self.mode_choice = wx.RadioBox(
+            panel,
+            label="Type",
+            choices=["Mot de passe", "Phrase de passe"],
+            majorDimension=2,
+        )
+        self.mode_choice.Bind(wx.EVT_RADIOBOX, self.on_mode_changed)
+
+        config = get_config()
         self.length_label = wx.StaticText(
-            panel, label=f"Longueur ({PASSWORD_MIN_SIZE}–{PASSWORD_MAX_SIZE}) :"
+            panel, label=f"Longueur ({config.password_min_size}–{config.password_max_size}) :"
         )
         self.length_input = wx.SpinCtrl(
             panel,
-            value=str(PASSWORD_MIN_SIZE),
-            min=PASSWORD_MIN_SIZE,
-            max=PASSWORD_MAX_SIZE,
+            value=str(config.password_min_size),
+            min=config.password_min_size,
+            max=config.password_max_size,
         )
 
         self.include_uppercase = wx.CheckBox(panel, label="Inclure des majuscules")
@@ -29,6 +42,24 @@ class PasswordGeneratorFrame(wx.Dialog):
         self.include_digits.SetValue(True)
         self.include_symbols = wx.CheckBox(panel, label="Inclure des symboles")
 
+        self.words_label = wx.StaticText(
+            panel, label=f"Nombre de mots ({PASSPHRASE_MIN_WORDS}–{PASSPHRASE_MAX_WORDS}) :"
+        )
+        self.words_input = wx.SpinCtrl(
+            panel,
+            value="6",
+            min=PASSPHRASE_MIN_WORDS,
+            max=PASSPHRASE_MAX_WORDS,
+        )
+        self.password_options = [
+            self.length_label,
+            self.length_input,
+            self.include_uppercase,
+            self.include_digits,
+            self.include_symbols,
+        ]
+        self.passphrase_options = [self.words_label, self.words_input]
+
         self.generate_button = wx.Button(panel, label="Générer")
         self.generate_button.Bind(wx.EVT_BUTTON, self.on_generate)
 
@@ -43,45 +74,46 @@ class PasswordGeneratorFrame(wx.Dialog):
         self.copy_button.Bind(wx.EVT_BUTTON, self.on_copy)
         self.copy_button.Disable()
 
+        vbox.Add(self.mode_choice, flag=wx.EXPAND | wx.ALL, border=10)
         vbox.Add(self.length_label, flag=wx.EXPAND | wx.ALL, border=10)
         vbox.Add(self.length_input, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
         vbox.Add(self.include_uppercase, flag=wx.EXPAND | wx.ALL, border=8)
         vbox.Add(self.include_digits, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=8)
         vbox.Add(self.include_symbols, flag=wx.EXPAND | wx.ALL, border=8)
+        vbox.Add(self.words_label, flag=wx.EXPAND | wx.ALL, border=10)
+        vbox.Add(self.words_input, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
         vbox.Add(self.generate_button, flag=wx.EXPAND | wx.ALL, border=10)
         vbox.Add(self.password_display, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
         vbox.Add(self.copy_button, flag=wx.EXPAND | wx.ALL, border=10)
 
         panel.SetSizer(vbox)
+        self.panel = panel
+        self.on_mode_changed(None)
+
+    def on_mode_changed(self, event):
+        passphrase = self.mode_choice.GetSelection() == 1
+        for control in self.password_options:
+            control.Show(not passphrase)
+        for control in self.passphrase_options:
+            control.Show(passphrase)
+        self.panel.Layout()
 
     def on_generate(self, event):
-        length = self.length_input.GetValue()
-        include_upper = self.include_uppercase.IsChecked()
-        include_dig = self.include_digits.IsChecked()
-        include_sym = self.include_symbols.IsChecked()
-        pool = ascii_lowercase
-        required: list[str] = [choice(ascii_lowercase)]
-
-        if include_upper:
-            pool += ascii_uppercase
-            required.append(choice(ascii_uppercase))
-        if include_dig:
-            pool += digits
-            required.append(choice(digits))
-        if include_sym:
-            pool += punctuation
-            required.append(choice(punctuation))
-
-        remaining = length - len(required)
-        if remaining < 0:
-            remaining = 0
-        password_chars = required + [choice(pool) for _ in range(remaining)]
-        from secrets import randbelow
-        for i in range(len(password_chars) - 1, 0, -1):
-            j = randbelow(i + 1)
-            password_chars[i], password_chars[j] = password_chars[j], password_chars[i]
-
-        password = "".join(password_chars)
+        try:
+            if self.mode_choice.GetSelection() == 1:
+                password = generate_passphrase(self.words_input.GetValue())
+            else:
+                password = generate_passwords(
+                    1,
+                    self.length_input.GetValue(),
+                    include_uppercase=self.include_uppercase.IsChecked(),
+                    include_digits=self.include_digits.IsChecked(),
+                    include_symbols=self.include_symbols.IsChecked(),
+                )[0]
+        except ValueError as e:
+            wx.MessageBox(str(e), "Erreur", wx.OK | wx.ICON_ERROR)
+            return
+
         self.password_display.SetValue(password)
         self.copy_button.Enable()
 
@@ -13,13 +13,16 @@ class SecurityCheckerFrame(wx.Dialog):
     }
     DEFAULT_COLOR = wx.Colour(200, 0, 0)
 
-    def __init__(self, parent, password: str):
-        super().__init__(parent, title="Vérification de la sécurité", size=(400, 200))
+    def __init__(
+        self, parent, password: str, score: int | None = None, breached: bool | None = None
+    ):
+        super().__init__(parent, title="Vérification de la sécurité", size=(400, 230))
 
         panel = wx.Panel(self)
         vbox = wx.BoxSizer(wx.VERTICAL)
 
-        score = evaluate_password_strength(password)
+        if score is None:
+            score = evaluate_password_strength(password)
         label = get_strength_label(score)
 
         self.result_text = wx.StaticText(panel, label=label)
@@ -38,6 +41,18 @@ class SecurityCheckerFrame(wx.Dialog):
         vbox.Add(self.gauge, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=15)
         vbox.Add(score_text, flag=wx.ALIGN_CENTER | wx.ALL, border=10)
 
+        # None : aucun fichier de fuites n'est configuré, rien n'est affiché.
+        if breached is not None:
+            if breached:
+                breach_label = "Ce mot de passe figure dans une fuite de données connue."
+            else:
+                breach_label = "Absent des fuites de données connues."
+            breach_text = wx.StaticText(panel, label=breach_label)
+            breach_text.SetForegroundColour(
+                self.DEFAULT_COLOR if breached else self.COLORS[5]
+            )
+            vbox.Add(breach_text, flag=wx.ALIGN_CENTER | wx.LEFT | wx.RIGHT | wx.BOTTOM, border=10)
+
         close_btn = wx.Button(panel, id=wx.ID_CLOSE, label="Fermer")
         close_btn.Bind(wx.EVT_BUTTON, lambda e: self.EndModal(wx.ID_CLOSE))
         vbox.Add(close_btn, flag=wx.ALIGN_CENTER | wx.BOTTOM, border=10)
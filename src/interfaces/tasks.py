@@ -0,0 +1,114 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import wx
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    """Travail exécuté hors du thread graphique.
+
+    La fonction reçoit la tâche en premier argument : `report()` publie une
+    progression et lève TaskCancelled si la tâche a été annulée entre-temps.
+    """
+
+    __slots__ = ("key", "_cancel_event", "_on_progress", "_owner")
+
+    def __init__(self, key: str | None, owner: wx.Window, on_progress: Callable[..., None] | None):
+        self.key = key
+        self._cancel_event = threading.Event()
+        self._on_progress = on_progress
+        self._owner = owner
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def cancel_event(self) -> threading.Event:
+        return self._cancel_event
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def check(self) -> None:
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report(self, *progress: Any) -> None:
+        self.check()
+        if self._on_progress is not None:
+            wx.CallAfter(self._deliver, self._on_progress, progress)
+
+    def _deliver(self, callback: Callable[..., None], args: tuple) -> None:
+        # Rien n'est rappelé si la tâche a été annulée ou sa fenêtre détruite.
+        if not self.cancelled and self._owner:
+            callback(*args)
+
+
+class TaskExecutor:
+    """Pool de workers pour une fenêtre, dont les résultats reviennent par wx.CallAfter.
+
+    Une tâche soumise avec une clé remplace la précédente de même clé : l'ancienne est
+    annulée et son résultat ignoré, seul le dernier rafraîchissement est affiché.
+    """
+
+    def __init__(self, owner: wx.Window, max_workers: int = 4):
+        self._owner = owner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="keypass-ui")
+        self._latest: dict[str, Task] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        key: str | None = None,
+        on_success: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        on_progress: Callable[..., None] | None = None,
+    ) -> Task:
+        task = Task(key, self._owner, on_progress)
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = task
+            if previous is not None:
+                previous.cancel()
+
+        def run() -> None:
+            if task.cancelled:
+                return
+            try:
+                result = func(task, *args)
+            except TaskCancelled:
+                return
+            except Exception as e:
+                if on_error is not None:
+                    wx.CallAfter(task._deliver, on_error, (e,))
+                return
+            finally:
+                self._forget(task)
+            if on_success is not None:
+                wx.CallAfter(task._deliver, on_success, (result,))
+
+        self._executor.submit(run)
+        return task
+
+    def _forget(self, task: Task) -> None:
+        if task.key is None:
+            return
+        with self._lock:
+            if self._latest.get(task.key) is task:
+                del self._latest[task.key]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for task in self._latest.values():
+                task.cancel()
+            self._latest.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,16 @@
+import pytest
+
+from src.core.strength import estimate_strength
+from src.core.utils import evaluate_password_strength
+
+
+@pytest.mark.parametrize("password", ["²²²²", "ab¹²³⁴cd", "İ1990,", "İİ12/05/1990x", "١٩٩٠١٩٩٠"])
+def test_unicode_digits_and_case_do_not_raise(password):
+    assert 0 <= evaluate_password_strength(password) <= 5
+
+
+def test_matches_stay_aligned_with_password():
+    password = "İ12/05/1990"
+    dates = [match for match in estimate_strength(password).matches if match[0] == "date"]
+    assert dates
+    assert all(password[start:end] == "12/05/1990" for _, start, end, _ in dates)